@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
-from ..tools.code_rules import normalize_codes, icd_cpt_validate, modifier_rules
-from ..rag.retrieve import query_policy_for_claim_context, semantic_search
+from ..tools.code_rules import NormalizedClaim, icd_cpt_validate, modifier_rules, normalize_claim
+from ..core.config import Settings
+from ..rag.retrieve import claim_context_query, semantic_search_many
 from ..models import score_risk
 
 ISSUE_MAP = {
@@ -39,13 +40,13 @@ def _dedup(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return out
 
 
-def _build_features(claim: Dict[str, Any], issues: List[Dict[str, Any]]) -> Dict[str, float]:
+def _build_features(claim: NormalizedClaim, issues: List[Dict[str, Any]]) -> Dict[str, float]:
     return {
         "f_modifier_missing": int(any(i["issue"] == "modifier_missing" for i in issues)),
         "f_dx_unspecific": int(any(i["issue"] == "dx_unspecific" for i in issues)),
         "f_doc_missing": int(any(i["issue"] == "doc_missing" for i in issues)),
         "f_dx_incompatibility": int(any(i["issue"] == "dx_incompatibility" for i in issues)),
-        "f_lines": min(5, len(claim.get("lines", []))) / 5.0,
+        "f_lines": min(5, len(claim.lines)) / 5.0,
     }
 
 
@@ -64,10 +65,9 @@ def _driver_candidates(issues: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any
     return [d for d, _ in pairs], [s for _, s in pairs]
 
 
-def _query_for_driver(driver: Dict[str, Any], issue_obj: Dict[str, Any], claim: Dict[str, Any]) -> str:
+def _query_for_driver(driver: Dict[str, Any], issue_obj: Dict[str, Any], claim: NormalizedClaim) -> str:
     issue = driver["issue"]
-    cpts = [ln.get("cpt", "") for ln in claim.get("lines", [])]
-    pair = cpts[:2]
+    pair = [ln.cpt for ln in claim.lines[:2]]
     if issue == "modifier_missing":
         parts = ["modifier 59"] + pair
         return " ".join([p for p in parts if p])
@@ -76,11 +76,8 @@ def _query_for_driver(driver: Dict[str, Any], issue_obj: Dict[str, Any], claim:
         dx = details.get("from")
         if not dx:
             line_idx = driver.get("line", 0)
-            lines = claim.get("lines", [])
-            if line_idx < len(lines):
-                dxs = lines[line_idx].get("dx", [])
-                if dxs:
-                    dx = dxs[0]
+            if line_idx < len(claim.lines) and claim.lines[line_idx].dx:
+                dx = claim.lines[line_idx].dx[0]
         if dx:
             return f"{dx} specificity"
         return issue_obj.get("why", "")
@@ -94,9 +91,9 @@ def _query_for_driver(driver: Dict[str, Any], issue_obj: Dict[str, Any], claim:
     return issue_obj.get("why", "")
 
 
-def assess_claim(claim: Dict, vector_dir: str, topk: int = 5) -> Dict[str, Any]:
+def assess_claim(claim: Union[Dict, NormalizedClaim], vector_dir: str, topk: int = 5) -> Dict[str, Any]:
     """Returns AssessmentResult-like dict: {risk, drivers[], evidence[]}"""
-    norm_claim = normalize_codes(claim)
+    norm_claim = normalize_claim(claim)
 
     issues_rules = icd_cpt_validate(norm_claim)
     issues_mods = modifier_rules(norm_claim)
@@ -107,15 +104,16 @@ def assess_claim(claim: Dict, vector_dir: str, topk: int = 5) -> Dict[str, Any]:
 
     drivers, src_issues = _driver_candidates(issues)
 
-    passages: List[Dict[str, Any]] = []
-    base_ret = query_policy_for_claim_context(norm_claim, topk, vector_dir)
-    passages.extend(base_ret["results"])
-
+    queries = [claim_context_query(norm_claim.claim)]
     for drv, iss in zip(drivers, src_issues):
         q = _query_for_driver(drv, iss, norm_claim)
-        if not q:
-            continue
-        ret = semantic_search(q, topk, vector_dir)
+        if q:
+            queries.append(q)
+
+    passages: List[Dict[str, Any]] = []
+    rerank = Settings().RAG_RERANK_CANDIDATES
+    payer = (norm_claim.claim.get("payer") or {}).get("name") or None
+    for ret in semantic_search_many(queries, topk, vector_dir, rerank_candidates=rerank, payer=payer):
         passages.extend(ret["results"])
 
     dedup: List[Dict[str, Any]] = []
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
 from ..tools.code_rules import (
-    normalize_codes,
+    NormalizedClaim,
+    normalize_claim,
     icd_cpt_validate,
     modifier_rules,
     suggest_recoding,
@@ -30,9 +31,9 @@ def _dedup(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return out
 
 
-def make_plan(claim: Dict, assessment: Dict, vector_dir: str, topk: int = 5) -> Dict[str, Any]:
+def make_plan(claim: Union[Dict, NormalizedClaim], assessment: Dict, vector_dir: str, topk: int = 5) -> Dict[str, Any]:
     """Returns PlanResult-like dict with one recoding and one appeal option"""
-    norm_claim = normalize_codes(claim)
+    norm_claim = normalize_claim(claim)
     issues = _dedup(icd_cpt_validate(norm_claim) + modifier_rules(norm_claim))
 
     actions = suggest_recoding(norm_claim, issues)[:2]
@@ -1,18 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from starlette.responses import Response
 from fastapi.responses import ORJSONResponse
-from routers import health_router, assess_router, plan_router, act_router, brief_router, chat_router
-from core.config import Settings
-from core.security import SecurityMiddleware, cors_config
-from core.logging import configure as configure_logging, RequestLoggingMiddleware
+from .routers import health_router, assess_router, plan_router, act_router, brief_router, chat_router
+from .core.config import Settings
+from .core.security import SecurityMiddleware, cors_config
+from .core.logging import configure as configure_logging, RequestLoggingMiddleware
+from .rag.async_search import shutdown_search_executor
+from .services.warmup import mark_ready, mark_started, warm_up
 import os
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = Settings()
+    task = None
+    if settings.WARMUP_ON_STARTUP:
+        # Serve /healthz while warming up; /readyz stays 503 until done.
+        mark_started()
+        task = asyncio.create_task(asyncio.to_thread(warm_up, settings.VECTOR_PATH))
+    else:
+        mark_ready()
+    yield
+    if task is not None and not task.done():
+        task.cancel()
+    shutdown_search_executor()
+
+
 def get_app() -> FastAPI:
     configure_logging()
-    app = FastAPI(title="Codexia API", version=os.getenv("APP_VERSION","0.1.0"), default_response_class=ORJSONResponse)
+    app = FastAPI(
+        title="Codexia API",
+        version=os.getenv("APP_VERSION","0.1.0"),
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
 
     app.add_middleware(RequestLoggingMiddleware)
     app.add_middleware(CORSMiddleware, **cors_config())
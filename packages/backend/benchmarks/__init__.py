@@ -0,0 +1,5 @@
+"""Offline benchmarks for the retrieval and rules engines.
+
+Run a module with ``python -m packages.backend.benchmarks.<name> --help``
+from the repository root.
+"""
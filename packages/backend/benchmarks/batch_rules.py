@@ -0,0 +1,87 @@
+"""Claims/second of the columnar batch rule engine against per-claim validation.
+
+Synthetic claims (1-8 lines mixing rule-triggering and clean codes) are
+validated with ``tools.batch_rules.validate_batch`` in chunks and, on a
+sample, with ``icd_cpt_validate`` + ``modifier_rules`` one claim at a time.
+The sample's results are compared for parity::
+
+    python -m packages.backend.benchmarks.batch_rules --claims 10000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List, Sequence
+
+from ..tools.batch_rules import validate_batch
+from ..tools.code_rules import icd_cpt_validate, modifier_rules
+from ..tools.edit_tables import rule_tables
+
+CPTS = ["97012", "97110", "97140", "77080", "99213", "99214", "97530", "20610", "G0283", "9711"]
+DXS = ["M25.50", "M25.511", "M25.512", "Z00.00", "M54.5", "S83.241A", "E11.9", "I10", "bad"]
+MODS = ["59", "GP", "25", "LT", "RT"]
+
+
+def synthetic_claims(n: int, seed: int = 13) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    claims = []
+    for i in range(n):
+        lines = []
+        for _ in range(rng.randint(1, 8)):
+            line: Dict[str, Any] = {
+                "cpt": rng.choice(CPTS),
+                "dx": rng.sample(DXS, rng.randint(1, 3)),
+                "modifiers": [rng.choice(MODS)] if rng.random() < 0.2 else [],
+            }
+            if rng.random() < 0.1:
+                line["details"] = {"flags": ["imaging_generic"]}
+            lines.append(line)
+        claims.append({"claimId": f"C{i}", "provider": {"siteOfService": rng.choice(["11", "22"])}, "lines": lines})
+    return claims
+
+
+def run_scale(n_claims: int, chunk: int, sample: int) -> Dict[str, Any]:
+    tables = rule_tables()
+    batch_s = 0.0
+    issues = 0
+    for start in range(0, n_claims, chunk):
+        claims = synthetic_claims(min(chunk, n_claims - start), seed=start)
+        t0 = time.perf_counter()
+        issues += sum(len(r) for r in validate_batch(claims, tables))
+        batch_s += time.perf_counter() - t0
+
+    claims = synthetic_claims(min(sample, n_claims), seed=0)
+    t0 = time.perf_counter()
+    scalar = [icd_cpt_validate(c, tables) + modifier_rules(c, tables) for c in claims]
+    scalar_s = time.perf_counter() - t0
+    batch_cps = n_claims / batch_s
+    scalar_cps = len(claims) / scalar_s
+    return {
+        "claims": n_claims,
+        "issues": issues,
+        "batch_s": round(batch_s, 3),
+        "batch_claims_per_s": round(batch_cps, 1),
+        "scalar_sample": len(claims),
+        "scalar_claims_per_s": round(scalar_cps, 1),
+        "speedup": round(batch_cps / scalar_cps, 2),
+        "parity": validate_batch(claims, tables) == scalar,
+    }
+
+
+def run(scales: Sequence[int], chunk: int, sample: int) -> Dict[str, Any]:
+    return {"chunk": chunk, "scales": [run_scale(n, chunk, sample) for n in scales]}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--claims", type=int, nargs="+", default=[10_000, 1_000_000])
+    ap.add_argument("--chunk", type=int, default=100_000, help="claims per validate_batch call")
+    ap.add_argument("--sample", type=int, default=10_000, help="claims validated one at a time")
+    args = ap.parse_args()
+    print(json.dumps(run(args.claims, args.chunk, args.sample), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Synthetic policy corpora in the ``data/policies`` clause format."""
+from __future__ import annotations
+
+import os
+import random
+import shutil
+from pathlib import Path
+from typing import List
+
+from ..rag.normalize import extract_clauses
+from ..rag.types import Passage
+
+POLICY_DIR = Path(__file__).resolve().parents[1] / "data" / "policies"
+
+
+def seed_passages(policies_dir: str = str(POLICY_DIR)) -> List[Passage]:
+    passages: List[Passage] = []
+    for path in sorted(Path(policies_dir).glob("*.md")):
+        passages.extend(extract_clauses(path.read_text(encoding="utf-8"), path.name))
+    return passages
+
+
+def synthesize_policies(out_dir: str, n_clauses: int, clauses_per_file: int = 50, seed: int = 13) -> List[str]:
+    """Write ``n_clauses`` clauses derived from the seed corpus into ``out_dir``.
+
+    Each synthetic clause reuses a seed clause's text, shuffles a window of
+    its words and mixes in words from another clause, so the corpus keeps the
+    vocabulary of real policies without being a set of exact duplicates.
+    Returns the written file paths.
+    """
+    rng = random.Random(seed)
+    seeds = seed_passages()
+    vocab = sorted({w for p in seeds for w in p["text"].split()})
+    os.makedirs(out_dir, exist_ok=True)
+    paths: List[str] = []
+    for file_no in range(0, n_clauses, clauses_per_file):
+        base = seeds[(file_no // clauses_per_file) % len(seeds)]
+        family = base["source"].split("-", 1)[0]
+        name = f"{family}-SYN-{file_no // clauses_per_file:05d}"
+        lines = [f"# {name} — Synthetic policy", ""]
+        for j in range(min(clauses_per_file, n_clauses - file_no)):
+            src = seeds[rng.randrange(len(seeds))]
+            words = src["text"].split(" ", 2)[-1].split()
+            start = rng.randrange(max(1, len(words) - 8))
+            window = words[start:start + 8]
+            rng.shuffle(window)
+            words[start:start + 8] = window
+            words += rng.sample(vocab, 6)
+            year = 2020 + rng.randrange(6)
+            end = "" if rng.random() < 0.7 else f" {year + 2}-12-31"
+            lines += [
+                f"- clause_id: {name} §{j + 1}",
+                f"- effective: {year}-01-01 →{end}",
+                "Text: " + " ".join(words),
+                "",
+            ]
+        path = os.path.join(out_dir, f"{name}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        paths.append(path)
+    return paths
+
+
+def scaled_corpus(out_dir: str, n_clauses: int, seed: int = 13) -> List[str]:
+    """The seed policies verbatim plus synthetic clauses up to ``n_clauses``.
+
+    Seed clauses keep their ids, so queries labelled against
+    ``data/policies`` stay answerable while the synthetic clauses act as
+    near-duplicate distractors.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for path in sorted(POLICY_DIR.glob("*.md")):
+        paths.append(shutil.copy(path, out_dir))
+    extra = n_clauses - len(seed_passages())
+    if extra > 0:
+        paths += synthesize_policies(out_dir, extra, seed=seed)
+    return paths
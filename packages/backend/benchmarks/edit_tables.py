@@ -0,0 +1,104 @@
+"""Load time, memory and lookup throughput of NCCI-scale edit tables.
+
+Writes a synthetic procedure-to-procedure table (``--rows`` pairs over a
+pool of ``--codes`` CPT codes and a few shared rationales), loads it with
+``tools.edit_tables`` and runs ``modifier_rules`` over random claims.
+Memory is the RSS growth of this process across the load (Linux)::
+
+    python -m packages.backend.benchmarks.edit_tables --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from ..tools.code_rules import modifier_rules
+from ..tools.edit_tables import RuleTables, load_pair_table, read_rows
+from .index_types import percentile_ms
+
+RATIONALES = [
+    ("Column 2 code is a component of the column 1 procedure.", "NCCI-PTP §1"),
+    ("Mutually exclusive procedures on the same DOS.", "NCCI-PTP §2"),
+    ("Separate procedure billed with its parent.", "NCCI-PTP §3"),
+]
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status", "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+
+def write_ptp_table(path: str, rows: int, codes: List[str], seed: int = 13) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("column1,column2,why,policy_refs\n")
+        for _ in range(rows):
+            a, b = rng.sample(codes, 2)
+            why, ref = RATIONALES[rng.randrange(len(RATIONALES))]
+            f.write(f"{a},{b},{why},{ref}\n")
+
+
+def run(rows: int, n_codes: int, n_claims: int, lines_per_claim: int) -> Dict[str, Any]:
+    rng = random.Random(7)
+    codes = [f"{c:05d}" for c in rng.sample(range(10000, 99999), n_codes)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ptp.csv")
+        write_ptp_table(path, rows, codes)
+        file_mb = os.path.getsize(path) / 1e6
+        gc.collect()
+        before = _rss_mb()
+        start = time.perf_counter()
+        table = load_pair_table(read_rows(path), ("column1", "column2"), symmetric=True)
+        load_s = time.perf_counter() - start
+        gc.collect()
+        table_mb = _rss_mb() - before
+
+    tables = RuleTables(version="bench", ptp=table)
+    claims = [
+        {"lines": [{"cpt": c, "dx": [], "modifiers": []} for c in rng.sample(codes, lines_per_claim)]}
+        for _ in range(n_claims)
+    ]
+    samples: List[float] = []
+    flagged = 0
+    for claim in claims:
+        start = time.perf_counter()
+        flagged += bool(modifier_rules(claim, tables))
+        samples.append(time.perf_counter() - start)
+    return {
+        "rows": rows,
+        "distinct_pairs": len(table),
+        "file_mb": round(file_mb, 1),
+        "load_s": round(load_s, 3),
+        "rows_per_s": round(rows / load_s, 1),
+        "table_mb": round(table_mb, 1),
+        "bytes_per_pair": round(table_mb * 1024 * 1024 / max(len(table), 1), 1),
+        "claims": n_claims,
+        "lines_per_claim": lines_per_claim,
+        "flagged": flagged,
+        "claims_per_s": round(n_claims / sum(samples), 1),
+        "p50_ms": percentile_ms(samples, 50),
+        "p99_ms": percentile_ms(samples, 99),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--codes", type=int, default=15_000, help="distinct CPT codes in the table")
+    ap.add_argument("--claims", type=int, default=20_000)
+    ap.add_argument("--lines", type=int, default=10, help="lines per claim")
+    args = ap.parse_args()
+    print(json.dumps(run(args.rows, args.codes, args.claims, args.lines), indent=2))
+
+
+if __name__ == "__main__":
+    main()
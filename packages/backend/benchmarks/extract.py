@@ -0,0 +1,99 @@
+"""Clause extraction throughput on one very large synthetic policy file.
+
+Compares reading the whole document and calling ``extract_clauses`` with
+streaming the open file through ``iter_clauses``. Each mode runs in a fresh
+process and reports its peak RSS above the post-import baseline (Linux)::
+
+    python -m packages.backend.benchmarks.extract --mb 300
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import resource
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from ..rag.normalize import extract_clauses, iter_clauses
+from .corpus import synthesize_policies
+
+MODES = ("document", "stream")
+
+
+def write_bundle(path: str, mb: int, seed: int = 13) -> int:
+    """Write a policy file of at least ``mb`` megabytes; returns its size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        block = "\n\n".join(Path(p).read_text(encoding="utf-8") for p in synthesize_policies(tmp, 2000, seed=seed))
+    block = block.encode("utf-8")
+    target = mb * 1_000_000
+    with open(path, "wb") as f:
+        written = 0
+        while written < target:
+            f.write(block + b"\n\n")
+            written += len(block) + 2
+    return os.path.getsize(path)
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status", "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return 0.0
+
+
+def _extract(path: str, mode: str, results) -> None:
+    baseline = _rss_mb()  # interpreter plus imports, before touching the file
+    start = time.perf_counter()
+    if mode == "document":
+        with open(path, "r", encoding="utf-8") as f:
+            n = len(extract_clauses(f.read(), os.path.basename(path)))
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            n = sum(1 for _ in iter_clauses(f, os.path.basename(path)))
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0 - baseline
+    results.put({"passages": n, "seconds": elapsed, "peak_mb": peak_mb})
+
+
+def measure(path: str, mode: str) -> Dict[str, Any]:
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    proc = ctx.Process(target=_extract, args=(path, mode, results))
+    proc.start()
+    out = results.get()
+    proc.join()
+    mb = os.path.getsize(path) / 1e6
+    return {
+        "mode": mode,
+        "passages": out["passages"],
+        "seconds": round(out["seconds"], 3),
+        "mb_per_s": round(mb / out["seconds"], 2),
+        "passages_per_s": round(out["passages"] / out["seconds"], 1),
+        "peak_mb_over_baseline": round(out["peak_mb"], 1),
+    }
+
+
+def run(mb: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "VENDOR-LCD-BUNDLE.md")
+        size = write_bundle(path, mb)
+        runs = [measure(path, mode) for mode in MODES]
+    if len({r["passages"] for r in runs}) != 1:
+        raise AssertionError(f"extractors disagree: {runs}")
+    return {"file_mb": round(size / 1e6, 1), "runs": runs}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--mb", type=int, default=300, help="size of the synthetic policy file")
+    args = ap.parse_args()
+    print(json.dumps(run(args.mb), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Load time, footprint and lookup latency of the ICD-10-CM code-set index.
+
+Writes a synthetic CMS order file shaped like the real code set (``--codes``
+codes under three-character categories, billable leaves four to seven
+characters deep, one in four described "unspecified"), loads it with
+``tools.icd10.ICD10Index`` and times ``is_billable``, ``descendants`` and
+``alternative`` on random codes. Memory is the RSS growth of this process
+across the load (Linux)::
+
+    python -m packages.backend.benchmarks.icd10 --codes 74000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import string
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from ..tools.icd10 import ICD10Index, dot
+from .edit_tables import _rss_mb
+from .index_types import percentile_ms
+
+ALNUM = string.digits + string.ascii_uppercase
+
+
+def synthetic_codes(n: int, seed: int = 13) -> List[tuple]:
+    """``(code, billable, description)`` rows: each category is a header with
+    subcategories whose leaves are billable."""
+    rng = random.Random(seed)
+    rows: List[tuple] = []
+    letters = [c for c in string.ascii_uppercase if c != "U"]
+    categories = [f"{a}{b}{c}" for a in letters for b in string.digits for c in ALNUM]
+    for cat in rng.sample(categories, len(categories)):
+        if len(rows) >= n:
+            break
+        rows.append((cat, False, "Category"))
+        for sub in rng.sample(ALNUM[:10], rng.randint(1, 9)):
+            leaves = rng.sample(ALNUM, rng.randint(0, 8))
+            rows.append((cat + sub, not leaves, "Subcategory"))
+            for leaf in leaves:
+                desc = "Condition, unspecified site" if rng.random() < 0.25 else "Condition, right side"
+                code = cat + sub + leaf
+                if rng.random() < 0.3:
+                    rows.append((code, False, desc))
+                    rows.extend((code + "X" + ext, True, desc) for ext in "ADS")
+                else:
+                    rows.append((code, True, desc))
+    return rows[:n]
+
+
+def write_order_file(path: str, rows: List[tuple]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for n, (code, billable, desc) in enumerate(rows, 1):
+            f.write(f"{n:05d} {code:<7} {int(billable)} {desc[:60]:<60} {desc}\n")
+
+
+def _time_us(fn: Callable[[str], Any], codes: List[str]) -> Dict[str, float]:
+    samples: List[float] = []
+    for code in codes:
+        start = time.perf_counter()
+        fn(code)
+        samples.append(time.perf_counter() - start)
+    return {"p50_us": round(percentile_ms(samples, 50) * 1000, 2), "p99_us": round(percentile_ms(samples, 99) * 1000, 2)}
+
+
+def run(n_codes: int, n_lookups: int) -> Dict[str, Any]:
+    rows = synthetic_codes(n_codes)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "icd10cm_order.txt")
+        write_order_file(path, rows)
+        file_mb = os.path.getsize(path) / 1e6
+        gc.collect()
+        before = _rss_mb()
+        start = time.perf_counter()
+        index = ICD10Index.load(path)
+        load_s = time.perf_counter() - start
+        gc.collect()
+        rss_mb = _rss_mb() - before
+
+    rng = random.Random(7)
+    codes = [dot(rows[rng.randrange(len(rows))][0]) for _ in range(n_lookups)]
+    return {
+        "codes": len(index),
+        "billable": int(index.billable.sum()),
+        "file_mb": round(file_mb, 1),
+        "load_s": round(load_s, 3),
+        "index_mb": round(index.nbytes / 1e6, 2),
+        "rss_mb": round(rss_mb, 1),
+        "is_billable": _time_us(index.is_billable, codes),
+        "descendants": _time_us(index.descendants, codes),
+        "alternative_cold": _time_us(index.alternative, codes),
+        "alternative_cached": _time_us(index.alternative, codes),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--codes", type=int, default=74_000)
+    ap.add_argument("--lookups", type=int, default=20_000)
+    args = ap.parse_args()
+    print(json.dumps(run(args.codes, args.lookups), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare flat, IVF and HNSW policy indexes on a synthetic corpus.
+
+Reports build time, recall@k against the exact flat index and single-query
+p50/p99 latency for each index type::
+
+    python -m packages.backend.benchmarks.index_types --clauses 20000 --k 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from ..rag.index_factory import make_index, resolve_spec
+from ..rag.indexer import _embed_passages, _gather_passages
+from ..rag.types import IndexSpec
+from .corpus import synthesize_policies
+
+DEFAULT_SPECS: List[IndexSpec] = [
+    {"type": "flat"},
+    {"type": "ivf", "nprobe": 4},
+    {"type": "ivf", "nprobe": 16},
+    {"type": "hnsw", "ef_search": 32},
+    {"type": "hnsw", "ef_search": 128},
+]
+
+
+def percentile_ms(samples: List[float], q: float) -> float:
+    return round(float(np.percentile(np.asarray(samples) * 1000.0, q)), 4)
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return round(hits / float(truth.size), 4)
+
+
+def time_queries(index, queries: np.ndarray, k: int):
+    found = np.empty((len(queries), k), dtype="int64")
+    samples: List[float] = []
+    for row in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[row:row + 1], k)
+        samples.append(time.perf_counter() - start)
+        found[row] = ids[0]
+    return found, samples
+
+
+def run(n_clauses: int, k: int, n_queries: int, specs: List[IndexSpec] = DEFAULT_SPECS) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        synthesize_policies(tmp, n_clauses)
+        passages = _gather_passages(tmp)
+    embeddings, dim, model = _embed_passages([p["text"] for p in passages])
+
+    rng = np.random.default_rng(13)
+    picks = rng.choice(len(embeddings), size=min(n_queries, len(embeddings)), replace=False)
+    noise = rng.normal(scale=0.05, size=(len(picks), dim)).astype("float32")
+    queries = embeddings[picks] + noise
+
+    report: Dict[str, Any] = {"clauses": len(passages), "dim": dim, "model": model, "k": k, "indexes": []}
+    truth = None
+    for requested in specs:
+        spec = resolve_spec(requested, len(embeddings))
+        start = time.perf_counter()
+        index = make_index(dim, spec)
+        if not index.is_trained:
+            index.train(embeddings)
+        index.add_with_ids(embeddings, np.arange(len(embeddings), dtype="int64"))
+        build_s = time.perf_counter() - start
+        found, samples = time_queries(index, queries, k)
+        if truth is None:
+            truth = found
+        report["indexes"].append(
+            {
+                "spec": spec,
+                "build_s": round(build_s, 4),
+                "recall_at_k": recall_at_k(truth, found),
+                "p50_ms": percentile_ms(samples, 50),
+                "p99_ms": percentile_ms(samples, 99),
+            }
+        )
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--clauses", type=int, default=10000)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+    print(json.dumps(run(args.clauses, args.k, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare float32 and quantized policy indexes on a synthetic corpus.
+
+Reports serialized index size, compression ratio of the vector codes,
+recall@k against the exact flat index and single-query p50/p99 latency,
+with and without exact re-ranking of ``refine * k`` candidates::
+
+    python -m packages.backend.benchmarks.quantization --clauses 20000 --k 10
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import faiss
+import numpy as np
+
+from ..rag.index_factory import is_quantized, make_index, resolve_spec
+from ..rag.indexer import _embed_passages, _gather_passages
+from ..rag.retrieve import _exact_rerank
+from ..rag.types import IndexSpec
+from .corpus import synthesize_policies
+from .index_types import percentile_ms, recall_at_k, time_queries
+
+DEFAULT_SPECS: List[IndexSpec] = [
+    {"type": "flat"},
+    {"type": "flat", "quantizer": "sqfp16"},
+    {"type": "flat", "quantizer": "sq8"},
+    {"type": "ivf", "quantizer": "sq8", "nprobe": 16},
+    {"type": "ivf", "quantizer": "pq", "nprobe": 16},
+    {"type": "hnsw", "quantizer": "sq8"},
+]
+
+
+def time_reranked(index, vectors: np.ndarray, queries: np.ndarray, k: int, refine: int):
+    ids = np.arange(len(vectors), dtype="int64")
+    found = np.empty((len(queries), k), dtype="int64")
+    samples: List[float] = []
+    for row in range(len(queries)):
+        q = queries[row:row + 1]
+        start = time.perf_counter()
+        _, cand = index.search(q, k * refine)
+        _, best = _exact_rerank(vectors, ids, q, cand, k)
+        samples.append(time.perf_counter() - start)
+        found[row] = best[0]
+    return found, samples
+
+
+def run(n_clauses: int, k: int, n_queries: int, specs: List[IndexSpec] = DEFAULT_SPECS) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        synthesize_policies(tmp, n_clauses)
+        passages = _gather_passages(tmp)
+    embeddings, dim, model = _embed_passages([p["text"] for p in passages])
+
+    rng = np.random.default_rng(13)
+    picks = rng.choice(len(embeddings), size=min(n_queries, len(embeddings)), replace=False)
+    noise = rng.normal(scale=0.05, size=(len(picks), dim)).astype("float32")
+    queries = embeddings[picks] + noise
+
+    report: Dict[str, Any] = {"clauses": len(passages), "dim": dim, "model": model, "k": k, "indexes": []}
+    truth = None
+    for requested in specs:
+        spec = resolve_spec(requested, len(embeddings), dim)
+        start = time.perf_counter()
+        index = make_index(dim, spec)
+        if not index.is_trained:
+            index.train(embeddings)
+        index.add_with_ids(embeddings, np.arange(len(embeddings), dtype="int64"))
+        build_s = time.perf_counter() - start
+        found, samples = time_queries(index, queries, k)
+        if truth is None:
+            truth = found
+        row: Dict[str, Any] = {
+            "spec": spec,
+            "index_mb": round(len(faiss.serialize_index(index)) / 1e6, 3),
+            "build_s": round(build_s, 4),
+            "recall_at_k": recall_at_k(truth, found),
+            "p50_ms": percentile_ms(samples, 50),
+            "p99_ms": percentile_ms(samples, 99),
+        }
+        if is_quantized(spec):
+            found, samples = time_reranked(index, embeddings, queries, k, int(spec["refine"]))
+            row["reranked"] = {
+                "recall_at_k": recall_at_k(truth, found),
+                "p50_ms": percentile_ms(samples, 50),
+                "p99_ms": percentile_ms(samples, 99),
+            }
+        report["indexes"].append(row)
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--clauses", type=int, default=10000)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+    print(json.dumps(run(args.clauses, args.k, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Retrieval latency and recall baseline over scaled policy corpora.
+
+For each corpus size the seed policies are mixed with synthetic distractor
+clauses, indexed with ``build_index`` and queried through ``semantic_search``
+(labelled free-text queries) and ``query_policy_for_claim_context``
+(labelled example claims). The JSON report is meant to be stored and diffed
+between releases::
+
+    python -m packages.backend.benchmarks.retrieval --out baseline.json
+    python -m packages.backend.benchmarks.retrieval --compare baseline.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..rag import embedder, versions
+from ..rag.index_cache import clear_cache
+from ..rag.indexer import build_index
+from ..rag.retrieve import query_policy_for_claim_context, semantic_search
+from ..rag.types import IndexSpec, Passage
+from .corpus import scaled_corpus
+from .index_types import percentile_ms
+
+CLAIMS_DIR = Path(__file__).resolve().parents[1] / "data" / "examples" / "claims"
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000)
+
+# Free-text queries and the clauses that answer them in data/policies.
+LABELLED_QUERIES: List[Tuple[str, Set[str]]] = [
+    ("modifier 59 with 97012 and 97110 same date of service", {"UHC-LCD-123 §3b", "UHC-PT-222 §1"}),
+    ("UnitedHealthcare 97012 97110 modifier 59", {"UHC-LCD-123 §3b"}),
+    ("E/M modifier 25 significant separately", {"Highmark-RAD-871 §4"}),
+    ("POS 11 imaging documentation rationale", {"BCBS-P123 §7", "Molina-MS-031 §3"}),
+]
+
+# Example claims and the clauses their claim-context query should surface.
+LABELLED_CLAIMS: List[Tuple[str, Set[str]]] = [
+    ("case_mod25_e_and_m.json", {"Highmark-RAD-871 §4"}),
+    ("case_lab_mednec.json", {"CMS-NCD-456 §2"}),
+    ("case_multi_line_bundle.json", {"UHC-PT-222 §1", "Humana-PT-014 §2"}),
+]
+
+
+def recall(results: Sequence[Passage], relevant: Set[str]) -> float:
+    return len({p["clause_id"] for p in results} & relevant) / float(len(relevant))
+
+
+def _measure(run: Callable[[Any], List[Passage]], cases: List[Tuple[Any, Set[str]]], rounds: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    recalls: List[float] = []
+    for _ in range(rounds):
+        # Every round pays for query encoding, as a cold query would.
+        embedder.clear_query_cache()
+        for case, relevant in cases:
+            start = time.perf_counter()
+            results = run(case)
+            samples.append(time.perf_counter() - start)
+            recalls.append(recall(results, relevant))
+    return {
+        "queries": len(samples),
+        "qps": round(len(samples) / max(sum(samples), 1e-9), 1),
+        "p50_ms": percentile_ms(samples, 50),
+        "p99_ms": percentile_ms(samples, 99),
+        "recall_at_k": round(sum(recalls) / len(recalls), 4),
+    }
+
+
+def run_scale(n_clauses: int, k: int, rounds: int, spec: Optional[IndexSpec] = None) -> Dict[str, Any]:
+    claims = [(json.loads((CLAIMS_DIR / name).read_text(encoding="utf-8")), rel) for name, rel in LABELLED_CLAIMS]
+    with tempfile.TemporaryDirectory() as tmp:
+        policies, vector_dir = f"{tmp}/policies", f"{tmp}/vector"
+        scaled_corpus(policies, n_clauses)
+        start = time.perf_counter()
+        _, meta = build_index(policies, vector_dir, rebuild=True, index_spec=spec)
+        build_s = time.perf_counter() - start
+        manifest = versions.read_manifest(versions.resolve(vector_dir))
+        clear_cache()
+        semantic_search(LABELLED_QUERIES[0][0], k, vector_dir)  # load the index outside the timings
+        report = {
+            "clauses": len(meta["passages"]),
+            "model": meta["model"],
+            "index": meta["index"],
+            "build_s": round(build_s, 3),
+            "index_bytes": sum(f["bytes"] for f in manifest["files"].values()),
+            "semantic_search": _measure(lambda q: semantic_search(q, k, vector_dir)["results"], LABELLED_QUERIES, rounds),
+            "claim_context": _measure(
+                lambda c: query_policy_for_claim_context(c, k, vector_dir)["results"], claims, rounds
+            ),
+        }
+        clear_cache()
+    return report
+
+
+def run(scales: Sequence[int] = DEFAULT_SCALES, k: int = 5, rounds: int = 20, spec: Optional[IndexSpec] = None) -> Dict[str, Any]:
+    return {"k": k, "rounds": rounds, "scales": [run_scale(n, k, rounds, spec) for n in scales]}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per scale and query kind, ``current - baseline`` for each numeric metric."""
+    old = {s["clauses"]: s for s in baseline["scales"]}
+    diffs = []
+    for scale in current["scales"]:
+        before = old.get(scale["clauses"])
+        if before is None:
+            continue
+        row: Dict[str, Any] = {"clauses": scale["clauses"]}
+        for key in ("build_s", "index_bytes"):
+            row[key] = round(scale[key] - before[key], 4)
+        for kind in ("semantic_search", "claim_context"):
+            row[kind] = {m: round(scale[kind][m] - before[kind][m], 4) for m in ("qps", "p50_ms", "p99_ms", "recall_at_k")}
+        diffs.append(row)
+    return diffs
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--index", default="flat", help="index type: flat, ivf or hnsw")
+    ap.add_argument("--out", help="write the report to this JSON file")
+    ap.add_argument("--compare", help="print the difference against this baseline JSON")
+    args = ap.parse_args()
+    report = run(args.scales, args.k, args.rounds, {"type": args.index})
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print(json.dumps(compare(json.load(f), report), indent=2))
+    else:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
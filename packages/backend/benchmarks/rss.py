@@ -0,0 +1,99 @@
+"""Resident memory of N worker processes serving one policy index.
+
+Each worker is a fresh (spawned) process, like a uvicorn worker, that loads
+the index with ``load_index`` either into private memory or memory-mapped,
+then probes every inverted list once so the whole index is resident. All
+workers are measured while they hold the index at the same time; PSS
+splits shared pages between the processes mapping them, so its sum is the
+real memory cost of the fleet. Linux only (reads ``/proc``)::
+
+    python -m packages.backend.benchmarks.rss --clauses 50000 --workers 1 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import tempfile
+from typing import Any, Dict, Sequence
+
+import faiss
+import numpy as np
+
+from ..rag.index_factory import supports_mmap
+from ..rag.indexer import build_index, load_index
+from .corpus import synthesize_policies
+
+MODES = ("private", "mmap")
+
+
+def _memory_kb() -> Dict[str, int]:
+    fields = {"Rss": "rss", "Pss": "pss", "Anonymous": "anon"}
+    out: Dict[str, int] = {}
+    with open("/proc/self/smaps_rollup", "r", encoding="utf-8") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in fields:
+                out[fields[name]] = int(value.split()[0])
+    return out
+
+
+def _worker(vector_dir: str, mmap: bool, barrier, results) -> None:
+    before = _memory_kb()
+    index, meta = load_index(vector_dir, mmap=mmap)
+    ivf = faiss.extract_index_ivf(index) if supports_mmap(meta["index"]) else None
+    if ivf is not None:
+        ivf.nprobe = ivf.nlist
+    rng = np.random.default_rng(0)
+    index.search(rng.normal(size=(8, index.d)).astype("float32"), 10)
+    barrier.wait()  # every worker holds the index before anyone measures
+    after = _memory_kb()
+    results.put({k: after[k] - before[k] for k in after})
+    barrier.wait()  # keep the mapping alive until everyone has measured
+
+
+def measure(vector_dir: str, mode: str, workers: int) -> Dict[str, Any]:
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(vector_dir, mode == "mmap", barrier, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    deltas = [results.get(timeout=600) for _ in procs]
+    for p in procs:
+        p.join()
+    mb = lambda key: round(sum(d[key] for d in deltas) / 1024.0, 2)
+    return {"mode": mode, "workers": workers, "rss_mb": mb("rss"), "pss_mb": mb("pss"), "private_mb": mb("anon")}
+
+
+def run(n_clauses: int, workers: Sequence[int] = (1, 4, 8), nlist: int = 0) -> Dict[str, Any]:
+    spec: Dict[str, Any] = {"type": "ivf"}
+    if nlist:
+        spec["nlist"] = nlist
+    with tempfile.TemporaryDirectory() as tmp:
+        synthesize_policies(f"{tmp}/policies", n_clauses)
+        index, meta = build_index(f"{tmp}/policies", f"{tmp}/vector", rebuild=True, index_spec=spec)
+        report: Dict[str, Any] = {
+            "clauses": len(meta["passages"]),
+            "index": meta["index"],
+            "index_mb": round(len(faiss.serialize_index(index)) / 1e6, 2),
+            "runs": [],
+        }
+        del index, meta
+        for n in workers:
+            for mode in MODES:
+                report["runs"].append(measure(f"{tmp}/vector", mode, n))
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--clauses", type=int, default=50000)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    ap.add_argument("--nlist", type=int, default=0, help="IVF lists (default ~4*sqrt(N))")
+    args = ap.parse_args()
+    print(json.dumps(run(args.clauses, args.workers, args.nlist), indent=2))
+
+
+if __name__ == "__main__":
+    main()
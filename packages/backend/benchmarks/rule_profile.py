@@ -0,0 +1,57 @@
+"""Cost of per-rule profiling in ``icd_cpt_validate`` + ``modifier_rules``.
+
+Validates the same synthetic claims (see ``benchmarks.batch_rules``) with
+``tools.rule_profile`` switched off and on, interleaving rounds so both see
+the same machine state, and reports claims/second and the overhead::
+
+    python -m packages.backend.benchmarks.rule_profile --claims 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+from ..tools import rule_profile
+from ..tools.code_rules import icd_cpt_validate, modifier_rules
+from ..tools.edit_tables import rule_tables
+from .batch_rules import synthetic_claims
+
+
+def run(n_claims: int, rounds: int) -> Dict[str, Any]:
+    tables = rule_tables()
+    claims = synthetic_claims(n_claims)
+    was = rule_profile.is_enabled()
+    best = {False: float("inf"), True: float("inf")}
+    try:
+        for _ in range(rounds):
+            for on in (False, True):
+                rule_profile.set_enabled(on)
+                start = time.perf_counter()
+                for c in claims:
+                    icd_cpt_validate(c, tables)
+                    modifier_rules(c, tables)
+                best[on] = min(best[on], time.perf_counter() - start)
+    finally:
+        rule_profile.set_enabled(was)
+    return {
+        "claims": n_claims,
+        "rounds": rounds,
+        "off_claims_per_s": round(n_claims / best[False], 1),
+        "on_claims_per_s": round(n_claims / best[True], 1),
+        "on_overhead_pct": round(100 * (best[True] / best[False] - 1), 1),
+        "on_us_per_claim": round(1e6 * (best[True] - best[False]) / n_claims, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--claims", type=int, default=20_000)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+    print(json.dumps(run(args.claims, args.rounds), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,17 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     METRICS_NAMESPACE: str = "codexia"
     RAG_TOPK_DEFAULT: int = 5
+    RAG_QUERY_CACHE_SIZE: int = 4096
+    RAG_SEARCH_CONCURRENCY: int = 4
+    RAG_INDEX_MMAP: bool = True   # map IVF indexes read-only, shared across workers
+    RAG_RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RAG_RERANK_CANDIDATES: int = 0   # 0 disables cross-encoder re-ranking in assess
+    RAG_RERANK_BUDGET_MS: float = 150.0
+    RAG_RERANK_CACHE_SIZE: int = 8192
+    WARMUP_ON_STARTUP: bool = True
+    RULE_PROFILING: bool = True   # per-rule call/hit/duration metrics; see tools.rule_profile
+    RULES_PATH: str = ""   # claim edit tables directory; empty uses the bundled data/rules
+    ICD10CM_PATH: str = ""   # CMS icd10cm_order file; empty uses the rules manifest's code set
     W_DELTA: float = 0.5
     W_FEAS: float = 0.25
     W_URG: float = 0.15
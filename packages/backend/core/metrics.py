@@ -1,4 +1,10 @@
-from prometheus_client import Counter, Histogram
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Dict, Iterator
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily, Metric
 from .config import Settings
 
 _settings = Settings()
@@ -22,6 +28,24 @@ RATE_LIMIT_DROPPED = Counter(
     ["path"],
 )
 
+QUERY_EMBEDDING_CACHE = Counter(
+    f"{_settings.METRICS_NAMESPACE}_query_embedding_cache_total",
+    "Query embedding cache lookups",
+    ["model", "result"],
+)
+
+RERANK_QUERIES = Counter(
+    f"{_settings.METRICS_NAMESPACE}_rerank_queries_total",
+    "Queries through the cross-encoder stage, by outcome",
+    ["outcome"],
+)
+
+WARMUP_DURATION = Gauge(
+    f"{_settings.METRICS_NAMESPACE}_warmup_duration_seconds",
+    "Startup warm-up duration, in seconds",
+    ["stage"],
+)
+
 
 def record_request(method: str, path: str, status: int, dur_s: float) -> None:
     REQUESTS_TOTAL.labels(method=method, path=path, status=str(status)).inc()
@@ -30,3 +54,136 @@ def record_request(method: str, path: str, status: int, dur_s: float) -> None:
 
 def inc_rate_limited(path: str) -> None:
     RATE_LIMIT_DROPPED.labels(path=path).inc()
+
+
+def record_query_embedding_cache(model: str, hits: int, misses: int) -> None:
+    if hits:
+        QUERY_EMBEDDING_CACHE.labels(model=model, result="hit").inc(hits)
+    if misses:
+        QUERY_EMBEDDING_CACHE.labels(model=model, result="miss").inc(misses)
+
+
+def record_warmup(stage: str, seconds: float) -> None:
+    WARMUP_DURATION.labels(stage=stage).set(seconds)
+
+
+def record_rerank(outcome: str, n: int) -> None:
+    if n:
+        RERANK_QUERIES.labels(outcome=outcome).inc(n)
+
+
+RULE_DURATION_BUCKETS = (5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+
+
+class _RuleStats:
+    __slots__ = ("calls", "hits", "seconds", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hits = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(RULE_DURATION_BUCKETS) + 1)
+
+    def add(self, other: "_RuleStats") -> None:
+        self.calls += other.calls
+        self.hits += other.hits
+        self.seconds += other.seconds
+        self.buckets = [t + n for t, n in zip(self.buckets, other.buckets)]
+
+
+class _ThreadTable:
+    """Holder of one thread's table; collected when the thread exits."""
+
+    __slots__ = ("table", "__weakref__")
+
+    def __init__(self) -> None:
+        self.table: Dict[str, _RuleStats] = {}
+
+
+class RuleStatsCollector:
+    """Per-rule call, hit and duration metrics of the claim validators.
+
+    Rules run several times per claim, so ``record`` only bumps
+    plain counters in a per-thread table (no locks, no label lookups); the
+    tables are summed into ``rule_calls_total``, ``rule_hits_total`` and the
+    ``rule_duration_seconds`` histogram when the registry is scraped. When a
+    thread exits its table is folded into a retired total and dropped, so
+    memory and scrape cost follow the number of live threads.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self._local = threading.local()
+        self._tables: Dict[int, Dict[str, _RuleStats]] = {}
+        self._retired: Dict[str, _RuleStats] = {}
+        self._lock = threading.Lock()
+
+    def _table(self) -> Dict[str, _RuleStats]:
+        holder = _ThreadTable()
+        with self._lock:
+            self._tables[id(holder)] = holder.table
+        # The thread-local owns the only reference to ``holder``; it is
+        # released when the thread ends.
+        weakref.finalize(holder, self._retire, id(holder))
+        self._local.holder = holder
+        return holder.table
+
+    def _retire(self, key: int) -> None:
+        with self._lock:
+            table = self._tables.pop(key, None)
+            for rule, stats in (table or {}).items():
+                self._retired.setdefault(rule, _RuleStats()).add(stats)
+
+    def record(self, rule: str, hits: int, seconds: float) -> None:
+        try:
+            table = self._local.holder.table
+        except AttributeError:
+            table = self._table()
+        stats = table.get(rule)
+        if stats is None:
+            stats = table[rule] = _RuleStats()
+        stats.calls += 1
+        stats.hits += hits
+        stats.seconds += seconds
+        stats.buckets[bisect_left(RULE_DURATION_BUCKETS, seconds)] += 1
+
+    def live_tables(self) -> int:
+        with self._lock:
+            return len(self._tables)
+
+    def totals(self) -> Dict[str, _RuleStats]:
+        out: Dict[str, _RuleStats] = {}
+        with self._lock:
+            tables = [self._retired] + list(self._tables.values())
+            for table in tables:
+                for rule, stats in list(table.items()):
+                    out.setdefault(rule, _RuleStats()).add(stats)
+        return out
+
+    def collect(self) -> Iterator[Metric]:
+        calls = CounterMetricFamily(f"{self.namespace}_rule_calls", "Claim rule evaluations", labels=["rule"])
+        hits = CounterMetricFamily(f"{self.namespace}_rule_hits", "Issues raised by claim rules", labels=["rule"])
+        duration = HistogramMetricFamily(
+            f"{self.namespace}_rule_duration_seconds",
+            "Claim rule evaluation time per claim, in seconds",
+            labels=["rule"],
+        )
+        for rule, stats in sorted(self.totals().items()):
+            calls.add_metric([rule], stats.calls)
+            hits.add_metric([rule], stats.hits)
+            cumulative, buckets = 0, []
+            for bound, n in zip(RULE_DURATION_BUCKETS + (float("inf"),), stats.buckets):
+                cumulative += n
+                buckets.append(("+Inf" if bound == float("inf") else str(bound), cumulative))
+            duration.add_metric([rule], buckets, stats.seconds)
+        yield calls
+        yield hits
+        yield duration
+
+
+RULE_STATS = RuleStatsCollector(_settings.METRICS_NAMESPACE)
+REGISTRY.register(RULE_STATS)
+
+
+def record_rule(rule: str, hits: int, seconds: float) -> None:
+    RULE_STATS.record(rule, hits, seconds)
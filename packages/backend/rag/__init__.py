@@ -1,16 +1,40 @@
-from .indexer import build_index, load_index
-from .retrieve import semantic_search, query_policy_for_claim_context, top_citations_for_issue
-from .normalize import normalize_text, extract_clauses
-from .types import Passage, Retrieval
+from .indexer import build_index, build_shard, load_index, passage_for_id
+from .index_cache import get_index, cache_stats, clear_cache, enable_hot_swap
+from .versions import current_version, gc_versions
+from .retrieve import (
+    semantic_search,
+    semantic_search_many,
+    claim_context_query,
+    query_policy_for_claim_context,
+    top_citations_for_issue,
+)
+from .async_search import asemantic_search, asemantic_search_many
+from .normalize import normalize_text, extract_clauses, iter_clauses
+from .types import IndexSpec, Passage, Retrieval, SearchFilter
 
 __all__ = [
     "build_index",
+    "build_shard",
     "load_index",
+    "passage_for_id",
+    "get_index",
+    "cache_stats",
+    "clear_cache",
+    "enable_hot_swap",
+    "current_version",
+    "gc_versions",
     "semantic_search",
+    "semantic_search_many",
+    "asemantic_search",
+    "asemantic_search_many",
+    "claim_context_query",
     "query_policy_for_claim_context",
     "top_citations_for_issue",
     "normalize_text",
     "extract_clauses",
+    "iter_clauses",
     "Passage",
     "Retrieval",
+    "IndexSpec",
+    "SearchFilter",
 ]
@@ -0,0 +1,99 @@
+"""Coroutine front-end for ``semantic_search`` that keeps the event loop free.
+
+Index loading, query encoding, the FAISS search and optional re-ranking run
+as separate steps on a dedicated thread pool of ``RAG_SEARCH_CONCURRENCY``
+workers, independent of Starlette's threadpool for sync routes. Cancelling the awaiting task (e.g.
+when the client disconnects) drops steps that have not started yet; a step
+already running finishes but nothing after it is scheduled.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from ..core.config import Settings
+from . import shards
+from .retrieve import (
+    _encode_pending,
+    _plan_search,
+    _rerank_results,
+    _retrievals,
+    _search_pending,
+    _search_shards,
+    shutdown_shard_pool,
+)
+from .types import Retrieval, SearchFilter
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def search_executor() -> ThreadPoolExecutor:
+    """The shared retrieval executor, created on first use."""
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            workers = max(1, Settings().RAG_SEARCH_CONCURRENCY)
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-search")
+        return _EXECUTOR
+
+
+def shutdown_search_executor() -> None:
+    """Stop the executor and the shard pool, discarding queued work (used on
+    app shutdown)."""
+    global _EXECUTOR
+    with _LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    shutdown_shard_pool()
+
+
+async def _run(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(search_executor(), functools.partial(fn, *args))
+
+
+async def asemantic_search_many(
+    queries: List[str],
+    topk: int,
+    vector_dir: str,
+    filters: Optional[SearchFilter] = None,
+    mode: str = "dense",
+    exact_rerank: Optional[bool] = None,
+    rerank_candidates: int = 0,
+    rerank_budget_ms: Optional[float] = None,
+    payer: Optional[str] = None,
+) -> List[Retrieval]:
+    """Async ``semantic_search_many``; results are identical."""
+    depth = max(topk, rerank_candidates)
+    if shards.is_sharded(vector_dir):
+        state = await _run(_search_shards, queries, depth, vector_dir, filters, mode, exact_rerank, payer)
+    else:
+        state = await _run(_plan_search, queries, depth, vector_dir, filters, mode, exact_rerank)
+        if state.pending:
+            q_emb = await _run(_encode_pending, state)
+            await _run(_search_pending, state, q_emb)
+    if rerank_candidates > 0:
+        await _run(_rerank_results, state, topk, rerank_budget_ms)
+    return _retrievals(state)
+
+
+async def asemantic_search(
+    query: str,
+    topk: int,
+    vector_dir: str,
+    filters: Optional[SearchFilter] = None,
+    mode: str = "dense",
+    exact_rerank: Optional[bool] = None,
+    rerank_candidates: int = 0,
+    rerank_budget_ms: Optional[float] = None,
+    payer: Optional[str] = None,
+) -> Retrieval:
+    retrievals = await asemantic_search_many(
+        [query], topk, vector_dir, filters, mode, exact_rerank, rerank_candidates, rerank_budget_ms, payer
+    )
+    return retrievals[0]
@@ -0,0 +1,100 @@
+"""Process-wide embedding model registry and query embedding cache.
+
+Models are loaded lazily on first use and shared by every caller in the
+process, so a query only pays for ``encode`` and not for reading weights.
+Query vectors are memoised in a bounded LRU keyed by model and normalized
+query text.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from ..core.config import Settings
+from ..core.metrics import record_query_embedding_cache
+from .hashing import hash_embed
+from .registry import LRUCache, ModelRegistry
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+_MODELS: ModelRegistry[SentenceTransformer] = ModelRegistry(
+    lambda name: SentenceTransformer(name, local_files_only=True)
+)
+
+
+def get_model(name: str) -> Optional[SentenceTransformer]:
+    """Return the shared model for ``name`` or ``None`` when it is unavailable."""
+    return _MODELS.get(name)
+
+
+def warm_up(names: Iterable[str] = (MODEL_NAME,)) -> None:
+    """Load the given models and run one encode so first requests stay fast."""
+    for name in names:
+        model = get_model(name)
+        if model is not None:
+            model.encode(["warm up"], show_progress_bar=False, normalize_embeddings=True)
+
+
+def clear() -> None:
+    """Drop every loaded model and cached query vector (used by tests and reloads)."""
+    _MODELS.clear()
+    _QUERY_CACHE.clear()
+
+
+def encode(texts: List[str], model_name: str, dim: int) -> np.ndarray:
+    """Embed ``texts`` with ``model_name``, falling back to md5 word hashing."""
+    model = get_model(model_name)
+    try:
+        if model is None:
+            raise RuntimeError(f"{model_name} is not available locally")
+        return model.encode(texts, show_progress_bar=False, normalize_embeddings=True).astype("float32")
+    except Exception:
+        return hash_embed(texts, dim)
+
+
+class QueryCache(LRUCache[Tuple[str, str], np.ndarray]):
+    """LRU of query vectors keyed by ``(model, normalized query)``; stored
+    vectors are read-only copies."""
+
+    def put(self, key: Tuple[str, str], vec: np.ndarray) -> None:
+        if self.maxsize <= 0:
+            return
+        vec = vec.copy()
+        vec.setflags(write=False)
+        super().put(key, vec)
+
+
+_QUERY_CACHE = QueryCache(Settings().RAG_QUERY_CACHE_SIZE)
+
+
+def embed_queries(norm_queries: List[str], model_name: str, dim: int) -> np.ndarray:
+    """Return one row per normalized query, encoding only cache misses.
+
+    Misses are de-duplicated and encoded in a single batch.
+    """
+    out = np.empty((len(norm_queries), dim), dtype="float32")
+    missing: Dict[str, List[int]] = {}
+    for row, q in enumerate(norm_queries):
+        vec = _QUERY_CACHE.get((model_name, q))
+        if vec is None:
+            missing.setdefault(q, []).append(row)
+        else:
+            out[row] = vec
+    hits = len(norm_queries) - sum(len(rows) for rows in missing.values())
+    if missing:
+        texts = list(missing)
+        for q, vec in zip(texts, encode(texts, model_name, dim)):
+            _QUERY_CACHE.put((model_name, q), vec)
+            out[missing[q]] = vec
+    record_query_embedding_cache(model_name, hits, len(norm_queries) - hits)
+    return out
+
+
+def query_cache_stats() -> Dict[str, int]:
+    return _QUERY_CACHE.stats()
+
+
+def clear_query_cache() -> None:
+    _QUERY_CACHE.clear()
@@ -0,0 +1,56 @@
+"""Metadata pre-filters evaluated against the passage store columns.
+
+Filters resolve to the set of eligible FAISS ids, which is handed to the
+index as an ``IDSelector`` so top-k is filled only with eligible clauses.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .passage_store import PassageStore
+from .types import SearchFilter
+
+
+def _parse_dos(s: str) -> date:
+    try:
+        return date.fromisoformat(s)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date_of_service filter {s!r}; expected YYYY-MM-DD") from None
+
+
+def _date_int(d: date) -> int:
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def eligible_ids(meta: Dict[str, Any], filters: Optional[SearchFilter]) -> Optional[np.ndarray]:
+    """Return the ids passing ``filters``, or ``None`` when nothing is filtered."""
+    if not filters:
+        return None
+    payer = (filters.get("payer") or "").lower()
+    dos = filters.get("date_of_service")
+    dos_date = _parse_dos(dos) if dos else None
+    passages = meta["passages"]
+
+    if isinstance(passages, PassageStore):
+        mask = np.ones(len(passages), dtype=bool)
+        if payer:
+            src_ok = np.array([s.lower().startswith(payer) for s in passages.sources], dtype=bool)
+            mask &= src_ok[passages.source_ids]
+        if dos_date is not None:
+            d = _date_int(dos_date)
+            eff_to = passages.effective_to
+            mask &= (passages.effective_from <= d) & ((eff_to == 0) | (eff_to >= d))
+        return passages.ids[mask].astype("int64")
+
+    dos = dos_date.isoformat() if dos_date is not None else None
+    keep = []
+    for vid, p in enumerate(passages):
+        if payer and not p["source"].lower().startswith(payer):
+            continue
+        if dos and not (p["effective_from"] <= dos and (not p.get("effective_to") or dos <= p["effective_to"])):
+            continue
+        keep.append(vid)
+    return np.array(keep, dtype="int64")
@@ -0,0 +1,54 @@
+"""Vectorized md5 feature-hashing embedder.
+
+This is the embedder used when no local sentence-transformer is available.
+Each word is hashed into one of ``dim`` buckets with md5, counts are
+L2-normalized. Unique tokens are hashed once and remembered, and the count
+matrix for a whole batch is built with a single ``np.bincount``. Output is
+bit-identical to the original per-word loop, so existing indexes stay valid.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+HASH_DIM = 384
+MAX_CACHED_TOKENS = 1_000_000
+
+
+class HashingVectorizer:
+    def __init__(self, dim: int = HASH_DIM):
+        self.dim = dim
+        self._buckets: Dict[str, int] = {}
+
+    def bucket(self, token: str) -> int:
+        b = self._buckets.get(token)
+        if b is None:
+            if len(self._buckets) >= MAX_CACHED_TOKENS:
+                self._buckets.clear()
+            b = int(hashlib.md5(token.encode("utf-8")).hexdigest(), 16) % self.dim
+            self._buckets[token] = b
+        return b
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed whitespace-tokenized ``texts`` (callers normalize first)."""
+        n, dim = len(texts), self.dim
+        cells: List[int] = []
+        for row, text in enumerate(texts):
+            base = row * dim
+            cells.extend(base + self.bucket(tok) for tok in text.split())
+        counts = np.bincount(np.asarray(cells, dtype=np.int64), minlength=n * dim)
+        emb = counts.reshape(n, dim).astype("float32")
+        norms = np.linalg.norm(emb, axis=1, keepdims=True) + 1e-10
+        return emb / norms
+
+
+_VECTORIZERS: Dict[int, HashingVectorizer] = {}
+
+
+def hash_embed(texts: Sequence[str], dim: int = HASH_DIM) -> np.ndarray:
+    vec = _VECTORIZERS.get(dim)
+    if vec is None:
+        vec = _VECTORIZERS.setdefault(dim, HashingVectorizer(dim))
+    return vec.transform(texts)
@@ -0,0 +1,179 @@
+"""In-process cache of loaded vector indexes keyed by vector directory.
+
+A cached handle is reused until the files backing it change on disk
+(detected through the published version and the files' mtime and size), at
+which point it is reloaded.
+
+Directories registered with ``enable_hot_swap`` never block a request on a
+reload: the lookup that notices a new version starts loading it on a
+background thread and keeps returning the loaded version until the new one
+is ready. Searches already holding the old ``(index, meta)`` finish on it.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Set, Tuple
+
+from . import versions
+from .indexer import load_index
+
+logger = logging.getLogger("codexia.index_cache")
+
+Signature = Tuple[Any, ...]
+
+_FILES = ("index.faiss", "meta.json")
+_OPTIONAL_FILES = ("passages.bin", "lexical.npz", "vectors.npy")
+
+
+@dataclass
+class _Entry:
+    signature: Signature
+    index: Any
+    meta: Dict[str, Any]
+
+
+def _signature(vector_dir: str) -> Signature:
+    version_dir = versions.resolve(vector_dir)
+    sig: list = [version_dir]
+    vector_dir = version_dir
+    for name in _FILES:
+        try:
+            st = os.stat(os.path.join(vector_dir, name))
+        except FileNotFoundError:
+            raise FileNotFoundError("Vector index not found; build it first") from None
+        sig.append((st.st_mtime_ns, st.st_size))
+    for name in _OPTIONAL_FILES:
+        try:
+            st = os.stat(os.path.join(vector_dir, name))
+            sig.append((st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            sig.append((0, 0))
+    return tuple(sig)
+
+
+class IndexCache:
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._hot_swap: Set[str] = set()
+        self._loading: Dict[str, Signature] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.swaps = 0
+        self.load_seconds = 0.0
+
+    def get(self, vector_dir: str):
+        key = os.path.abspath(vector_dir)
+        sig = _signature(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == sig:
+            self.hits += 1
+            return entry.index, entry.meta
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == sig:
+                self.hits += 1
+                return entry.index, entry.meta
+            if entry is not None and key in self._hot_swap:
+                if self._loading.get(key) != sig:
+                    self._loading[key] = sig
+                    threading.Thread(target=self._swap, args=(key, sig), name="index-swap", daemon=True).start()
+                self.hits += 1
+                return entry.index, entry.meta
+            index, meta = self._load(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            # Keep the signature observed before loading: if a rebuild lands
+            # mid-load the next lookup sees a mismatch and reloads again.
+            self._install(key, _Entry(sig, index, meta))
+            return index, meta
+
+    def _load(self, key: str):
+        start = time.perf_counter()
+        index, meta = load_index(key)
+        self.load_seconds += time.perf_counter() - start
+        return index, meta
+
+    def _install(self, key: str, entry: _Entry) -> None:
+        old = self._entries.get(key)
+        version_dir = entry.signature[0]
+        if version_dir != key:
+            versions.acquire(version_dir)
+        self._entries[key] = entry
+        if old is not None and old.signature[0] not in (version_dir, key):
+            versions.release(old.signature[0])
+
+    def _swap(self, key: str, sig: Signature) -> None:
+        try:
+            index, meta = self._load(key)
+        except Exception:
+            logger.exception("background index load failed", extra={"vector_dir": key})
+            with self._lock:
+                self._loading.pop(key, None)
+            return
+        with self._lock:
+            if self._loading.get(key) == sig:
+                self._loading.pop(key)
+                self._install(key, _Entry(sig, index, meta))
+                self.swaps += 1
+
+    def enable_hot_swap(self, vector_dir: str) -> None:
+        self._hot_swap.add(os.path.abspath(vector_dir))
+
+    def wait_for_swap(self, vector_dir: str, timeout: float = 30.0) -> bool:
+        """Block until no background load is pending for ``vector_dir``."""
+        key = os.path.abspath(vector_dir)
+        deadline = time.monotonic() + timeout
+        while key in self._loading:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "swaps": self.swaps,
+            "load_seconds": round(self.load_seconds, 6),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                versions.release(entry.signature[0])
+            self._entries.clear()
+            self._loading.clear()
+            self.hits = self.misses = self.reloads = self.swaps = 0
+            self.load_seconds = 0.0
+
+
+_CACHE = IndexCache()
+
+
+def get_index(vector_dir: str):
+    """Return ``(index, meta)`` for ``vector_dir``, loading it only when changed."""
+    return _CACHE.get(vector_dir)
+
+
+def enable_hot_swap(vector_dir: str) -> None:
+    """Load new versions of ``vector_dir`` in the background instead of on the request path."""
+    _CACHE.enable_hot_swap(vector_dir)
+
+
+def cache_stats() -> Dict[str, Any]:
+    return _CACHE.stats()
+
+
+def clear_cache() -> None:
+    _CACHE.clear()
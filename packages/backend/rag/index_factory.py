@@ -0,0 +1,182 @@
+"""FAISS index construction for the policy vector store.
+
+An index is described by an ``IndexSpec`` (see ``rag.types``). The resolved
+spec is stored in ``meta.json`` so readers can restore the search-time
+parameters (``nprobe`` for IVF, ``efSearch`` for HNSW) after loading.
+
+Every type can store compressed codes instead of float32 vectors through
+``quantizer``: ``sq8`` (one byte per dimension), ``sqfp16`` (two bytes) or
+``pq`` (product quantization, ``pq_m`` codes of ``pq_nbits`` bits; flat and
+IVF only). Quantized indexes keep the exact vectors in a memory-mapped
+``vectors.npy`` sidecar so that the top ``refine * k`` candidates can be
+re-ranked exactly at query time.
+
+IVF indexes can be loaded memory-mapped and read-only (``supports_mmap``) so
+that worker processes serving the same version share the OS page cache
+instead of each holding a private copy.
+"""
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+import faiss
+
+from .types import IndexSpec
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+
+QUANTIZERS = ("none", "sq8", "sqfp16", "pq")
+
+DEFAULT_SPEC: IndexSpec = {"type": "flat"}
+
+DEFAULT_REFINE = 4
+
+
+def _default_pq_m(dim: int) -> int:
+    # Largest divisor of dim giving sub-vectors of at least 8 dimensions.
+    return max(m for m in range(1, max(dim // 8, 1) + 1) if dim % m == 0)
+
+
+def resolve_spec(spec: Optional[IndexSpec], n_vectors: int, dim: Optional[int] = None) -> IndexSpec:
+    """Fill in defaults for ``spec`` given the number of vectors to index.
+
+    ``dim`` is needed to pick a default ``pq_m`` and to record the
+    compression ratio of quantized specs.
+    """
+    spec = dict(spec or DEFAULT_SPEC)
+    kind = spec.setdefault("type", "flat")
+    if kind not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {kind!r}; expected one of {INDEX_TYPES}")
+    quantizer = spec.get("quantizer", "none")
+    if quantizer not in QUANTIZERS:
+        raise ValueError(f"Unknown quantizer {quantizer!r}; expected one of {QUANTIZERS}")
+    if quantizer == "pq" and kind == "hnsw":
+        raise ValueError("Product quantization is only supported for flat and ivf indexes")
+    if kind == "ivf":
+        # ~4*sqrt(N) lists, never more lists than training points.
+        default_nlist = max(1, min(n_vectors, int(4 * math.sqrt(max(n_vectors, 1)))))
+        spec.setdefault("nlist", default_nlist)
+        spec["nlist"] = max(1, min(int(spec["nlist"]), max(n_vectors, 1)))
+        spec.setdefault("nprobe", min(8, spec["nlist"]))
+    elif kind == "hnsw":
+        spec.setdefault("m", 32)
+        spec.setdefault("ef_construction", 40)
+        spec.setdefault("ef_search", 64)
+    if quantizer != "none":
+        if quantizer == "pq":
+            spec.setdefault("pq_m", _default_pq_m(dim) if dim else 8)
+            # Each sub-quantizer needs at least 2**nbits training points.
+            spec.setdefault("pq_nbits", max(1, min(8, int(math.log2(max(n_vectors, 2))))))
+        spec.setdefault("refine", DEFAULT_REFINE)
+        if dim:
+            spec["compression_ratio"] = compression_ratio(spec, dim)
+    return spec  # type: ignore[return-value]
+
+
+def is_quantized(spec: Optional[IndexSpec]) -> bool:
+    return bool(spec) and spec.get("quantizer", "none") != "none"
+
+
+def code_size(spec: IndexSpec, dim: int) -> int:
+    """Bytes stored per vector (codes only, excluding ids and graph links)."""
+    quantizer = spec.get("quantizer", "none")
+    if quantizer == "sq8":
+        return dim
+    if quantizer == "sqfp16":
+        return 2 * dim
+    if quantizer == "pq":
+        return (int(spec["pq_m"]) * int(spec["pq_nbits"]) + 7) // 8
+    return 4 * dim
+
+
+def compression_ratio(spec: IndexSpec, dim: int) -> float:
+    return round(4 * dim / code_size(spec, dim), 2)
+
+
+def _codec(spec: IndexSpec) -> str:
+    quantizer = spec.get("quantizer", "none")
+    if quantizer == "sq8":
+        return "SQ8"
+    if quantizer == "sqfp16":
+        return "SQfp16"
+    if quantizer == "pq":
+        # "np": no polysemous training; search never uses polysemous codes.
+        return f"PQ{spec['pq_m']}x{spec['pq_nbits']}np"
+    return "Flat"
+
+
+def factory_string(spec: IndexSpec) -> str:
+    """FAISS factory string; non-IVF types are wrapped in an id map so that
+    every index accepts ``add_with_ids``."""
+    kind = spec["type"]
+    codec = _codec(spec)
+    if kind == "ivf":
+        return f"IVF{spec['nlist']},{codec}"
+    if kind == "hnsw":
+        return f"IDMap2,HNSW{spec['m']}" + ("" if codec == "Flat" else f"_{codec}")
+    return f"IDMap2,{codec}"
+
+
+def supports_remove(spec: IndexSpec) -> bool:
+    """Whether ``remove_ids`` works for this index type (HNSW graphs cannot delete)."""
+    return spec.get("type", "flat") != "hnsw"
+
+
+def supports_mmap(spec: Optional[IndexSpec]) -> bool:
+    """Whether FAISS can map this index type from disk (``IO_FLAG_MMAP``).
+
+    Only IVF inverted lists are mapped; flat and HNSW indexes are always
+    read into private memory.
+    """
+    return bool(spec) and spec.get("type") == "ivf"
+
+
+def make_index(dim: int, spec: IndexSpec) -> faiss.Index:
+    """Create an empty (untrained) index for a resolved ``spec``."""
+    index = faiss.index_factory(dim, factory_string(spec), faiss.METRIC_L2)
+    if spec["type"] == "hnsw":
+        faiss.downcast_index(index.index).hnsw.efConstruction = int(spec["ef_construction"])
+    apply_search_params(index, spec)
+    return index
+
+
+def apply_search_params(index: faiss.Index, spec: Optional[IndexSpec]) -> None:
+    """Set search-time knobs recorded in ``spec`` on a loaded index."""
+    if not spec:
+        return
+    params = faiss.ParameterSpace()
+    if spec.get("type") == "ivf" and "nprobe" in spec:
+        params.set_index_parameter(index, "nprobe", int(spec["nprobe"]))
+    elif spec.get("type") == "hnsw" and "ef_search" in spec:
+        params.set_index_parameter(index, "efSearch", int(spec["ef_search"]))
+
+
+def filtered_nprobe(spec: Optional[IndexSpec], ntotal: int, n_allowed: int) -> int:
+    """IVF lists to probe when only ``n_allowed`` of ``ntotal`` vectors pass a
+    filter: ``nprobe`` scaled by ``ntotal / n_allowed``, at most ``nlist``.
+
+    The selector is applied inside the probed lists only, so a narrow filter
+    at the spec's ``nprobe`` would leave most eligible vectors unvisited.
+    """
+    spec = spec or DEFAULT_SPEC
+    nprobe = int(spec.get("nprobe", 1))
+    nlist = int(spec.get("nlist", nprobe))
+    if n_allowed <= 0:
+        return nprobe
+    return max(nprobe, min(nlist, math.ceil(nprobe * ntotal / n_allowed)))
+
+
+def search_parameters(
+    spec: Optional[IndexSpec], selector: faiss.IDSelector, nprobe: Optional[int] = None
+) -> faiss.SearchParameters:
+    """Search parameters restricting results to ``selector`` for this index type.
+
+    ``nprobe`` overrides the spec's value for IVF indexes.
+    """
+    spec = spec or DEFAULT_SPEC
+    if spec.get("type") == "ivf":
+        return faiss.SearchParametersIVF(sel=selector, nprobe=int(nprobe or spec.get("nprobe", 1)))
+    if spec.get("type") == "hnsw":
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=int(spec.get("ef_search", 16)))
+    return faiss.SearchParameters(sel=selector)
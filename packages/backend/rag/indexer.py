@@ -2,45 +2,77 @@ import os
 import json
 import glob
 import random
-from typing import Tuple
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
 import hashlib
 
-from .normalize import extract_clauses, normalize_text
-from .types import Passage
+from ..core.config import Settings
+from .embedder import MODEL_NAME, get_model
+from .hashing import HASH_DIM, hash_embed
+from .index_factory import (
+    apply_search_params,
+    is_quantized,
+    make_index,
+    resolve_spec,
+    supports_mmap,
+    supports_remove,
+)
+from .lexical import LexicalIndex
+from .ingest import BATCH_SIZE, IngestStats, Progress, parse_file, parse_policies, stream_into_index
+from .normalize import normalize_text
+from .passage_store import PassageStore, write_store
+from . import shards, versions
+from .types import IndexSpec, Passage
 
-MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+def _policy_files(policies_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(policies_dir, "*.md")))
+
+
+def _parse_file(path: str) -> List[Passage]:
+    return parse_file(path)[2]
 
 
 def _gather_passages(policies_dir: str) -> list[Passage]:
     passages: list[Passage] = []
-    for path in sorted(glob.glob(os.path.join(policies_dir, "*.md"))):
-        with open(path, "r", encoding="utf-8") as f:
-            md = f.read()
-        passages.extend(extract_clauses(md, os.path.basename(path)))
+    for path in _policy_files(policies_dir):
+        passages.extend(_parse_file(path))
     return passages
 
 
-def build_index(policies_dir: str, vector_dir: str, rebuild: bool = False):
-    os.makedirs(vector_dir, exist_ok=True)
-    index_path = os.path.join(vector_dir, "index.faiss")
-    meta_path = os.path.join(vector_dir, "meta.json")
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-    if (
-        not rebuild
-        and os.path.exists(index_path)
-        and os.path.exists(meta_path)
-    ):
-        latest_src = max(
-            os.path.getmtime(p)
-            for p in glob.glob(os.path.join(policies_dir, "*.md"))
-        )
-        if os.path.getmtime(meta_path) >= latest_src:
-            return load_index(vector_dir)
 
+def _embed_passages(texts: list[str]) -> Tuple[np.ndarray, int, str]:
+    """Embed passage texts; returns ``(embeddings, dim, model_name)``."""
+    model = get_model(MODEL_NAME)
+    try:
+        if model is None:
+            raise RuntimeError(f"{MODEL_NAME} is not available locally")
+        embeddings = model.encode(texts, show_progress_bar=False, normalize_embeddings=True)
+        embeddings = embeddings.astype("float32")
+        return embeddings, embeddings.shape[1], MODEL_NAME
+    except Exception:
+        return hash_embed([normalize_text(t) for t in texts], HASH_DIM), HASH_DIM, "dummy"
+
+
+def _spec_matches(requested: Optional[IndexSpec], meta: Dict[str, Any]) -> bool:
+    if requested is None:
+        return True
+    stored = meta.get("index") or {"type": "flat"}
+    return all(stored.get(k) == v for k, v in requested.items())
+
+
+def _seed() -> None:
     random.seed(13)
     np.random.seed(13)
     try:
@@ -49,43 +81,350 @@ def build_index(policies_dir: str, vector_dir: str, rebuild: bool = False):
     except Exception:
         pass
 
-    passages = _gather_passages(policies_dir)
+
+_RUNTIME_KEYS = ("passages", "lexical", "vectors")
+
+
+def _vectors_tmp(vector_dir: str) -> str:
+    return os.path.join(vector_dir, f"vectors.npy.tmp.{os.getpid()}.npy")
+
+
+def _write(
+    index: faiss.Index,
+    meta: Dict[str, Any],
+    ids: List[int],
+    passages: List[Passage],
+    vector_dir: str,
+    export_passages: bool,
+    vectors_tmp: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Write index, passage store and meta header; returns the loaded meta.
+
+    ``vectors_tmp`` is a finished ``.npy`` of exact vectors (rows aligned
+    with ``ids``) that becomes ``vectors.npy``; without it any stale sidecar
+    from an earlier quantized build is removed.
+    """
+    faiss.write_index(index, os.path.join(vector_dir, "index.faiss"))
+    store_path = os.path.join(vector_dir, "passages.bin")
+    write_store(store_path, ids, passages)
+    vectors_path = os.path.join(vector_dir, "vectors.npy")
+    if vectors_tmp is not None:
+        os.replace(vectors_tmp, vectors_path)
+    elif os.path.exists(vectors_path):
+        os.remove(vectors_path)
+    lexical = LexicalIndex.build([p["text"] for p in passages])
+    lexical.save(os.path.join(vector_dir, "lexical.npz"))
+    header = dict(meta)
+    if export_passages:
+        header["passages"] = passages
+        indent = 2
+    else:
+        indent = None
+    with open(os.path.join(vector_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=indent)
+    out = {**meta, "passages": PassageStore(store_path), "lexical": lexical}
+    if vectors_tmp is not None:
+        out["vectors"] = np.load(vectors_path, mmap_mode="r")
+    return out
+
+
+def _full_build(
+    paths: List[str],
+    hashes: Dict[str, str],
+    index_spec: Optional[IndexSpec],
+    vector_dir: str,
+    export_passages: bool,
+    workers: Optional[int],
+    batch_size: int,
+    progress: Optional[Progress],
+):
+    stats = IngestStats()
+    passages: List[Passage] = []
+    files: Dict[str, Dict[str, Any]] = {}
+    start = time.perf_counter()
+    for path, nbytes, parsed in parse_policies(paths, workers):
+        files[os.path.basename(path)] = {"sha256": hashes[path], "count": len(parsed)}
+        passages.extend(parsed)
+        stats.files += 1
+        stats.bytes += nbytes
+    stats.passages = len(passages)
+    stats.parse_s = time.perf_counter() - start
+
+    spec: Dict[str, Any] = {}
+
+    def new_index(dim: int):
+        spec.update(resolve_spec(index_spec, len(passages), dim))
+        return make_index(dim, spec), spec
+
     texts = [p["text"] for p in passages]
+    ids = np.arange(len(passages), dtype="int64")
+    vectors_tmp = _vectors_tmp(vector_dir) if is_quantized(index_spec) else None
+    vectors = None
+
+    def keep_vectors(rows: np.ndarray, emb: np.ndarray) -> None:
+        nonlocal vectors
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(vectors_tmp, mode="w+", dtype="float32", shape=(len(texts), emb.shape[1]))
+        vectors[rows] = emb
+
+    index, dim, model_name = stream_into_index(
+        texts, ids, _embed_passages, new_index, stats, batch_size, progress,
+        on_batch=keep_vectors if vectors_tmp else None,
+    )
+    if index is None:
+        _, dim, model_name = _embed_passages([])
+        index, _ = new_index(dim)
+    if vectors_tmp is not None:
+        if vectors is None:
+            np.save(vectors_tmp, np.zeros((0, dim), dtype="float32"))
+        else:
+            vectors.flush()
+            del vectors
+
+    meta = {
+        "vector_dim": dim,
+        "model": model_name,
+        "index": spec,
+        "files": files,
+        "next_id": len(passages),
+        "build": {"mode": "full", "added": len(passages), "removed": 0, "stats": stats.report()},
+    }
+    return index, _write(index, meta, ids.tolist(), passages, vector_dir, export_passages, vectors_tmp)
+
+
+def _incremental_build(
+    index: faiss.Index,
+    meta: Dict[str, Any],
+    paths: List[str],
+    hashes: Dict[str, str],
+    vector_dir: str,
+    export_passages: bool,
+):
+    """Re-embed only added/changed files; returns None when a full build is needed."""
+    old_files = meta["files"]
+    by_name = {os.path.basename(p): p for p in paths}
+    changed = sorted(n for n, p in by_name.items() if old_files.get(n, {}).get("sha256") != hashes[p])
+    stale = set(changed) | (set(old_files) - set(by_name))
 
+    new_passages: List[Passage] = []
+    files = {n: v for n, v in old_files.items() if n not in stale}
+    for name in changed:
+        parsed = _parse_file(by_name[name])
+        files[name] = {"sha256": hashes[by_name[name]], "count": len(parsed)}
+        new_passages.extend(parsed)
+
+    embeddings = np.zeros((0, meta["vector_dim"]), dtype="float32")
+    if new_passages:
+        embeddings, _, model_name = _embed_passages([p["text"] for p in new_passages])
+        if model_name != meta["model"]:
+            return None
+
+    store = meta["passages"]
+    old_ids = store.ids.tolist()
+    stale_src = np.array([src in stale for src in store.sources], dtype=bool)
+    stale_rows = stale_src[store.source_ids]
+    keep = np.flatnonzero(~stale_rows).tolist()
+    removed_ids = store.ids[stale_rows].astype("int64")
+    next_id = int(meta["next_id"])
+    new_ids = np.arange(next_id, next_id + len(new_passages), dtype="int64")
+
+    spec = meta["index"]
+    exact = meta.get("vectors")
+    exact_kept = np.asarray(exact[keep], dtype="float32") if exact is not None else None
+    if supports_remove(spec):
+        if len(removed_ids):
+            index.remove_ids(faiss.IDSelectorBatch(removed_ids))
+    else:
+        # Graph indexes cannot delete; rebuild the graph from stored vectors
+        # of the kept passages instead of re-encoding them.
+        kept_ids = np.array([old_ids[i] for i in keep], dtype="int64")
+        if exact_kept is not None:
+            kept = exact_kept
+        else:
+            kept = np.vstack([index.reconstruct(int(i)) for i in kept_ids]) if len(kept_ids) else embeddings[:0]
+        index = make_index(meta["vector_dim"], spec)
+        index.add_with_ids(kept, kept_ids)
+    if len(new_ids):
+        index.add_with_ids(embeddings, new_ids)
+
+    vectors_tmp = None
+    if exact_kept is not None:
+        vectors_tmp = _vectors_tmp(vector_dir)
+        np.save(vectors_tmp, np.vstack([exact_kept, embeddings]))
+
+    header = {k: v for k, v in meta.items() if k not in _RUNTIME_KEYS}
+    header.update(
+        files=files,
+        next_id=next_id + len(new_passages),
+        build={"mode": "incremental", "added": len(new_passages), "removed": int(len(removed_ids))},
+    )
+    ids = [old_ids[i] for i in keep] + new_ids.tolist()
+    passages = [store[i] for i in keep] + new_passages
+    apply_search_params(index, spec)
+    return index, _write(index, header, ids, passages, vector_dir, export_passages, vectors_tmp)
+
+
+def build_index(
+    policies_dir: str,
+    vector_dir: str,
+    rebuild: bool = False,
+    index_spec: Optional[IndexSpec] = None,
+    export_passages: bool = False,
+    workers: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+    progress: Optional[Progress] = None,
+    shard_by_payer: bool = False,
+):
+    """Embed every policy clause under ``policies_dir`` into ``vector_dir``.
+
+    ``index_spec`` selects the FAISS index type (flat, IVF or HNSW) and an
+    optional ``quantizer`` (SQ8, SQfp16 or PQ, see ``rag.index_factory``);
+    the resolved spec, including the compression ratio of quantized codes,
+    is recorded in ``meta.json`` under ``"index"``. Per-file
+    content hashes are recorded under ``"files"`` so that later builds only
+    re-embed passages from added, changed or removed files; ``rebuild=True``
+    or a different ``index_spec`` forces a full rebuild.
+
+    Passage metadata lives in the memory-mapped ``passages.bin`` store;
+    ``export_passages=True`` additionally writes them into ``meta.json`` as a
+    human-readable debug export.
+
+    Full builds go through the streaming pipeline in ``rag.ingest``: files are
+    parsed by ``workers`` processes (auto-sized when ``None``) and embedded in
+    length-sorted batches of ``batch_size`` that are added to the index as
+    they are encoded. ``progress`` receives a throughput report after each
+    batch; the final report is stored under ``meta["build"]["stats"]``.
+
+    Every build that changes the index is written to a fresh directory under
+    ``vector_dir/versions`` and published by atomically repointing
+    ``vector_dir/current`` (see ``rag.versions``); old versions that no
+    process still has loaded are garbage-collected afterwards.
+
+    ``shard_by_payer=True`` instead builds one index per payer family plus a
+    shared CMS/Medicare shard under ``vector_dir/shards`` (see
+    ``rag.shards``) and returns ``{shard: (index, meta)}``.
+    """
+    kwargs = dict(
+        rebuild=rebuild, index_spec=index_spec, export_passages=export_passages,
+        workers=workers, batch_size=batch_size, progress=progress,
+    )
+    if shard_by_payer:
+        groups = shards.group_files(_policy_files(policies_dir))
+        os.makedirs(vector_dir, exist_ok=True)
+        built = {name: _build(paths, shards.shard_dir(vector_dir, name), **kwargs) for name, paths in groups.items()}
+        shards.write_layout(vector_dir, groups)
+        return built
+    return _build(_policy_files(policies_dir), vector_dir, **kwargs)
+
+
+def build_shard(policies_dir: str, vector_dir: str, shard: str, **kwargs):
+    """Rebuild a single shard of a sharded ``vector_dir`` from ``policies_dir``.
+
+    Keyword arguments are those of ``build_index``. The shard layout is
+    updated if the shard's file set changed.
+    """
+    groups = shards.read_layout(vector_dir)
+    paths = shards.group_files(_policy_files(policies_dir)).get(shard, [])
+    if not paths:
+        raise ValueError(f"No policies under {policies_dir} belong to shard {shard!r}")
+    out = _build(paths, shards.shard_dir(vector_dir, shard), **kwargs)
+    groups[shard] = paths
+    shards.write_layout(vector_dir, groups)
+    return out
+
+
+def _build(
+    paths: List[str],
+    vector_dir: str,
+    rebuild: bool = False,
+    index_spec: Optional[IndexSpec] = None,
+    export_passages: bool = False,
+    workers: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+    progress: Optional[Progress] = None,
+):
+    os.makedirs(vector_dir, exist_ok=True)
+    index_path = os.path.join(vector_dir, "index.faiss")
+    meta_path = os.path.join(vector_dir, "meta.json")
+
+    existing = None
+    if not rebuild and os.path.exists(index_path) and os.path.exists(meta_path):
+        # Incremental builds modify the index in place, so never map it.
+        existing = load_index(vector_dir, mmap=False)
+        meta = existing[1]
+        names = {os.path.basename(p) for p in paths}
+        if not isinstance(meta["passages"], PassageStore) or not _spec_matches(index_spec, meta):
+            existing = None
+        elif set(meta["files"]) == names and all(
+            os.path.getmtime(p) <= os.path.getmtime(meta_path) for p in paths
+        ):
+            return existing
+
+    _seed()
+    hashes = {p: _file_sha256(p) for p in paths}
+    if existing is not None:
+        index, meta = existing
+        if {os.path.basename(p): hashes[p] for p in paths} == {n: v["sha256"] for n, v in meta["files"].items()}:
+            # Published versions are immutable; touching them would make
+            # every reader reload an identical index.
+            return existing
+
+    version_dir = versions.new_version_dir(vector_dir)
     try:
-        model = SentenceTransformer(MODEL_NAME, local_files_only=True)
-        embeddings = model.encode(texts, show_progress_bar=False, normalize_embeddings=True)
-        embeddings = embeddings.astype("float32")
-        dim = embeddings.shape[1]
-        model_name = MODEL_NAME
-    except Exception:
-        dim = 384
-        model_name = "dummy"
-        embeddings = np.zeros((len(texts), dim), dtype="float32")
-        for i, t in enumerate(texts):
-            for word in normalize_text(t).split():
-                h = int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % dim
-                embeddings[i, h] += 1.0
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10
-        embeddings = embeddings / norms
-
-    index = faiss.IndexFlatL2(dim)
-    index.add(embeddings)
-    faiss.write_index(index, index_path)
-
-    meta = {"vector_dim": dim, "model": model_name, "passages": passages}
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, ensure_ascii=False, indent=2)
+        out = None
+        if existing is not None:
+            index, meta = existing
+            out = _incremental_build(index, meta, paths, hashes, version_dir, export_passages)
+        if out is None:
+            out = _full_build(paths, hashes, index_spec, version_dir, export_passages, workers, batch_size, progress)
+        versions.write_manifest(version_dir, {"build": out[1]["build"]["mode"], "passages": len(out[1]["passages"])})
+    except BaseException:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+    versions.publish(vector_dir, version_dir)
+    versions.gc_versions(vector_dir)
+    return out
 
-    return index, meta
 
+def load_index(vector_dir: str, mmap: Optional[bool] = None):
+    """Load the published index and metadata of ``vector_dir``.
 
-def load_index(vector_dir: str):
+    With ``mmap`` (default ``RAG_INDEX_MMAP``) index types that support it
+    are mapped read-only instead of copied into process memory, so workers
+    serving the same (immutable) version share its pages.
+    """
+    # Resolve ``current`` once so index and metadata come from one version.
+    vector_dir = versions.resolve(vector_dir)
     index_path = os.path.join(vector_dir, "index.faiss")
     meta_path = os.path.join(vector_dir, "meta.json")
     if not (os.path.exists(index_path) and os.path.exists(meta_path)):
         raise FileNotFoundError("Vector index not found; build it first")
-    index = faiss.read_index(index_path)
     with open(meta_path, "r", encoding="utf-8") as f:
         meta = json.load(f)
+    if mmap is None:
+        mmap = Settings().RAG_INDEX_MMAP
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap and supports_mmap(meta.get("index")) else 0
+    index = faiss.read_index(index_path, flags)
+    store_path = os.path.join(vector_dir, "passages.bin")
+    if os.path.exists(store_path):
+        meta["passages"] = PassageStore(store_path)
+        lexical_path = os.path.join(vector_dir, "lexical.npz")
+        if os.path.exists(lexical_path):
+            meta["lexical"] = LexicalIndex.load(lexical_path)
+        vectors_path = os.path.join(vector_dir, "vectors.npy")
+        if os.path.exists(vectors_path):
+            meta["vectors"] = np.load(vectors_path, mmap_mode="r")
+    apply_search_params(index, meta.get("index"))
     return index, meta
+
+
+def passage_for_id(meta: Dict[str, Any], vid: int) -> Passage:
+    """Map a FAISS vector id back to its passage.
+
+    Indexes built before the passage store existed use the row position of
+    the ``meta.json`` passage list as id.
+    """
+    passages = meta["passages"]
+    if isinstance(passages, PassageStore):
+        return passages.by_id(vid)
+    return passages[vid]
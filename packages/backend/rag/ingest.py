@@ -0,0 +1,128 @@
+"""Streaming policy ingestion for ``build_index``.
+
+Policy files are parsed in a process pool and streamed back in file order.
+Passages are then embedded in fixed-size batches of similar text length
+(less padding for transformer encoders) and each batch is added to the FAISS
+index as soon as it is encoded, so vector memory is bounded by the batch
+size instead of the corpus size.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+from .normalize import iter_clauses
+from .types import Passage
+
+logger = logging.getLogger("codexia.ingest")
+
+BATCH_SIZE = 256
+PARALLEL_MIN_FILES = 32   # below this a process pool costs more than it saves
+TRAIN_SAMPLE_PER_LIST = 39
+
+
+@dataclass
+class IngestStats:
+    files: int = 0
+    passages: int = 0
+    bytes: int = 0
+    embedded: int = 0
+    parse_s: float = 0.0
+    embed_s: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "files": self.files,
+            "passages": self.passages,
+            "mb": round(self.bytes / 1e6, 3),
+            "parse_s": round(self.parse_s, 4),
+            "embed_s": round(self.embed_s, 4),
+            "elapsed_s": round(elapsed, 4),
+            "passages_per_s": round(self.embedded / elapsed, 1),
+            "mb_per_s": round(self.bytes / 1e6 / elapsed, 3),
+        }
+
+
+Progress = Callable[[Dict[str, Any]], None]
+
+
+def parse_file(path: str) -> Tuple[str, int, List[Passage]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        passages = list(iter_clauses(f, os.path.basename(path)))
+    return path, os.path.getsize(path), passages
+
+
+def parse_policies(paths: Sequence[str], workers: Optional[int] = None) -> Iterator[Tuple[str, int, List[Passage]]]:
+    """Yield ``(path, bytes, passages)`` per file in ``paths`` order."""
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(paths) >= PARALLEL_MIN_FILES else 1
+    if workers <= 1:
+        for path in paths:
+            yield parse_file(path)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_file, paths, chunksize=max(1, len(paths) // (workers * 4)))
+
+
+def length_sorted_batches(texts: Sequence[str], batch_size: int) -> Iterator[np.ndarray]:
+    """Row indices of ``texts`` grouped into batches of similar length."""
+    order = np.argsort(np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts)), kind="stable")
+    for start in range(0, len(order), batch_size):
+        yield order[start:start + batch_size]
+
+
+def _training_rows(n: int, spec: Dict[str, Any]) -> np.ndarray:
+    centroids = int(spec.get("nlist", 1))
+    if spec.get("quantizer") == "pq":
+        centroids = max(centroids, 1 << int(spec["pq_nbits"]))
+    want = min(n, max(centroids * TRAIN_SAMPLE_PER_LIST, BATCH_SIZE))
+    return np.unique(np.linspace(0, n - 1, num=want, dtype=np.int64)) if n else np.zeros(0, dtype=np.int64)
+
+
+def stream_into_index(
+    texts: Sequence[str],
+    ids: np.ndarray,
+    embed: Callable[[List[str]], Tuple[np.ndarray, int, str]],
+    new_index: Callable[[int], Tuple[faiss.Index, Dict[str, Any]]],
+    stats: IngestStats,
+    batch_size: int = BATCH_SIZE,
+    progress: Optional[Progress] = None,
+    index: Optional[faiss.Index] = None,
+    on_batch: Optional[Callable[[np.ndarray, np.ndarray], None]] = None,
+) -> Tuple[Optional[faiss.Index], int, str]:
+    """Embed ``texts`` batch by batch and add them to an index under ``ids``.
+
+    ``new_index(dim)`` creates the index (and returns its resolved spec) once
+    the embedding dimension is known; pass ``index`` to append to an existing
+    one instead. Untrained indexes are trained on an evenly spaced sample
+    before the first batch is added. ``on_batch(rows, embeddings)`` sees
+    every encoded batch (e.g. to keep exact vectors next to a quantized
+    index). Returns ``(index, dim, model_name)``.
+    """
+    dim, model_name = 0, ""
+    for rows in length_sorted_batches(texts, batch_size):
+        start = time.perf_counter()
+        emb, dim, model_name = embed([texts[i] for i in rows])
+        if index is None:
+            index, spec = new_index(dim)
+            if not index.is_trained:
+                sample = _training_rows(len(texts), spec)
+                index.train(embed([texts[i] for i in sample])[0])
+        index.add_with_ids(emb, ids[rows])
+        if on_batch is not None:
+            on_batch(rows, emb)
+        stats.embed_s += time.perf_counter() - start
+        stats.embedded += len(rows)
+        if progress is not None:
+            progress(stats.report())
+    logger.info("policy ingestion", extra=stats.report())
+    return index, dim, model_name
@@ -0,0 +1,136 @@
+"""BM25 inverted index over ``normalize_text`` tokens (``lexical.npz``).
+
+Postings are stored CSR-style: ``term_ptr[t]:term_ptr[t + 1]`` slices
+``post_rows``/``post_tf`` for term ``t``. Rows are positions in the passage
+store, so ``store.ids[row]`` gives the FAISS id of a hit.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .normalize import normalize_text
+
+K1 = 1.2
+B = 0.75
+
+# CPT/HCPCS, ICD-10 and two-character modifier shaped tokens.
+CODE_RE = re.compile(r"^(?:\d{5}[a-z0-9]?|[a-z]\d{2}(?:\.[a-z0-9]{1,4})?|\d{2})$")
+
+
+def tokenize(text: str) -> List[str]:
+    return normalize_text(text).split()
+
+
+def is_code_heavy(tokens: Sequence[str]) -> bool:
+    """True when at least half of the query tokens look like billing codes."""
+    return bool(tokens) and 2 * sum(1 for t in tokens if CODE_RE.match(t)) >= len(tokens)
+
+
+class LexicalIndex:
+    def __init__(
+        self,
+        vocab: Sequence[str],
+        term_ptr: np.ndarray,
+        post_rows: np.ndarray,
+        post_tf: np.ndarray,
+        doc_len: np.ndarray,
+    ):
+        self.vocab = list(vocab)
+        self.term_idx: Dict[str, int] = {t: i for i, t in enumerate(self.vocab)}
+        self.term_ptr = term_ptr
+        self.post_rows = post_rows
+        self.post_tf = post_tf
+        self.doc_len = doc_len
+        n = len(doc_len)
+        self.avgdl = float(doc_len.mean()) if n else 0.0
+        df = np.diff(term_ptr).astype("float64")
+        self.idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype("float32")
+
+    @classmethod
+    def build(cls, texts: Sequence[str]) -> "LexicalIndex":
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_len = np.zeros(len(texts), dtype="int32")
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_len[row] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((row, tf))
+        vocab = sorted(postings)
+        term_ptr = np.zeros(len(vocab) + 1, dtype="int64")
+        rows: List[int] = []
+        tfs: List[int] = []
+        for i, term in enumerate(vocab):
+            for row, tf in postings[term]:
+                rows.append(row)
+                tfs.append(tf)
+            term_ptr[i + 1] = len(rows)
+        return cls(vocab, term_ptr, np.array(rows, dtype="int32"), np.array(tfs, dtype="float32"), doc_len)
+
+    def save(self, path: str) -> None:
+        tmp = f"{path}.tmp.{os.getpid()}.npz"
+        np.savez(
+            tmp,
+            vocab=np.array(self.vocab, dtype=str),
+            term_ptr=self.term_ptr,
+            post_rows=self.post_rows,
+            post_tf=self.post_tf,
+            doc_len=self.doc_len,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        with np.load(path) as z:
+            return cls(z["vocab"].tolist(), z["term_ptr"], z["post_rows"], z["post_tf"], z["doc_len"])
+
+    def scores(self, tokens: Sequence[str]) -> np.ndarray:
+        """BM25 score of every row for the query ``tokens``."""
+        out = np.zeros(len(self.doc_len), dtype="float32")
+        if not len(out):
+            return out
+        norm = K1 * (1.0 - B + B * self.doc_len / max(self.avgdl, 1e-9))
+        for term in set(tokens):
+            t = self.term_idx.get(term)
+            if t is None:
+                continue
+            lo, hi = self.term_ptr[t], self.term_ptr[t + 1]
+            rows = self.post_rows[lo:hi]
+            tf = self.post_tf[lo:hi]
+            out[rows] += self.idf[t] * tf * (K1 + 1.0) / (tf + norm[rows])
+        return out
+
+    def top(self, tokens: Sequence[str], k: int, allowed_rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Top ``k`` rows with a positive score as ``(row, score)``, best first."""
+        scores = self.scores(tokens)
+        if allowed_rows is not None:
+            mask = np.zeros(len(scores), dtype=bool)
+            mask[allowed_rows] = True
+            scores = np.where(mask, scores, 0.0)
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.lexsort((hits, -scores[hits]))]
+        return [(int(r), float(scores[r])) for r in hits]
+
+
+def is_decisive(ranked: List[Tuple[int, float]], topk: int, margin: float) -> bool:
+    """Whether the lexical top-``topk`` is clearly separated from the next hit."""
+    if topk <= 0 or len(ranked) < topk:
+        return False
+    kth = ranked[topk - 1][1]
+    nxt = ranked[topk][1] if len(ranked) > topk else 0.0
+    return kth > 0 and (kth - nxt) >= margin * kth
+
+
+def rrf_fuse(rankings: Sequence[Sequence[int]], k: int = 60) -> Dict[int, float]:
+    """Reciprocal-rank fusion of several ranked id lists."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, vid in enumerate(ranking):
+            fused[vid] = fused.get(vid, 0.0) + 1.0 / (k + rank + 1)
+    return fused
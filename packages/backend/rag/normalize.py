@@ -1,9 +1,15 @@
 import re
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 from .types import Passage
 
 ALLOWED_CHARS = re.compile(r"[^a-z0-9\s\-_/.:()§]")
 SPACE_RE = re.compile(r"\s+")
+EFFECTIVE_RE = re.compile(r"- effective:\s*(\d{4}-\d{2}-\d{2})\s*→\s*(\d{4}-\d{2}-\d{2})?")
+CLAUSE_PREFIX = "- clause_id:"
+TEXT_PREFIX = "Text:"
+
+# Parser states of ``iter_clauses``.
+_SCAN, _EFFECTIVE, _TEXT_START, _TEXT = range(4)
 
 
 def normalize_text(s: str) -> str:
@@ -13,43 +19,63 @@ def normalize_text(s: str) -> str:
     return s.strip()
 
 
-def extract_clauses(md: str, source: str) -> List[Passage]:
-    lines = md.splitlines()
-    passages: List[Passage] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if line.startswith("- clause_id:"):
-            clause_id = line.split(":", 1)[1].strip()
-            i += 1
-            if i >= len(lines):
-                break
-            eff_line = lines[i].strip()
-            m = re.match(r"- effective:\s*(\d{4}-\d{2}-\d{2})\s*→\s*(\d{4}-\d{2}-\d{2})?", eff_line)
-            if not m:
-                i += 1
+def _passage(source: str, clause_id: str, effective_from: str, effective_to: Optional[str], text_lines: List[str]) -> Passage:
+    text = " ".join(text_lines).strip()
+    return Passage(
+        text=f"{clause_id} ({effective_from}→{effective_to or ''}) {text}".strip(),
+        source=source,
+        clause_id=clause_id,
+        effective_from=effective_from,
+        effective_to=effective_to,
+    )
+
+
+def iter_clauses(lines: Iterable[str], source: str) -> Iterator[Passage]:
+    """Yield clauses from ``lines`` (e.g. an open policy file) in one pass.
+
+    A clause is a ``- clause_id:`` line, an ``- effective: FROM → [TO]``
+    line and optional ``Text:`` lines running up to the next blank line or
+    clause. Items may carry line terminators or several lines; they are
+    split like ``str.splitlines`` so the result matches ``extract_clauses``
+    on the whole document. Open files with ``newline=""`` so that ``\r\n``
+    stays one break.
+    """
+    state = _SCAN
+    clause_id = effective_from = ""
+    effective_to: Optional[str] = None
+    text_lines: List[str] = []
+    for chunk in lines:
+        for raw in chunk.splitlines():
+            line = raw.strip()
+            if state == _EFFECTIVE:
+                m = EFFECTIVE_RE.match(line)
+                if m:
+                    effective_from, effective_to = m.group(1), m.group(2) or None
+                    state = _TEXT_START
+                else:
+                    state = _SCAN
                 continue
-            effective_from = m.group(1)
-            effective_to = m.group(2) or None
-            i += 1
-            text_lines = []
-            if i < len(lines) and lines[i].strip().startswith("Text:"):
-                text_lines.append(lines[i].split("Text:", 1)[1].strip())
-                i += 1
-                while i < len(lines) and not lines[i].strip().startswith("- clause_id:") and lines[i].strip() != "":
-                    text_lines.append(lines[i].strip())
-                    i += 1
-            text = " ".join(text_lines).strip()
-            passage_text = f"{clause_id} ({effective_from}→{effective_to or ''}) {text}".strip()
-            passages.append(
-                Passage(
-                    text=passage_text,
-                    source=source,
-                    clause_id=clause_id,
-                    effective_from=effective_from,
-                    effective_to=effective_to,
-                )
-            )
-        else:
-            i += 1
-    return passages
+            if state == _TEXT_START:
+                if line.startswith(TEXT_PREFIX):
+                    text_lines = [raw.split(TEXT_PREFIX, 1)[1].strip()]
+                    state = _TEXT
+                    continue
+                yield _passage(source, clause_id, effective_from, effective_to, [])
+                state = _SCAN
+            elif state == _TEXT:
+                if line and not line.startswith(CLAUSE_PREFIX):
+                    text_lines.append(line)
+                    continue
+                yield _passage(source, clause_id, effective_from, effective_to, text_lines)
+                state = _SCAN
+            if line.startswith(CLAUSE_PREFIX):
+                clause_id = line.split(":", 1)[1].strip()
+                state = _EFFECTIVE
+    if state == _TEXT_START:
+        yield _passage(source, clause_id, effective_from, effective_to, [])
+    elif state == _TEXT:
+        yield _passage(source, clause_id, effective_from, effective_to, text_lines)
+
+
+def extract_clauses(md: str, source: str) -> List[Passage]:
+    return list(iter_clauses((md,), source))
@@ -0,0 +1,150 @@
+"""Columnar, memory-mapped passage metadata store (``passages.bin``).
+
+Layout (little endian, every section 8-byte aligned)::
+
+    header      magic b"CXPS", u32 version, u64 rows, u64 sources, u64 heap bytes
+    ids         i64[rows]        FAISS vector id, ascending
+    eff_from    i32[rows]        YYYYMMDD
+    eff_to      i32[rows]        YYYYMMDD, 0 when open-ended
+    source_id   i32[rows]        index into the source table
+    text_off    u64[rows + 1]    offsets of passage text in the heap
+    clause_off  u64[rows + 1]    offsets of clause ids in the heap
+    source_off  u64[sources + 1] offsets of source file names in the heap
+    heap        utf-8 bytes
+
+Readers map the file and decode only the rows they are asked for, so a
+search touches k passages rather than parsing the whole corpus.
+"""
+from __future__ import annotations
+
+import os
+import struct
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .types import Passage
+
+MAGIC = b"CXPS"
+VERSION = 1
+_HEADER = struct.Struct("<4sIQQQ")
+
+
+def _pack_date(s: Optional[str]) -> int:
+    return int(s.replace("-", "")) if s else 0
+
+
+def _unpack_date(v: int) -> Optional[str]:
+    if not v:
+        return None
+    return f"{v // 10000:04d}-{v // 100 % 100:02d}-{v % 100:02d}"
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_store(path: str, ids: Sequence[int], passages: Sequence[Passage]) -> None:
+    """Write ``passages`` (ascending ``ids``) to ``path`` atomically."""
+    n = len(passages)
+    sources: List[str] = sorted({p["source"] for p in passages})
+    source_idx = {s: i for i, s in enumerate(sources)}
+
+    heap = bytearray()
+
+    def offsets(values: Iterator[str], count: int) -> np.ndarray:
+        off = np.empty(count + 1, dtype="<u8")
+        off[0] = len(heap)
+        for i, v in enumerate(values):
+            heap.extend(v.encode("utf-8"))
+            off[i + 1] = len(heap)
+        return off
+
+    text_off = offsets((p["text"] for p in passages), n)
+    clause_off = offsets((p["clause_id"] for p in passages), n)
+    source_off = offsets(iter(sources), len(sources))
+
+    columns = [
+        np.asarray(ids, dtype="<i8"),
+        np.array([_pack_date(p["effective_from"]) for p in passages], dtype="<i4"),
+        np.array([_pack_date(p.get("effective_to")) for p in passages], dtype="<i4"),
+        np.array([source_idx[p["source"]] for p in passages], dtype="<i4"),
+        text_off,
+        clause_off,
+        source_off,
+    ]
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, n, len(sources), len(heap)))
+        f.write(b"\0" * (_align(_HEADER.size) - _HEADER.size))
+        for col in columns:
+            raw = col.tobytes()
+            f.write(raw)
+            f.write(b"\0" * (_align(len(raw)) - len(raw)))
+        f.write(bytes(heap))
+    os.replace(tmp, path)
+
+
+class PassageStore(Sequence):
+    """Read-only, lazily decoded view over ``passages.bin``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buf = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, n, n_sources, heap_len = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a passage store (version {VERSION})")
+        self._n = n
+        pos = _align(_HEADER.size)
+
+        def take(dtype: str, count: int) -> np.ndarray:
+            nonlocal pos
+            arr = np.frombuffer(self._buf, dtype=dtype, count=count, offset=pos)
+            pos += _align(arr.nbytes)
+            return arr
+
+        self.ids = take("<i8", n)
+        self.effective_from = take("<i4", n)
+        self.effective_to = take("<i4", n)
+        self.source_ids = take("<i4", n)
+        self._text_off = take("<u8", n + 1)
+        self._clause_off = take("<u8", n + 1)
+        source_off = take("<u8", n_sources + 1)
+        self._heap = pos
+        self.sources: List[str] = [self._str(source_off, i) for i in range(n_sources)]
+
+    def _str(self, off: np.ndarray, i: int) -> str:
+        start, end = self._heap + int(off[i]), self._heap + int(off[i + 1])
+        return bytes(self._buf[start:end]).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, row):  # type: ignore[override]
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(self._n))]
+        if row < 0:
+            row += self._n
+        if not 0 <= row < self._n:
+            raise IndexError(row)
+        return Passage(
+            text=self._str(self._text_off, row),
+            source=self.sources[self.source_ids[row]],
+            clause_id=self._str(self._clause_off, row),
+            effective_from=_unpack_date(int(self.effective_from[row])),
+            effective_to=_unpack_date(int(self.effective_to[row])),
+        )
+
+    def row_of(self, vid: int) -> int:
+        row = int(np.searchsorted(self.ids, vid))
+        if row >= self._n or self.ids[row] != vid:
+            raise KeyError(vid)
+        return row
+
+    def by_id(self, vid: int) -> Passage:
+        return self[self.row_of(vid)]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Sequence) and len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
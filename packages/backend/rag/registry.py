@@ -0,0 +1,80 @@
+"""Process-wide building blocks shared by the embedder and the re-ranker:
+a lazy model registry and a thread-safe LRU with hit/miss counters.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+M = TypeVar("M")
+
+
+class ModelRegistry(Generic[M]):
+    """Models loaded lazily by name with ``loader`` and shared by every caller.
+
+    ``get`` returns ``None`` when the load fails; failures are remembered as
+    well, so deployments without local weights do not retry on every call.
+    """
+
+    def __init__(self, loader: Callable[[str], M]):
+        self._loader = loader
+        self.models: Dict[str, Optional[M]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[M]:
+        try:
+            return self.models[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self.models:
+                try:
+                    self.models[name] = self._loader(name)
+                except Exception:
+                    self.models[name] = None
+            return self.models[name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.models.clear()
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe LRU of at most ``maxsize`` entries; ``maxsize <= 0`` disables it."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
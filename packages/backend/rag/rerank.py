@@ -0,0 +1,100 @@
+"""Cross-encoder re-ranking of first-stage retrieval candidates.
+
+Only the top-N bi-encoder candidates of each query are scored, in batches,
+against a per-call latency budget. Scores are memoised in an LRU keyed by
+model, query and clause. A query whose candidates could not all be scored
+before the budget ran out (or when no cross-encoder is available locally)
+keeps its bi-encoder order, so re-ranking never drops or delays evidence
+beyond the budget plus one batch.
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sentence_transformers import CrossEncoder
+
+from ..core.config import Settings
+from ..core.metrics import record_rerank
+from .registry import LRUCache, ModelRegistry
+from .types import Passage
+
+_settings = Settings()
+
+SCORE_BATCH = 32
+
+_MODELS: ModelRegistry[CrossEncoder] = ModelRegistry(lambda name: CrossEncoder(name, local_files_only=True))
+
+# Scores keyed by ``(model, query, source, clause_id)``.
+ScoreKey = Tuple[str, str, str, str]
+
+
+def get_cross_encoder(name: str) -> Optional[CrossEncoder]:
+    """Return the shared cross-encoder for ``name`` or ``None`` when unavailable."""
+    return _MODELS.get(name)
+
+
+_SCORE_CACHE: LRUCache[ScoreKey, float] = LRUCache(_settings.RAG_RERANK_CACHE_SIZE)
+
+
+def rerank_many(
+    queries: Sequence[str],
+    candidates: Sequence[List[Passage]],
+    topk: int,
+    budget_ms: Optional[float] = None,
+    model_name: Optional[str] = None,
+) -> List[List[Passage]]:
+    """Re-order each query's ``candidates`` by cross-encoder score, keep ``topk``.
+
+    ``budget_ms`` (default ``RAG_RERANK_BUDGET_MS``) bounds the time spent
+    scoring uncached pairs for the whole call; it is checked before each
+    batch of ``SCORE_BATCH`` pairs.
+    """
+    model_name = model_name or _settings.RAG_RERANK_MODEL
+    budget_ms = _settings.RAG_RERANK_BUDGET_MS if budget_ms is None else budget_ms
+    fallback = [list(c[:topk]) for c in candidates]
+    model = get_cross_encoder(model_name)
+    if model is None:
+        record_rerank("unavailable", len(candidates))
+        return fallback
+
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    scores: List[List[Optional[float]]] = []
+    missing: List[Tuple[int, int]] = []
+    for qi, (query, cands) in enumerate(zip(queries, candidates)):
+        row = [_SCORE_CACHE.get((model_name, query, p["source"], p["clause_id"])) for p in cands]
+        missing.extend((qi, ci) for ci, s in enumerate(row) if s is None)
+        scores.append(row)
+
+    for start in range(0, len(missing), SCORE_BATCH):
+        if time.perf_counter() >= deadline:
+            break
+        batch = missing[start:start + SCORE_BATCH]
+        pairs = [(queries[qi], candidates[qi][ci]["text"]) for qi, ci in batch]
+        for (qi, ci), score in zip(batch, model.predict(pairs, show_progress_bar=False)):
+            p = candidates[qi][ci]
+            scores[qi][ci] = float(score)
+            _SCORE_CACHE.put((model_name, queries[qi], p["source"], p["clause_id"]), float(score))
+
+    out: List[List[Passage]] = []
+    reranked = 0
+    for cands, row, fb in zip(candidates, scores, fallback):
+        if any(s is None for s in row):
+            out.append(fb)
+            continue
+        order = sorted(range(len(cands)), key=lambda i: (-row[i], i))
+        out.append([cands[i] for i in order[:topk]])
+        reranked += 1
+    record_rerank("reranked", reranked)
+    record_rerank("fallback", len(candidates) - reranked)
+    return out
+
+
+def score_cache_stats() -> Dict[str, int]:
+    return _SCORE_CACHE.stats()
+
+
+def clear() -> None:
+    """Forget loaded cross-encoders and cached scores."""
+    _MODELS.clear()
+    _SCORE_CACHE.clear()
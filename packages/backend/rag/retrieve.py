@@ -1,23 +1,37 @@
 import os
 import random
-from typing import Dict, Any, Tuple, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple, Optional
 
+import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import hashlib
 
+from ..core.config import Settings
+from .embedder import embed_queries
+from .filters import eligible_ids
+from .index_factory import filtered_nprobe, search_parameters
 from .normalize import normalize_text
-from .indexer import load_index
-from .types import Retrieval, Passage
+from .index_cache import get_index
+from .indexer import passage_for_id
+from .lexical import is_code_heavy, is_decisive, rrf_fuse
+from .rerank import rerank_many
+from . import shards
+from .types import Retrieval, Passage, SearchFilter
 
 
 def _sort_key(p: Passage):
     return (p["source"], p["clause_id"])
 
 
-def semantic_search(query: str, topk: int, vector_dir: str) -> Retrieval:
-    index, meta = load_index(vector_dir)
+RETRIEVAL_MODES = ("dense", "hybrid")
+HYBRID_DEPTH = 20         # candidates taken from each ranker before fusion
+RRF_K = 60
+LEXICAL_MARGIN = 0.25     # relative gap after the k-th BM25 hit that skips the encoder
 
+
+def _seed() -> None:
     random.seed(13)
     np.random.seed(13)
     try:
@@ -26,33 +40,354 @@ def semantic_search(query: str, topk: int, vector_dir: str) -> Retrieval:
     except Exception:
         pass
 
-    norm_q = normalize_text(query)
-    try:
-        model = SentenceTransformer(meta["model"], local_files_only=True)
-        q_emb = model.encode([norm_q], normalize_embeddings=True).astype("float32")
-    except Exception:
-        dim = meta["vector_dim"]
-        q_emb = np.zeros((1, dim), dtype="float32")
-        for word in norm_q.split():
-            h = int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % dim
-            q_emb[0, h] += 1.0
-        q_emb = q_emb / (np.linalg.norm(q_emb) + 1e-10)
-
-    k = max(topk, 1)
-    D, I = index.search(q_emb, k)
+
+def _dense_search(index, meta: Dict[str, Any], q_emb: np.ndarray, k: int, allowed: Optional[np.ndarray]):
+    if allowed is None:
+        return index.search(q_emb, k)
+    spec = meta.get("index")
+    selector = faiss.IDSelectorBatch(allowed)
+    if (spec or {}).get("type") != "ivf":
+        return index.search(q_emb, k, params=search_parameters(spec, selector))
+    # IVF applies the selector only inside the probed lists: widen the probe
+    # for narrow filters, then search every list for queries still short.
+    nprobe = filtered_nprobe(spec, index.ntotal, len(allowed))
+    D, I = index.search(q_emb, k, params=search_parameters(spec, selector, nprobe))
+    nlist = int(spec.get("nlist", nprobe))
+    short = np.flatnonzero((I != -1).sum(axis=1) < min(k, len(allowed)))
+    if len(short) and nprobe < nlist:
+        D[short], I[short] = index.search(q_emb[short], k, params=search_parameters(spec, selector, nlist))
+    return D, I
+
+
+def _exact_rerank(vectors: np.ndarray, ids: np.ndarray, q_emb: np.ndarray, idxs: np.ndarray, k: int):
+    """Re-score candidate ids with exact L2 against ``vectors`` (rows aligned
+    with the ascending ``ids``) and keep the best ``k`` per query."""
+    D = np.full((len(idxs), k), np.inf, dtype="float32")
+    I = np.full((len(idxs), k), -1, dtype="int64")
+    for row, (q, cand) in enumerate(zip(q_emb, idxs)):
+        cand = cand[cand != -1]
+        exact = np.asarray(vectors[np.searchsorted(ids, cand)], dtype="float32")
+        dists = ((exact - q) ** 2).sum(axis=1)
+        order = np.lexsort((cand, dists))[:k]
+        D[row, :len(order)] = dists[order]
+        I[row, :len(order)] = cand[order]
+    return D, I
+
+
+# A ranking is a list of ``(key, passage)`` pairs sorted by ``(key, _sort_key)``;
+# lower keys rank first, so rankings from several shards merge by sorting.
+Ranking = List[Tuple[float, Passage]]
+
+
+def _merge_rankings(rankings: List[Ranking], topk: int) -> Ranking:
+    pairs = [pair for ranking in rankings for pair in ranking]
+    pairs.sort(key=lambda x: (x[0], _sort_key(x[1])))
+    return pairs[:topk]
+
+
+def _dense_results(meta: Dict[str, Any], dists, idxs, topk: int) -> Ranking:
     pairs = []
-    for dist, idx in zip(D[0], I[0]):
+    for dist, idx in zip(dists, idxs):
         if idx == -1:
             continue
-        passage = meta["passages"][idx]
+        passage = passage_for_id(meta, int(idx))
         pairs.append((float(dist), passage))
+    return _merge_rankings([pairs], topk)
+
+
+def _ranked_results(meta: Dict[str, Any], scored: Dict[int, float], topk: int) -> Ranking:
+    return _merge_rankings([[(-score, passage_for_id(meta, vid)) for vid, score in scored.items()]], topk)
+
+
+@dataclass
+class _SearchState:
+    """A batch of queries between the stages of ``semantic_search_many``."""
+    queries: List[str]
+    topk: int
+    k: int
+    index: Any
+    meta: Dict[str, Any]
+    allowed: Optional[np.ndarray]
+    exact_rerank: Optional[bool]
+    lexical: Any = None
+    fuse: bool = True
+    results: List[Optional[Ranking]] = field(default_factory=list)
+    lex_ranked: List[List[int]] = field(default_factory=list)
+    # With ``fuse=False`` (shards of a hybrid search) the raw candidate lists
+    # are kept for the caller to fuse: ``(BM25 score, id)`` and ``(distance, id)``.
+    lex_hits: List[List[Tuple[float, int]]] = field(default_factory=list)
+    dense_hits: List[List[Tuple[float, int]]] = field(default_factory=list)
+
+    @property
+    def pending(self) -> List[int]:
+        return [i for i, r in enumerate(self.results) if r is None]
+
+    def passages(self) -> List[List[Passage]]:
+        return [[p for _, p in r or []] for r in self.results]
+
+
+def _plan_search(
+    queries: List[str],
+    topk: int,
+    vector_dir: str,
+    filters: Optional[SearchFilter],
+    mode: str,
+    exact_rerank: Optional[bool],
+    fuse: bool = True,
+) -> _SearchState:
+    """Load the index, apply filters and answer what the lexical stage can.
+
+    ``fuse=False`` skips the lexical shortcut and rank fusion and keeps the
+    scored candidates instead, for ``_search_shards`` to fuse across shards.
+    """
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode {mode!r}; expected one of {RETRIEVAL_MODES}")
+    index, meta = get_index(vector_dir) if queries else (None, {})
+    allowed = eligible_ids(meta, filters) if queries else None
+    state = _SearchState(queries, topk, max(topk, 1), index, meta, allowed, exact_rerank, fuse=fuse)
+    state.lex_hits = [[] for _ in queries]
+    state.dense_hits = [[] for _ in queries]
+    if allowed is not None and not len(allowed):
+        state.results = [[] for _ in queries]
+        return state
+
+    state.results = [None] * len(queries)
+    state.lex_ranked = [[] for _ in queries]
+    state.lexical = meta.get("lexical") if mode == "hybrid" else None
+    if state.lexical is not None:
+        store = meta["passages"]
+        depth = max(state.k, HYBRID_DEPTH)
+        allowed_rows = None if allowed is None else np.searchsorted(store.ids, allowed)
+        for i, query in enumerate(queries):
+            tokens = normalize_text(query).split()
+            ranked = state.lexical.top(tokens, depth + 1, allowed_rows)
+            if not fuse:
+                state.lex_hits[i] = [(float(score), int(store.ids[row])) for row, score in ranked]
+            elif is_code_heavy(tokens) and is_decisive(ranked, state.k, LEXICAL_MARGIN):
+                scored = {int(store.ids[row]): score for row, score in ranked[:state.k]}
+                state.results[i] = _ranked_results(meta, scored, topk)
+            else:
+                state.lex_ranked[i] = [int(store.ids[row]) for row, _ in ranked[:depth]]
+        state.k = depth
+    return state
+
+
+def _encode_pending(state: _SearchState) -> np.ndarray:
+    _seed()
+    norm = [normalize_text(state.queries[i]) for i in state.pending]
+    return embed_queries(norm, state.meta["model"], state.meta["vector_dim"])
+
+
+def _search_pending(state: _SearchState, q_emb: np.ndarray) -> None:
+    index, meta, k = state.index, state.meta, state.k
+    vectors = meta.get("vectors") if state.exact_rerank is not False else None
+    if vectors is None:
+        D, I = _dense_search(index, meta, q_emb, k, state.allowed)
+    else:
+        refine = max(int((meta.get("index") or {}).get("refine", 1)), 1)
+        D, I = _dense_search(index, meta, q_emb, k * refine, state.allowed)
+        D, I = _exact_rerank(vectors, meta["passages"].ids, q_emb, I, k)
+    for i, dists, idxs in zip(state.pending, D, I):
+        if not state.fuse:
+            state.dense_hits[i] = [(float(d), int(v)) for d, v in zip(dists, idxs) if v != -1]
+            state.results[i] = []
+        elif state.lexical is None:
+            state.results[i] = _dense_results(meta, dists, idxs, state.topk)
+        else:
+            dense = [int(v) for v in idxs if v != -1]
+            state.results[i] = _ranked_results(meta, rrf_fuse([dense, state.lex_ranked[i]], RRF_K), state.topk)
+
+
+def _rerank_results(state: _SearchState, topk: int, budget_ms: Optional[float]) -> None:
+    reranked = rerank_many(state.queries, state.passages(), topk, budget_ms)
+    state.results = [[(float(rank), p) for rank, p in enumerate(r)] for r in reranked]
+    state.topk = topk
+
 
+_SHARD_POOL: Optional[ThreadPoolExecutor] = None
+_SHARD_POOL_LOCK = threading.Lock()
+
+
+def _shard_pool() -> ThreadPoolExecutor:
+    """The shared shard search pool of ``RAG_SEARCH_CONCURRENCY`` workers."""
+    global _SHARD_POOL
+    with _SHARD_POOL_LOCK:
+        if _SHARD_POOL is None:
+            workers = max(1, Settings().RAG_SEARCH_CONCURRENCY)
+            _SHARD_POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-shard")
+        return _SHARD_POOL
+
+
+def shutdown_shard_pool() -> None:
+    global _SHARD_POOL
+    with _SHARD_POOL_LOCK:
+        pool, _SHARD_POOL = _SHARD_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _map_shards(fn, states: List[Any]) -> List[Any]:
+    if len(states) > 1:
+        return list(_shard_pool().map(fn, states))
+    return [fn(s) for s in states]
+
+
+def _shard_candidates(states: List[_SearchState], hits: str, i: int, scale: float, depth: int):
+    """Query ``i``'s candidates of every shard as ``(key, passage, (shard, id))``
+    ranked by ``scale * score`` and the usual tie-break."""
+    pairs = [
+        (scale * score, passage_for_id(s.meta, vid), (n, vid))
+        for n, s in enumerate(states)
+        for score, vid in getattr(s, hits)[i]
+    ]
     pairs.sort(key=lambda x: (x[0], _sort_key(x[1])))
-    results = [p for _, p in pairs[:topk]]
-    return Retrieval(query=query, topk=topk, results=results)
+    return pairs[:depth]
+
+
+def _fuse_shards(states: List[_SearchState], merged: _SearchState) -> None:
+    """Hybrid search over shards: take the lexical shortcut on the global BM25
+    ranking, then fuse the global dense and BM25 rankings with one RRF."""
+    k = merged.k
+    depth = max(k, HYBRID_DEPTH)
+    merged.results = [None] * len(merged.queries)
+    lexical: List[list] = []
+    for i, query in enumerate(merged.queries):
+        lex = _shard_candidates(states, "lex_hits", i, -1.0, depth + 1)
+        lexical.append(lex)
+        tokens = normalize_text(query).split()
+        if is_code_heavy(tokens) and is_decisive([(fid, -key) for key, _, fid in lex], k, LEXICAL_MARGIN):
+            merged.results[i] = [(key, p) for key, p, _ in lex[:merged.topk]]
+    pending = set(merged.pending)
+    for s in states:
+        for i, r in enumerate(s.results):
+            if r is None and i not in pending:
+                s.results[i] = []
+    _dense_shards(states)
+    for i in pending:
+        dense = _shard_candidates(states, "dense_hits", i, 1.0, depth)
+        passages = {fid: p for _, p, fid in dense + lexical[i]}
+        fused = rrf_fuse([[fid for _, _, fid in dense], [fid for _, _, fid in lexical[i][:depth]]], RRF_K)
+        merged.results[i] = _merge_rankings([[(-score, passages[fid]) for fid, score in fused.items()]], merged.topk)
+
+
+def _dense_shards(states: List[_SearchState]) -> None:
+    """Encode the pending queries once and search every shard with them."""
+    live = [s for s in states if s.pending]
+    if not live:
+        return
+    # Shards of one build share the embedding model and pending queries.
+    q_emb = _encode_pending(live[0])
+    _map_shards(lambda s: _search_pending(s, q_emb), live)
+
+
+def _search_shards(
+    queries: List[str],
+    topk: int,
+    vector_dir: str,
+    filters: Optional[SearchFilter],
+    mode: str,
+    exact_rerank: Optional[bool],
+    payer: Optional[str],
+) -> _SearchState:
+    """Search the routed shards of a sharded ``vector_dir`` on the shared
+    shard pool and merge their rankings.
+
+    Dense distances compare across shards and merge directly. Hybrid
+    rankings do not (each shard fuses its own ranks and BM25 statistics), so
+    the shards' raw dense and BM25 candidates are merged first and fused once.
+    """
+    layout = shards.read_layout(vector_dir)
+    if payer is None and filters:
+        payer = filters.get("payer")
+    targets = shards.route(payer, list(layout))
+    hybrid = mode == "hybrid"
 
+    def plan(name: str) -> _SearchState:
+        return _plan_search(queries, topk, shards.shard_dir(vector_dir, name), filters, mode, exact_rerank, fuse=not hybrid)
 
-def query_policy_for_claim_context(claim: Dict[str, Any], topk: int, vector_dir: str) -> Retrieval:
+    states = _map_shards(plan, targets)
+    merged = _SearchState(queries, topk, max(topk, 1), None, {}, None, exact_rerank)
+    if hybrid:
+        _fuse_shards(states, merged)
+        return merged
+    _dense_shards(states)
+    merged.results = [_merge_rankings([s.results[i] or [] for s in states], topk) for i in range(len(queries))]
+    return merged
+
+
+def _retrievals(state: _SearchState) -> List[Retrieval]:
+    return [Retrieval(query=q, topk=state.topk, results=r) for q, r in zip(state.queries, state.passages())]
+
+
+def semantic_search_many(
+    queries: List[str],
+    topk: int,
+    vector_dir: str,
+    filters: Optional[SearchFilter] = None,
+    mode: str = "dense",
+    exact_rerank: Optional[bool] = None,
+    rerank_candidates: int = 0,
+    rerank_budget_ms: Optional[float] = None,
+    payer: Optional[str] = None,
+) -> List[Retrieval]:
+    """Run several queries with one encode batch and one index search.
+
+    Results are identical in shape and ordering to calling ``semantic_search``
+    once per query. ``filters`` (payer prefix, date of service) are applied
+    inside the FAISS search, so every returned slot holds an eligible clause.
+
+    ``mode="hybrid"`` fuses BM25 scores from the lexical index with dense
+    ranks through reciprocal-rank fusion. Code-heavy queries whose BM25
+    top-k is clearly separated from the rest are answered lexically and
+    never reach the encoder.
+
+    On quantized indexes the dense search over-fetches ``refine * k``
+    candidates and re-ranks them with the exact vectors from
+    ``vectors.npy``. ``exact_rerank=None`` does so whenever the sidecar
+    exists; ``False`` returns the raw quantized ranking.
+
+    ``rerank_candidates > 0`` retrieves that many candidates per query and
+    re-orders them with a cross-encoder (see ``rag.rerank``) before keeping
+    ``topk``; queries not scored within ``rerank_budget_ms`` keep the
+    first-stage order.
+
+    On a sharded ``vector_dir`` (``build_index(shard_by_payer=True)``) the
+    queries go to the shard of ``payer`` (claim payer name or file prefix,
+    defaulting to ``filters["payer"]``) plus the shared CMS/Medicare shard,
+    or to every shard when the payer is unknown. Shards are searched on a
+    shared pool of ``RAG_SEARCH_CONCURRENCY`` workers; dense results merge
+    by distance, hybrid candidates are fused once across shards.
+    """
+    depth = max(topk, rerank_candidates)
+    if shards.is_sharded(vector_dir):
+        state = _search_shards(queries, depth, vector_dir, filters, mode, exact_rerank, payer)
+    else:
+        state = _plan_search(queries, depth, vector_dir, filters, mode, exact_rerank)
+        if state.pending:
+            _search_pending(state, _encode_pending(state))
+    if rerank_candidates > 0:
+        _rerank_results(state, topk, rerank_budget_ms)
+    return _retrievals(state)
+
+
+def semantic_search(
+    query: str,
+    topk: int,
+    vector_dir: str,
+    filters: Optional[SearchFilter] = None,
+    mode: str = "dense",
+    exact_rerank: Optional[bool] = None,
+    rerank_candidates: int = 0,
+    rerank_budget_ms: Optional[float] = None,
+    payer: Optional[str] = None,
+) -> Retrieval:
+    return semantic_search_many(
+        [query], topk, vector_dir, filters, mode, exact_rerank, rerank_candidates, rerank_budget_ms, payer
+    )[0]
+
+
+def claim_context_query(claim: Dict[str, Any]) -> str:
+    """Build the payer/CPT/modifier/POS query used for claim-level retrieval."""
     payer = claim.get("payer", {}).get("name", "")
     cpts = [line.get("cpt", "") for line in claim.get("lines", [])]
     mods = [m for line in claim.get("lines", []) for m in line.get("modifiers", []) if m]
@@ -65,8 +400,18 @@ def query_policy_for_claim_context(claim: Dict[str, Any], topk: int, vector_dir:
     parts.extend(mods)
     if sos:
         parts.append(f"pos {sos}")
-    query = " ".join(parts)
-    return semantic_search(query, topk, vector_dir)
+    return " ".join(parts)
+
+
+def query_policy_for_claim_context(
+    claim: Dict[str, Any],
+    topk: int,
+    vector_dir: str,
+    filters: Optional[SearchFilter] = None,
+    mode: str = "dense",
+) -> Retrieval:
+    payer = claim.get("payer", {}).get("name") or None
+    return semantic_search(claim_context_query(claim), topk, vector_dir, filters, mode, payer=payer)
 
 
 def top_citations_for_issue(issue: str, cpt_pair: Optional[Tuple[str, str]], payer: Optional[str], topk: int, vector_dir: str) -> list[Passage]:
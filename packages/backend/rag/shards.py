@@ -0,0 +1,97 @@
+"""Per-payer shard layout and query routing for sharded vector directories.
+
+A sharded ``vector_dir`` holds one ordinary (versioned) vector directory per
+payer family under ``shards/<family>`` plus ``shards/shared`` for national
+policies (CMS, Medicare) that apply to every payer::
+
+    shards.json              {"shards": {"UHC": ["UHC-LCD-123.md", ...], ...}}
+    shards/UHC/current -> versions/...
+    shards/shared/current -> versions/...
+
+The payer family of a policy file is its name up to the first ``-``. Each
+shard can be rebuilt and reloaded on its own; searches route a claim's query
+to its payer's shard plus the shared one.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+SHARDS_FILE = "shards.json"
+SHARDS_DIR = "shards"
+SHARED_SHARD = "shared"
+SHARED_FAMILIES = ("cms", "medicare")
+
+# Payer names seen on claims that differ from the policy file prefix.
+PAYER_ALIASES = {
+    "unitedhealthcare": "UHC",
+    "united healthcare": "UHC",
+    "blue cross": "BCBS",
+    "blue shield": "BCBS",
+    "blue cross blue shield": "BCBS",
+    "kaiser permanente": "Kaiser",
+}
+
+
+def payer_family(filename: str) -> str:
+    return os.path.basename(filename).split("-", 1)[0]
+
+
+def shard_for(filename: str) -> str:
+    family = payer_family(filename)
+    return SHARED_SHARD if family.lower() in SHARED_FAMILIES else family
+
+
+def group_files(paths: Sequence[str]) -> Dict[str, List[str]]:
+    """Policy file paths grouped by shard name, in input order."""
+    groups: Dict[str, List[str]] = {}
+    for path in paths:
+        groups.setdefault(shard_for(path), []).append(path)
+    return groups
+
+
+def shard_dir(vector_dir: str, shard: str) -> str:
+    return os.path.join(vector_dir, SHARDS_DIR, shard)
+
+
+def is_sharded(vector_dir: str) -> bool:
+    return os.path.exists(os.path.join(vector_dir, SHARDS_FILE))
+
+
+def read_layout(vector_dir: str) -> Dict[str, List[str]]:
+    with open(os.path.join(vector_dir, SHARDS_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)["shards"]
+
+
+def write_layout(vector_dir: str, groups: Dict[str, List[str]]) -> None:
+    layout = {"shards": {name: sorted(os.path.basename(p) for p in files) for name, files in sorted(groups.items())}}
+    tmp = os.path.join(vector_dir, f"{SHARDS_FILE}.tmp.{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(layout, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, os.path.join(vector_dir, SHARDS_FILE))
+
+
+def resolve_payer(payer: Optional[str], shards: Sequence[str]) -> Optional[str]:
+    """Shard for a claim payer name or file prefix, or None when unknown."""
+    if not payer:
+        return None
+    name = payer.strip().lower()
+    alias = PAYER_ALIASES.get(name)
+    if alias in shards:
+        return alias
+    for shard in shards:
+        if shard != SHARED_SHARD and (name == shard.lower() or name.startswith(shard.lower())):
+            return shard
+    return None
+
+
+def route(payer: Optional[str], shards: Sequence[str]) -> List[str]:
+    """Shards to search: the payer's shard plus the shared one, or every shard
+    when the payer is unknown."""
+    if payer and payer.strip().lower().startswith(SHARED_FAMILIES) and SHARED_SHARD in shards:
+        return [SHARED_SHARD]
+    family = resolve_payer(payer, shards)
+    if family is None:
+        return sorted(shards)
+    return [family] + ([SHARED_SHARD] if SHARED_SHARD in shards else [])
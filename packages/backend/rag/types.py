@@ -11,3 +11,20 @@ class Retrieval(TypedDict):
     query: str
     topk: int
     results: List[Passage]
+
+class IndexSpec(TypedDict, total=False):
+    type: str             # "flat" | "ivf" | "hnsw"
+    nlist: int            # IVF: number of inverted lists (centroids)
+    nprobe: int           # IVF: lists visited per query
+    m: int                # HNSW: graph degree
+    ef_construction: int  # HNSW: build-time beam width
+    ef_search: int        # HNSW: query-time beam width
+    quantizer: str        # "none" | "sq8" | "sqfp16" | "pq" (pq: flat/ivf only)
+    pq_m: int             # PQ: sub-quantizers per vector
+    pq_nbits: int         # PQ: bits per sub-quantizer code
+    refine: int           # quantized: candidates per result re-ranked with exact vectors
+    compression_ratio: float  # recorded at build: float32 bytes / code bytes per vector
+
+class SearchFilter(TypedDict, total=False):
+    payer: str            # case-insensitive prefix of the policy file name, e.g. "UHC"
+    date_of_service: str  # YYYY-MM-DD; must fall inside the clause's effective interval
@@ -0,0 +1,184 @@
+"""Versioned vector directories with an atomically swapped ``current`` pointer.
+
+Layout of a published ``vector_dir``::
+
+    versions/<version>/    index.faiss, meta.json, passages.bin, ... manifest.json
+    current -> versions/<version>
+    index.faiss -> current/index.faiss   (one compatibility link per file)
+
+Builds write a complete new version directory and then repoint ``current``
+with a single ``rename``, so readers that resolve ``current`` once always see
+a matching index and metadata. Processes that have a version loaded hold a
+lease (``versions/<version>/.leases/<pid>``) where the directory is
+writable; ``gc_versions`` only deletes versions that are neither current,
+among the newest ``keep``, nor leased by a live process. Deleting a version that is still memory-mapped is safe on
+POSIX: open mappings keep the data until they are closed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+VERSIONS_DIR = "versions"
+CURRENT = "current"
+MANIFEST = "manifest.json"
+LEASES_DIR = ".leases"
+KEEP_VERSIONS = 2
+ABANDONED_BUILD_SECONDS = 3600  # unpublished version dirs younger than this may still be building
+
+# Files reachable directly under ``vector_dir`` for readers that predate
+# versioning (and for humans poking at the directory).
+COMPAT_FILES = ("index.faiss", "meta.json", "passages.bin", "lexical.npz", "vectors.npy", MANIFEST)
+
+
+def new_version_dir(vector_dir: str) -> str:
+    """Create and return an empty directory for the next version."""
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(vector_dir, VERSIONS_DIR, version)
+    os.makedirs(path)
+    return path
+
+
+def current_version(vector_dir: str) -> Optional[str]:
+    """Name of the published version, or None for unversioned directories."""
+    try:
+        return os.path.basename(os.readlink(os.path.join(vector_dir, CURRENT)))
+    except OSError:
+        return None
+
+
+def resolve(vector_dir: str) -> str:
+    """Directory holding the files of the current version.
+
+    Unversioned (legacy) directories resolve to themselves.
+    """
+    version = current_version(vector_dir)
+    if version is None:
+        return vector_dir
+    return os.path.join(vector_dir, VERSIONS_DIR, version)
+
+
+def _symlink(target: str, path: str) -> None:
+    tmp = f"{path}.tmp.{os.getpid()}"
+    os.symlink(target, tmp)
+    os.replace(tmp, path)
+
+
+def write_manifest(version_dir: str, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    files = {}
+    for name in sorted(os.listdir(version_dir)):
+        path = os.path.join(version_dir, name)
+        if os.path.isfile(path) and name != MANIFEST:
+            files[name] = {"bytes": os.path.getsize(path)}
+    manifest = {"version": os.path.basename(version_dir), "created": time.time(), "files": files, **(extra or {})}
+    tmp = os.path.join(version_dir, f"{MANIFEST}.tmp.{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(version_dir, MANIFEST))
+    return manifest
+
+
+def read_manifest(version_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(version_dir, MANIFEST), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def publish(vector_dir: str, version_dir: str) -> None:
+    """Atomically make ``version_dir`` the current version of ``vector_dir``."""
+    _symlink(os.path.join(VERSIONS_DIR, os.path.basename(version_dir)), os.path.join(vector_dir, CURRENT))
+    for name in COMPAT_FILES:
+        path = os.path.join(vector_dir, name)
+        if not os.path.islink(path):
+            # Replaces files left by unversioned builds in one rename.
+            _symlink(os.path.join(CURRENT, name), path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def acquire(version_dir: str) -> bool:
+    """Lease ``version_dir`` for this process; returns whether it was leased.
+
+    Leases are best-effort: readers of a read-only ``vector_dir`` (e.g. a
+    mounted volume) load without one, and are protected from ``gc_versions``
+    only by ``KEEP_VERSIONS``.
+    """
+    leases = os.path.join(version_dir, LEASES_DIR)
+    try:
+        os.makedirs(leases, exist_ok=True)
+        open(os.path.join(leases, str(os.getpid())), "a").close()
+    except OSError:
+        return False
+    return True
+
+
+def release(version_dir: str) -> None:
+    try:
+        os.remove(os.path.join(version_dir, LEASES_DIR, str(os.getpid())))
+    except OSError:
+        pass
+
+
+def leased(version_dir: str) -> bool:
+    try:
+        pids = os.listdir(os.path.join(version_dir, LEASES_DIR))
+    except FileNotFoundError:
+        return False
+    return any(pid.isdigit() and _pid_alive(int(pid)) for pid in pids)
+
+
+def _created(version_dir: str) -> Optional[float]:
+    try:
+        return float(read_manifest(version_dir)["created"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def list_versions(vector_dir: str) -> List[str]:
+    """Names of completed versions (those with a manifest), oldest first."""
+    root = os.path.join(vector_dir, VERSIONS_DIR)
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return []
+    created = {n: _created(os.path.join(root, n)) for n in names}
+    return sorted((n for n, c in created.items() if c is not None), key=lambda n: (created[n], n))
+
+
+def gc_versions(vector_dir: str, keep: int = KEEP_VERSIONS) -> List[str]:
+    """Delete unreferenced old versions; returns the names removed.
+
+    The current version, the newest ``keep`` versions and versions leased by
+    a live process survive, as do unpublished directories that may still be
+    being written.
+    """
+    root = os.path.join(vector_dir, VERSIONS_DIR)
+    current = current_version(vector_dir)
+    versions = list_versions(vector_dir)
+    protected = set(versions[-keep:]) if keep > 0 else set()
+    try:
+        abandoned = [
+            n for n in os.listdir(root)
+            if n not in versions and time.time() - os.path.getmtime(os.path.join(root, n)) > ABANDONED_BUILD_SECONDS
+        ]
+    except FileNotFoundError:
+        abandoned = []
+    removed = []
+    for name in versions + abandoned:
+        path = os.path.join(root, name)
+        if name == current or name in protected or leased(path):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(name)
+    return removed
@@ -2,7 +2,8 @@ import os
 import time
 import json
 from fastapi import APIRouter, Response, status
-from core.config import Settings
+from ..core.config import Settings
+from ..services.warmup import warmup_state
 
 router = APIRouter(tags=["ops"])
 _START = time.time()
@@ -23,13 +24,18 @@ def healthz():
 @router.get("/readyz")
 def readyz():
     errors = []
+    warmup = warmup_state()
+    if not warmup.finished:
+        errors.append("warming up")
+    elif warmup.error:
+        errors.append(f"warm-up failed: {warmup.error}")
     if settings.VECTOR_PATH and not os.path.isdir(settings.VECTOR_PATH):
         errors.append("vector path missing")
     if not os.access(settings.AUDIT_PATH, os.W_OK):
         errors.append("audit path not writable")
     ready = not errors
     status_code = status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
-    body = {"ready": ready}
+    body = {"ready": ready, "warmup": warmup.as_dict()}
     if errors:
         body["errors"] = errors
     return Response(status_code=status_code, media_type="application/json", content=json.dumps(body))
@@ -1,3 +1,4 @@
 from .brief import compute_brief
+from .warmup import warm_up, warmup_state
 
-__all__ = ["compute_brief"]
+__all__ = ["compute_brief", "warm_up", "warmup_state"]
@@ -0,0 +1,97 @@
+"""Startup warm-up of the embedding model and policy index.
+
+The app lifespan runs ``warm_up`` off the event loop; ``/readyz`` reports
+not-ready until it has finished so load balancers never route cold traffic.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..core.metrics import record_warmup
+from ..rag import embedder, shards
+from ..rag.index_cache import enable_hot_swap, get_index
+from ..rag.retrieve import semantic_search_many
+
+logger = logging.getLogger("codexia.warmup")
+
+# Representative claim-context and driver queries; enough to run the encoder,
+# the FAISS search and passage decoding once each.
+WARMUP_QUERIES: List[str] = [
+    "UnitedHealthcare 97012 97110 pos 11",
+    "modifier 59 distinct procedural service same date of service",
+    "unspecified diagnosis code requires greater specificity",
+    "documentation required progress note attachment",
+]
+
+
+@dataclass
+class WarmupState:
+    started: bool = False
+    finished: bool = False
+    duration_s: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"finished": self.finished, "duration_s": self.duration_s, "error": self.error}
+
+
+_STATE = WarmupState()
+_LOCK = threading.Lock()
+
+
+def _stage(name: str, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    record_warmup(name, time.perf_counter() - start)
+
+
+def mark_started() -> None:
+    """Report not-ready from now until the next ``warm_up`` finishes."""
+    with _LOCK:
+        _STATE.started, _STATE.finished, _STATE.error = True, False, None
+
+
+def warm_up(vector_dir: str, queries: List[str] = WARMUP_QUERIES, topk: int = 5) -> WarmupState:
+    """Load the embedder and index for ``vector_dir`` and run canned queries."""
+    mark_started()
+    start = time.perf_counter()
+    try:
+        if shards.is_sharded(vector_dir):
+            index_dirs = [shards.shard_dir(vector_dir, name) for name in shards.read_layout(vector_dir)]
+        else:
+            index_dirs = [vector_dir]
+        _stage("model", embedder.warm_up)
+        _stage("index", lambda: [get_index(d) for d in index_dirs])
+        _stage("queries", lambda: semantic_search_many(queries, topk, vector_dir))
+        for d in index_dirs:
+            enable_hot_swap(d)
+    except Exception as exc:
+        logger.exception("warm-up failed", extra={"vector_dir": vector_dir})
+        error = str(exc) or type(exc).__name__
+    else:
+        error = None
+    duration = time.perf_counter() - start
+    record_warmup("total", duration)
+    with _LOCK:
+        _STATE.finished, _STATE.duration_s, _STATE.error = True, round(duration, 4), error
+    logger.info("warm-up finished", extra=_STATE.as_dict())
+    return _STATE
+
+
+def mark_ready() -> None:
+    """Skip warm-up (``WARMUP_ON_STARTUP=false``)."""
+    with _LOCK:
+        _STATE.started = _STATE.finished = True
+        _STATE.duration_s, _STATE.error = 0.0, None
+
+
+def warmup_state() -> WarmupState:
+    return _STATE
@@ -41,3 +41,17 @@ def test_assess_agent(tmp_path):
         ev.get("clauseId") == "UHC-LCD-123 §3b" or ev.get("source") == "UHC-LCD-123.md"
         for ev in out1["evidence"]
     )
+
+
+def test_assess_routes_retrieval_by_payer(monkeypatch):
+    from packages.backend.agents import assessor_agent
+
+    seen = {}
+
+    def fake_search(queries, topk, vector_dir, **kwargs):
+        seen.update(kwargs)
+        return [{"query": q, "topk": topk, "results": []} for q in queries]
+
+    monkeypatch.setattr(assessor_agent, "semantic_search_many", fake_search)
+    assess_claim(CASE_MOD59, "unused")
+    assert seen["payer"] == "UnitedHealthcare"
@@ -0,0 +1,54 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import async_search
+from packages.backend.rag.async_search import asemantic_search, asemantic_search_many, search_executor
+from packages.backend.rag.indexer import build_index
+from packages.backend.rag.retrieve import semantic_search_many
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+QUERIES = [
+    "modifier 59 with 97012 and 97110 same date of service",
+    "97110 therapeutic exercise",
+]
+
+
+def test_async_search_matches_sync(tmp_path):
+    vector_dir = str(tmp_path / "vector")
+    build_index(POLICY_DIR, vector_dir)
+    expected = semantic_search_many(QUERIES, 5, vector_dir, mode="hybrid")
+    got = asyncio.run(asemantic_search_many(QUERIES, 5, vector_dir, mode="hybrid"))
+    assert got == expected
+    one = asyncio.run(asemantic_search(QUERIES[0], 5, vector_dir))
+    assert one == semantic_search_many(QUERIES[:1], 5, vector_dir)[0]
+
+
+def test_cancelled_search_skips_queued_work(tmp_path, monkeypatch):
+    vector_dir = str(tmp_path / "vector")
+    build_index(POLICY_DIR, vector_dir)
+    monkeypatch.setenv("RAG_SEARCH_CONCURRENCY", "1")
+    async_search.shutdown_search_executor()
+    gate = threading.Event()
+    encoded = []
+    monkeypatch.setattr(async_search, "_encode_pending", lambda state: encoded.append(1))
+
+    async def main():
+        blocker = asyncio.get_running_loop().run_in_executor(search_executor(), gate.wait)
+        task = asyncio.ensure_future(asemantic_search(QUERIES[0], 5, vector_dir))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        gate.set()
+        await blocker
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    async_search.shutdown_search_executor()
+    assert encoded == []
@@ -5,7 +5,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
 from packages.backend.rag.indexer import build_index
-from packages.backend.rag.retrieve import semantic_search, query_policy_for_claim_context
+from packages.backend.rag.retrieve import semantic_search, semantic_search_many, query_policy_for_claim_context
 
 CASE_MOD59 = {
     "claimId": "CLM-1001",
@@ -51,3 +51,17 @@ def test_build_and_query(tmp_path):
     claim_ret = query_policy_for_claim_context(CASE_MOD59, 3, str(vector_dir))
     top_clause = claim_ret["results"][0]["clause_id"]
     assert "UHC-LCD-123" in top_clause or "Kaiser-ACL-22" in top_clause
+
+
+def test_batched_search_matches_sequential(tmp_path):
+    vector_dir = str(tmp_path / "vector")
+    build_index(POLICY_DIR, vector_dir)
+    queries = [
+        "modifier 59 with 97012 and 97110 same date of service",
+        "M25.50 specificity",
+        "",
+        "POS 11 imaging documentation rationale",
+    ]
+    batched = semantic_search_many(queries, 4, vector_dir)
+    assert batched == [semantic_search(q, 4, vector_dir) for q in queries]
+    assert semantic_search_many([], 4, vector_dir) == []
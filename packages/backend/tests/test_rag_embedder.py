@@ -0,0 +1,87 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import embedder
+
+
+class _FakeModel:
+    def __init__(self, name, local_files_only=True):
+        self.name = name
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+
+
+def test_model_loaded_once_per_name(monkeypatch):
+    loads = []
+
+    def fake_ctor(name, local_files_only=True):
+        loads.append(name)
+        return _FakeModel(name)
+
+    monkeypatch.setattr(embedder, "SentenceTransformer", fake_ctor)
+    embedder.clear()
+    try:
+        threads = [threading.Thread(target=embedder.get_model, args=("m",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert loads == ["m"]
+        assert embedder.get_model("m") is embedder.get_model("m")
+
+        embedder.warm_up(["m"])
+        assert embedder.get_model("m").encoded == 1
+    finally:
+        embedder.clear()
+
+
+def test_unavailable_model_is_remembered(monkeypatch):
+    calls = []
+
+    def failing_ctor(name, local_files_only=True):
+        calls.append(name)
+        raise OSError("no weights")
+
+    monkeypatch.setattr(embedder, "SentenceTransformer", failing_ctor)
+    embedder.clear()
+    try:
+        assert embedder.get_model("dummy") is None
+        assert embedder.get_model("dummy") is None
+        assert calls == ["dummy"]
+    finally:
+        embedder.clear()
+
+
+def test_query_embeddings_cached_by_model_and_text(monkeypatch):
+    def failing_ctor(name, local_files_only=True):
+        raise OSError("no weights")
+
+    encoded = []
+    real_encode = embedder.encode
+
+    def counting_encode(texts, model_name, dim):
+        encoded.append(list(texts))
+        return real_encode(texts, model_name, dim)
+
+    monkeypatch.setattr(embedder, "SentenceTransformer", failing_ctor)
+    monkeypatch.setattr(embedder, "encode", counting_encode)
+    embedder.clear()
+    try:
+        first = embedder.embed_queries(["modifier 59 97012", "m25.50 specificity", "modifier 59 97012"], "dummy", 16)
+        assert encoded == [["modifier 59 97012", "m25.50 specificity"]]
+        assert (first[0] == first[2]).all()
+
+        again = embedder.embed_queries(["m25.50 specificity"], "dummy", 16)
+        assert encoded == [["modifier 59 97012", "m25.50 specificity"]]
+        assert (again[0] == first[1]).all()
+
+        embedder.embed_queries(["m25.50 specificity"], "other", 16)
+        assert encoded[-1] == ["m25.50 specificity"]
+        assert embedder.query_cache_stats()["hits"] == 1
+    finally:
+        embedder.clear()
@@ -0,0 +1,60 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag.indexer import build_index
+from packages.backend.rag.filters import eligible_ids
+from packages.backend.rag.index_cache import get_index
+from packages.backend.rag.retrieve import semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = ROOT / "data/policies"
+
+EXPIRED = """# UHC-OLD-1 — Retired policy
+- clause_id: UHC-OLD-1 §1
+- effective: 2020-01-01 → 2022-12-31
+Text: Modifier 59 with 97012 and 97110 on the same date of service was never required.
+"""
+
+QUERY = "modifier 59 with 97012 and 97110 same date of service"
+
+
+@pytest.mark.parametrize("spec", [None, {"type": "ivf", "nprobe": 64}, {"type": "hnsw"}])
+def test_filters_applied_inside_search(tmp_path, spec):
+    policies = tmp_path / "policies"
+    shutil.copytree(POLICY_DIR, policies)
+    (policies / "UHC-OLD-1.md").write_text(EXPIRED, encoding="utf-8")
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(policies), vector_dir, index_spec=spec)
+
+    res = semantic_search(QUERY, 3, vector_dir, filters={"payer": "uhc"})["results"]
+    assert len(res) == 3
+    assert all(p["source"].startswith("UHC-") for p in res)
+
+    res = semantic_search(QUERY, 10, vector_dir, filters={"payer": "UHC", "date_of_service": "2025-03-01"})["results"]
+    assert "UHC-LCD-123 §3b" in [p["clause_id"] for p in res]
+    assert all(p["clause_id"] != "UHC-OLD-1 §1" for p in res)
+
+    res = semantic_search(QUERY, 10, vector_dir, filters={"date_of_service": "2021-06-30"})["results"]
+    assert [p["clause_id"] for p in res] == ["UHC-OLD-1 §1"]
+
+    assert semantic_search(QUERY, 5, vector_dir, filters={"payer": "nobody"})["results"] == []
+
+    with pytest.raises(ValueError, match="date_of_service"):
+        semantic_search(QUERY, 5, vector_dir, filters={"date_of_service": "03/01/2025"})
+
+
+def test_narrow_filters_fill_topk_on_ivf(tmp_path):
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(POLICY_DIR), vector_dir, index_spec={"type": "ivf", "nlist": 16, "nprobe": 1})
+    _, meta = get_index(vector_dir)
+    sources = sorted({s.split("-")[0] for s in meta["files"]})
+    for payer in sources:
+        eligible = eligible_ids(meta, {"payer": payer})
+        for topk in (1, 4, 10):
+            res = semantic_search(QUERY, topk, vector_dir, filters={"payer": payer}, exact_rerank=False)["results"]
+            assert len(res) == min(topk, len(eligible)), (payer, topk)
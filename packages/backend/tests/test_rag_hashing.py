@@ -0,0 +1,39 @@
+import hashlib
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag.hashing import HashingVectorizer, hash_embed
+from packages.backend.rag.indexer import _gather_passages
+from packages.backend.rag.normalize import normalize_text
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _reference(texts, dim):
+    emb = np.zeros((len(texts), dim), dtype="float32")
+    for i, t in enumerate(texts):
+        for word in t.split():
+            h = int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % dim
+            emb[i, h] += 1.0
+    norms = np.linalg.norm(emb, axis=1, keepdims=True) + 1e-10
+    return emb / norms
+
+
+def test_hash_embed_bit_identical_to_loop():
+    texts = [normalize_text(p["text"]) for p in _gather_passages(str(ROOT / "data/policies"))]
+    texts += ["", "repeat repeat repeat", "m25.50 specificity"]
+    for dim in (384, 16):
+        got = hash_embed(texts, dim)
+        want = _reference(texts, dim)
+        assert got.dtype == want.dtype
+        assert got.tobytes() == want.tobytes()
+
+
+def test_tokens_hashed_once():
+    vec = HashingVectorizer(32)
+    vec.transform(["a b a", "b c"])
+    assert set(vec._buckets) == {"a", "b", "c"}
@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import retrieve
+from packages.backend.rag.indexer import build_index
+from packages.backend.rag.lexical import LexicalIndex, is_code_heavy, rrf_fuse
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+
+
+def test_bm25_prefers_rare_exact_terms():
+    lex = LexicalIndex.build(["cpt 97012 traction", "cpt 97110 exercise", "cpt 97110 exercise 97110"])
+    ranked = lex.top(["97110"], 5)
+    assert [r for r, _ in ranked] == [2, 1]
+    assert lex.top(["cpt"], 1)[0][0] in {0, 1, 2}
+    assert lex.top(["absent"], 3) == []
+    assert is_code_heavy(["97012", "97110", "59"]) and not is_code_heavy(["imaging", "documentation"])
+    fused = rrf_fuse([[1, 2, 3], [3, 1]])
+    assert max(fused, key=fused.get) == 1
+
+
+def test_hybrid_search_and_lexical_shortcut(tmp_path, monkeypatch):
+    vector_dir = str(tmp_path / "vector")
+    build_index(POLICY_DIR, vector_dir)
+
+    res = retrieve.semantic_search("modifier 59 with 97012 and 97110 same date of service", 3, vector_dir, mode="hybrid")
+    assert "UHC-LCD-123 §3b" in [p["clause_id"] for p in res["results"]]
+
+    calls = []
+    real = retrieve.embed_queries
+
+    def spy(queries, model, dim):
+        calls.append(list(queries))
+        return real(queries, model, dim)
+
+    monkeypatch.setattr(retrieve, "embed_queries", spy)
+    monkeypatch.setattr(retrieve, "LEXICAL_MARGIN", 0.0)
+    out = retrieve.semantic_search_many(["97012 97110 59", "imaging documentation rationale"], 1, vector_dir, mode="hybrid")
+    assert calls == [["imaging documentation rationale"]]
+    assert out[0]["results"][0]["clause_id"] in {"UHC-LCD-123 §3b", "Aetna-PL-987 §1"}
+    assert len(out[1]["results"]) == 1
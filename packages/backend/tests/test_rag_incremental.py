@@ -0,0 +1,51 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag.indexer import build_index
+from packages.backend.rag.retrieve import semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = ROOT / "data/policies"
+
+NEW_POLICY = """# ZZ-NEW-1 — Test policy
+- clause_id: ZZ-NEW-1 §1
+- effective: 2025-01-01 →
+Text: Zygomatic arch fixation requires operative report attachment.
+"""
+
+
+@pytest.mark.parametrize("spec", [None, {"type": "hnsw"}])
+def test_incremental_rebuild_reembeds_only_changed_files(tmp_path, spec):
+    policies = tmp_path / "policies"
+    shutil.copytree(POLICY_DIR, policies)
+    vector_dir = str(tmp_path / "vector")
+
+    _, meta = build_index(str(policies), vector_dir, index_spec=spec)
+    assert meta["build"]["mode"] == "full"
+    total = len(meta["passages"])
+    assert set(meta["files"]) == {p.name for p in policies.glob("*.md")}
+
+    (policies / "ZZ-NEW-1.md").write_text(NEW_POLICY, encoding="utf-8")
+    (policies / "Aetna-PL-987.md").unlink()
+    aetna = sum(1 for p in meta["passages"] if p["source"] == "Aetna-PL-987.md")
+    _, meta2 = build_index(str(policies), vector_dir, index_spec=spec)
+    assert meta2["build"] == {"mode": "incremental", "added": 1, "removed": aetna}
+    assert len(meta2["passages"]) == total - aetna + 1
+    ids = meta2["passages"].ids.tolist()
+    assert ids == sorted(ids)
+
+    res = semantic_search("zygomatic arch fixation operative report", 1, vector_dir)
+    assert res["results"][0]["clause_id"] == "ZZ-NEW-1 §1"
+    res = semantic_search("modifier 59 with 97012 and 97110 same date of service", 5, vector_dir)
+    assert "UHC-LCD-123 §3b" in [p["clause_id"] for p in res["results"]]
+    assert all(p["source"] != "Aetna-PL-987.md" for p in res["results"])
+
+    fresh_dir = str(tmp_path / "fresh")
+    _, fresh = build_index(str(policies), fresh_dir, index_spec=spec)
+    q = "therapeutic exercise documentation of goals"
+    assert semantic_search(q, 5, vector_dir)["results"] == semantic_search(q, 5, fresh_dir)["results"]
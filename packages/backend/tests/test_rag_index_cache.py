@@ -0,0 +1,32 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import index_cache
+from packages.backend.rag.indexer import build_index
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+
+
+def test_index_cached_until_files_change(tmp_path):
+    vector_dir = str(tmp_path / "vector")
+    build_index(POLICY_DIR, vector_dir)
+    index_cache.clear_cache()
+
+    first = index_cache.get_index(vector_dir)
+    second = index_cache.get_index(vector_dir)
+    assert first[0] is second[0]
+    stats = index_cache.cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1 and stats["reloads"] == 0
+
+    meta_path = os.path.join(vector_dir, "meta.json")
+    st = os.stat(meta_path)
+    os.utime(meta_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    third = index_cache.get_index(vector_dir)
+    assert third[0] is not first[0]
+    assert index_cache.cache_stats()["reloads"] == 1
+    assert third[1]["passages"] == first[1]["passages"]
+    index_cache.clear_cache()
@@ -0,0 +1,85 @@
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import faiss
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import versions
+from packages.backend.rag.indexer import build_index, load_index
+from packages.backend.rag.retrieve import semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+QUERY = "modifier 59 with 97012 and 97110 same date of service"
+
+
+@pytest.mark.parametrize(
+    "spec, knob",
+    [
+        ({"type": "ivf", "nprobe": 3}, ("nprobe", 3)),
+        ({"type": "hnsw", "ef_search": 48}, ("efSearch", 48)),
+    ],
+)
+def test_ann_index_spec_recorded_and_restored(tmp_path, spec, knob):
+    vector_dir = tmp_path / "vector"
+    build_index(POLICY_DIR, str(vector_dir), index_spec=spec)
+    meta = json.loads((vector_dir / "meta.json").read_text(encoding="utf-8"))
+    assert meta["index"]["type"] == spec["type"]
+
+    index, _ = load_index(str(vector_dir))
+    name, value = knob
+    if name == "nprobe":
+        assert faiss.extract_index_ivf(index).nprobe == value
+    else:
+        assert faiss.downcast_index(index.index).hnsw.efSearch == value
+
+    clauses = [p["clause_id"] for p in semantic_search(QUERY, 5, str(vector_dir))["results"]]
+    assert "UHC-LCD-123 §3b" in clauses
+
+
+def test_changed_spec_triggers_rebuild(tmp_path):
+    vector_dir = str(tmp_path / "vector")
+    build_index(POLICY_DIR, vector_dir)
+    _, meta = build_index(POLICY_DIR, vector_dir, index_spec={"type": "hnsw"})
+    assert meta["index"]["type"] == "hnsw"
+    with pytest.raises(ValueError):
+        build_index(POLICY_DIR, vector_dir, index_spec={"type": "lsh"})
+
+
+def test_ivf_index_loads_memory_mapped(tmp_path):
+    policies = tmp_path / "policies"
+    shutil.copytree(POLICY_DIR, policies)
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(policies), vector_dir, index_spec={"type": "ivf", "nprobe": 3})
+
+    mapped, _ = load_index(vector_dir, mmap=True)
+    private, _ = load_index(vector_dir, mmap=False)
+    ivf = faiss.extract_index_ivf(mapped)
+    assert isinstance(faiss.downcast_InvertedLists(ivf.invlists), faiss.OnDiskInvertedLists)
+    assert ivf.nprobe == 3
+    assert isinstance(faiss.downcast_InvertedLists(faiss.extract_index_ivf(private).invlists), faiss.ArrayInvertedLists)
+    q = faiss.rand((4, private.d), 7).reshape(4, private.d)
+    assert (mapped.search(q, 5)[1] == private.search(q, 5)[1]).all()
+
+    # An incremental build never writes through the mapping of the old version.
+    old_version = versions.resolve(vector_dir)
+    before = (Path(old_version) / "index.faiss").read_bytes()
+    (policies / "Aetna-NEW-001.md").write_text(
+        "# Aetna-NEW-001 — Modifiers\n- clause_id: Aetna-NEW-001 §1\n- effective: 2024-01-01 →\n"
+        "Text: Modifier 59 requires a distinct anatomic site.\n",
+        encoding="utf-8",
+    )
+    _, meta = build_index(str(policies), vector_dir)
+    assert meta["build"] == {"mode": "incremental", "added": 1, "removed": 0}
+    assert (Path(old_version) / "index.faiss").read_bytes() == before
+
+
+def test_mmap_falls_back_to_private_load_for_flat_index(tmp_path):
+    vector_dir = str(tmp_path / "vector")
+    build_index(POLICY_DIR, vector_dir)
+    index, _ = load_index(vector_dir, mmap=True)
+    assert index.ntotal > 0
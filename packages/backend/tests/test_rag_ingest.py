@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag.indexer import build_index, _gather_passages
+from packages.backend.rag.ingest import length_sorted_batches, parse_policies
+from packages.backend.rag.retrieve import semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+QUERY = "E/M modifier 25 significant separately"
+
+
+def test_parallel_parse_preserves_file_order():
+    paths = sorted(str(p) for p in Path(POLICY_DIR).glob("*.md"))
+    serial = [p for _, _, ps in parse_policies(paths, workers=1) for p in ps]
+    parallel = [p for _, _, ps in parse_policies(paths, workers=2) for p in ps]
+    assert serial == parallel == _gather_passages(POLICY_DIR)
+
+
+def test_length_sorted_batches_cover_every_row():
+    texts = ["ccc", "a", "bb", "dddd", ""]
+    batches = [b.tolist() for b in length_sorted_batches(texts, 2)]
+    assert batches == [[4, 1], [2, 0], [3]]
+
+
+def test_small_batches_match_single_batch_build(tmp_path):
+    reports = []
+    _, meta = build_index(POLICY_DIR, str(tmp_path / "a"), batch_size=4, workers=2, progress=reports.append)
+    build_index(POLICY_DIR, str(tmp_path / "b"), batch_size=10_000)
+    n = len(meta["passages"])
+    assert len(reports) == -(-n // 4)
+    assert reports[-1]["passages"] == n and reports[-1]["passages_per_s"] > 0
+    assert meta["build"]["stats"]["mb"] > 0
+    a = semantic_search(QUERY, 5, str(tmp_path / "a"))["results"]
+    b = semantic_search(QUERY, 5, str(tmp_path / "b"))["results"]
+    assert a == b
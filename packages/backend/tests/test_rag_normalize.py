@@ -0,0 +1,84 @@
+import io
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.benchmarks.corpus import synthesize_policies
+from packages.backend.rag.normalize import extract_clauses, iter_clauses
+from packages.backend.rag.types import Passage
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _reference_extract(md, source):
+    # The whole-document extractor that iter_clauses replaced.
+    lines = md.splitlines()
+    passages = []
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if line.startswith("- clause_id:"):
+            clause_id = line.split(":", 1)[1].strip()
+            i += 1
+            if i >= len(lines):
+                break
+            m = re.match(r"- effective:\s*(\d{4}-\d{2}-\d{2})\s*→\s*(\d{4}-\d{2}-\d{2})?", lines[i].strip())
+            if not m:
+                i += 1
+                continue
+            effective_from, effective_to = m.group(1), m.group(2) or None
+            i += 1
+            text_lines = []
+            if i < len(lines) and lines[i].strip().startswith("Text:"):
+                text_lines.append(lines[i].split("Text:", 1)[1].strip())
+                i += 1
+                while i < len(lines) and not lines[i].strip().startswith("- clause_id:") and lines[i].strip() != "":
+                    text_lines.append(lines[i].strip())
+                    i += 1
+            text = " ".join(text_lines).strip()
+            passages.append(
+                Passage(
+                    text=f"{clause_id} ({effective_from}→{effective_to or ''}) {text}".strip(),
+                    source=source,
+                    clause_id=clause_id,
+                    effective_from=effective_from,
+                    effective_to=effective_to,
+                )
+            )
+        else:
+            i += 1
+    return passages
+
+
+EDGE_CASES = [
+    "",
+    "- clause_id: A §1",
+    "- clause_id: A §1\n- effective: 2024-01-01 →",
+    "- clause_id: A §1\n- effective: 2024-01-01 → 2025-12-31\nText: one\n  two  \nthree\n\nafter",
+    "- clause_id: A §1\n- effective: 2024-01-01 →\nNot text\n- clause_id: B §2\n- effective: 2023-05-05 →\nText: b",
+    "- clause_id: A §1\n- clause_id: B §2\n- effective: 2024-01-01 →\nText: skipped effective",
+    "- clause_id: A §1\n- effective: soon\n- clause_id: B §2\n- effective: 2024-01-01 →\nText: b",
+    "- clause_id: A §1\r\n- effective: 2024-01-01 →\r\nText: crlf\r\n- clause_id: B §2\r- effective: 2024-02-02 →\rText: cr",
+    "- clause_id: A §1\n- effective: 2024-01-01 →\nText: a Text: nested\n- clause_id: B §2\n- effective: 2024-01-01 →\nText:",
+    "  - clause_id:  A §1  \n\t- effective:2024-01-01→2024-06-30 trailing\n   Text:   padded   second\x0cthird",
+]
+
+
+@pytest.mark.parametrize("md", EDGE_CASES)
+def test_matches_reference_extractor(md):
+    expected = _reference_extract(md, "X.md")
+    assert extract_clauses(md, "X.md") == expected
+    assert list(iter_clauses(io.StringIO(md, newline=""), "X.md")) == expected
+
+
+def test_streams_policy_files_like_whole_documents(tmp_path):
+    paths = sorted((ROOT / "data/policies").glob("*.md"))
+    paths += [Path(p) for p in synthesize_policies(str(tmp_path), 300, clauses_per_file=100)]
+    for path in paths:
+        expected = _reference_extract(path.read_text(encoding="utf-8"), path.name)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            assert list(iter_clauses(f, path.name)) == expected
@@ -0,0 +1,42 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag.indexer import build_index, _gather_passages
+from packages.backend.rag.passage_store import PassageStore, write_store
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+
+
+def test_store_roundtrip_and_lazy_lookup(tmp_path):
+    passages = _gather_passages(POLICY_DIR)
+    passages.append(
+        {"text": "Ünïcode §9 text", "source": "X.md", "clause_id": "X §9", "effective_from": "2023-02-28", "effective_to": "2024-12-31"}
+    )
+    ids = [i * 3 for i in range(len(passages))]
+    path = str(tmp_path / "passages.bin")
+    write_store(path, ids, passages)
+
+    store = PassageStore(path)
+    assert len(store) == len(passages)
+    assert list(store) == passages
+    assert store.by_id(ids[-1]) == passages[-1]
+    assert store[-1]["effective_to"] == "2024-12-31"
+    assert store[0]["effective_to"] is None
+
+
+def test_meta_json_is_compact_header_with_optional_export(tmp_path):
+    vector_dir = tmp_path / "vector"
+    _, meta = build_index(POLICY_DIR, str(vector_dir))
+    header = json.loads((vector_dir / "meta.json").read_text(encoding="utf-8"))
+    assert "passages" not in header
+    assert isinstance(meta["passages"], PassageStore)
+    assert list(meta["passages"]) == _gather_passages(POLICY_DIR)
+
+    debug_dir = tmp_path / "debug"
+    build_index(POLICY_DIR, str(debug_dir), export_passages=True)
+    exported = json.loads((debug_dir / "meta.json").read_text(encoding="utf-8"))
+    assert exported["passages"] == _gather_passages(POLICY_DIR)
@@ -0,0 +1,83 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag.index_factory import factory_string, make_index, resolve_spec
+from packages.backend.rag.indexer import build_index
+from packages.backend.rag.retrieve import semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+QUERY = "modifier 59 with 97012 and 97110 same date of service"
+
+
+def test_quantized_factory_strings():
+    assert factory_string(resolve_spec({"quantizer": "sq8"}, 100, 384)) == "IDMap2,SQ8"
+    assert factory_string(resolve_spec({"type": "hnsw", "quantizer": "sqfp16"}, 100, 384)) == "IDMap2,HNSW32_SQfp16"
+    spec = resolve_spec({"type": "ivf", "nlist": 4, "quantizer": "pq"}, 1000, 384)
+    # "np" skips polysemous training, which took minutes and is never used.
+    assert factory_string(spec) == "IVF4,PQ48x8np"
+    assert factory_string(resolve_spec({"quantizer": "pq"}, 1000, 384)) == "IDMap2,PQ48x8np"
+    assert spec["compression_ratio"] == 32.0
+    with pytest.raises(ValueError):
+        resolve_spec({"type": "hnsw", "quantizer": "pq"}, 100, 384)
+
+
+@pytest.mark.parametrize("spec", [{"type": "ivf", "quantizer": "pq"}, {"quantizer": "pq"}])
+def test_pq_indexes_train_without_polysemous_codes(spec):
+    x = np.random.default_rng(0).random((3000, 384), dtype="float32")
+    index = make_index(384, resolve_spec(spec, len(x), 384))
+    start = time.perf_counter()
+    index.train(x)
+    assert time.perf_counter() - start < 30
+    pq = faiss.downcast_index(index.index if spec.get("type") != "ivf" else index)
+    assert not pq.do_polysemous_training
+
+
+@pytest.mark.parametrize(
+    "spec, ratio",
+    [
+        ({"quantizer": "sq8"}, 4.0),
+        ({"quantizer": "sqfp16"}, 2.0),
+        ({"type": "ivf", "nlist": 2, "quantizer": "pq", "pq_m": 8, "pq_nbits": 4}, 384.0),
+    ],
+)
+def test_quantized_index_records_ratio_and_reranks_exactly(tmp_path, spec, ratio):
+    vector_dir = tmp_path / "vector"
+    _, built = build_index(POLICY_DIR, str(vector_dir), index_spec=spec)
+    meta = json.loads((vector_dir / "meta.json").read_text(encoding="utf-8"))
+    assert meta["index"]["compression_ratio"] == ratio
+    assert built["vectors"].shape == (len(built["passages"]), meta["vector_dim"])
+
+    flat_dir = tmp_path / "flat"
+    build_index(POLICY_DIR, str(flat_dir))
+    exact = [p["clause_id"] for p in semantic_search(QUERY, 5, str(flat_dir))["results"]]
+    reranked = [p["clause_id"] for p in semantic_search(QUERY, 5, str(vector_dir))["results"]]
+    assert reranked == exact
+    assert len(semantic_search(QUERY, 5, str(vector_dir), exact_rerank=False)["results"]) == 5
+
+
+def test_incremental_build_keeps_vectors_aligned(tmp_path):
+    policies = tmp_path / "policies"
+    policies.mkdir()
+    for src in Path(POLICY_DIR).glob("*.md"):
+        (policies / src.name).write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(policies), vector_dir, index_spec={"quantizer": "sq8"})
+
+    victim = sorted(policies.glob("*.md"))[0]
+    victim.write_text(victim.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    _, meta = build_index(str(policies), vector_dir, index_spec={"quantizer": "sq8"})
+    assert meta["build"]["mode"] == "incremental"
+
+    _, full = build_index(str(policies), str(tmp_path / "full"), index_spec={"quantizer": "sq8"})
+    by_clause = {p["clause_id"]: row for row, p in enumerate(full["passages"])}
+    for row, passage in enumerate(meta["passages"]):
+        assert np.allclose(meta["vectors"][row], full["vectors"][by_clause[passage["clause_id"]]])
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.benchmarks.retrieval import compare, run_scale
+
+
+def test_seed_corpus_recall_baseline():
+    report = run_scale(0, 5, 1)
+    assert report["semantic_search"]["recall_at_k"] == 1.0
+    assert report["claim_context"]["recall_at_k"] >= 0.8
+    assert report["index_bytes"] > 0
+
+    baseline = {"scales": [report]}
+    diff = compare(baseline, baseline)[0]
+    assert diff["semantic_search"]["recall_at_k"] == 0.0
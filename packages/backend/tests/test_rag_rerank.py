@@ -0,0 +1,71 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import rerank
+from packages.backend.rag.indexer import build_index
+from packages.backend.rag.retrieve import semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+QUERY = "modifier 59 with 97012 and 97110 same date of service"
+
+
+class FakeCrossEncoder:
+    """Prefers passages mentioning 'documentation'; counts scored pairs."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.scored = 0
+
+    def predict(self, pairs, show_progress_bar=False):
+        time.sleep(self.delay)
+        self.scored += len(pairs)
+        return [float("documentation" in text.lower()) - i * 1e-3 for i, (_, text) in enumerate(pairs)]
+
+
+@pytest.fixture
+def vector_dir(tmp_path):
+    out = str(tmp_path / "vector")
+    build_index(POLICY_DIR, out)
+    rerank.clear()
+    yield out
+    rerank.clear()
+
+
+def test_rerank_reorders_top_candidates_and_caches_scores(vector_dir, monkeypatch):
+    model = FakeCrossEncoder()
+    monkeypatch.setitem(rerank._MODELS.models, "fake", model)
+    monkeypatch.setattr(rerank._settings, "RAG_RERANK_MODEL", "fake")
+
+    first = semantic_search(QUERY, 10, vector_dir)["results"]
+    res = semantic_search(QUERY, 3, vector_dir, rerank_candidates=10)
+    assert res["topk"] == 3 and len(res["results"]) == 3
+    # Stable sort: documentation passages first, otherwise first-stage order.
+    expected = sorted(first, key=lambda p: -float("documentation" in p["text"].lower()))
+    assert res["results"] == expected[:3]
+    assert model.scored == len(first)
+
+    semantic_search(QUERY, 3, vector_dir, rerank_candidates=10)
+    assert model.scored == len(first)
+    assert rerank.score_cache_stats()["hits"] >= len(first)
+
+
+def test_rerank_falls_back_to_first_stage_order_over_budget(vector_dir, monkeypatch):
+    monkeypatch.setitem(rerank._MODELS.models, "fake", FakeCrossEncoder(delay=0.05))
+    monkeypatch.setattr(rerank._settings, "RAG_RERANK_MODEL", "fake")
+    monkeypatch.setattr(rerank, "SCORE_BATCH", 2)
+
+    first = semantic_search(QUERY, 3, vector_dir)["results"]
+    res = semantic_search(QUERY, 3, vector_dir, rerank_candidates=10, rerank_budget_ms=1)
+    assert res["results"] == first
+
+
+def test_rerank_without_local_model_keeps_bi_encoder_order(vector_dir, monkeypatch):
+    monkeypatch.setitem(rerank._MODELS.models, "missing", None)
+    monkeypatch.setattr(rerank._settings, "RAG_RERANK_MODEL", "missing")
+    assert semantic_search(QUERY, 3, vector_dir, rerank_candidates=10) == semantic_search(QUERY, 3, vector_dir)
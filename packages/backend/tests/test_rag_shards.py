@@ -0,0 +1,79 @@
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import shards, versions
+from packages.backend.rag.indexer import build_index, build_shard, load_index
+from packages.backend.rag.retrieve import query_policy_for_claim_context, semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = ROOT / "data/policies"
+QUERY = "modifier 59 with 97012 and 97110 same date of service"
+CLAIM = {
+    "payer": {"name": "UnitedHealthcare"},
+    "provider": {"siteOfService": "11"},
+    "lines": [{"cpt": "97012", "modifiers": [""]}, {"cpt": "97110", "modifiers": [""]}],
+}
+
+
+def test_sharded_search_matches_monolithic_restricted_to_routed_shards(tmp_path):
+    mono, sharded = str(tmp_path / "mono"), str(tmp_path / "sharded")
+    build_index(str(POLICY_DIR), mono)
+    built = build_index(str(POLICY_DIR), sharded, shard_by_payer=True)
+
+    layout = shards.read_layout(sharded)
+    assert set(built) == set(layout)
+    assert layout["shared"] == ["CMS-NCD-456.md", "Medicare-AB-2024-05.md"]
+    assert layout["UHC"] == ["UHC-LCD-123.md", "UHC-PT-222.md"]
+    for name in layout:
+        _, meta = load_index(shards.shard_dir(sharded, name))
+        assert sorted(meta["files"]) == layout[name]
+
+    assert shards.route("UnitedHealthcare", list(layout)) == ["UHC", "shared"]
+    assert shards.route("Medicare", list(layout)) == ["shared"]
+    assert shards.route("Unknown Health", list(layout)) == sorted(layout)
+
+    allowed = set(layout["UHC"]) | set(layout["shared"])
+    everything = semantic_search(QUERY, 1000, mono)["results"]
+    expected = [p for p in everything if p["source"] in allowed][:5]
+    assert semantic_search(QUERY, 5, sharded, payer="UHC")["results"] == expected
+    assert query_policy_for_claim_context(CLAIM, 5, sharded)["results"] == [
+        p for p in semantic_search("UnitedHealthcare 97012 97110 pos 11", 1000, mono)["results"] if p["source"] in allowed
+    ][:5]
+    assert semantic_search(QUERY, 5, sharded)["results"] == semantic_search(QUERY, 5, mono)["results"]
+
+
+def test_sharded_hybrid_fuses_candidates_across_shards(tmp_path):
+    mono, sharded = str(tmp_path / "mono"), str(tmp_path / "sharded")
+    build_index(str(POLICY_DIR), mono)
+    build_index(str(POLICY_DIR), sharded, shard_by_payer=True)
+
+    # Per-shard RRF scores do not compare across shards; fused once, the top
+    # hits are not one per shard and match the monolithic candidates.
+    query = "97012 97110 59"
+    got = [p["clause_id"] for p in semantic_search(query, 5, sharded, mode="hybrid")["results"]]
+    want = [p["clause_id"] for p in semantic_search(query, 5, mono, mode="hybrid")["results"]]
+    assert sum(c.startswith("UHC-") for c in got) >= 2
+    assert set(got) == set(want)
+
+    routed = semantic_search(query, 5, sharded, mode="hybrid", payer="UHC")["results"]
+    assert routed and {p["source"] for p in routed} <= {"UHC-LCD-123.md", "UHC-PT-222.md", "CMS-NCD-456.md", "Medicare-AB-2024-05.md"}
+    assert semantic_search(query, 5, sharded, mode="hybrid") == semantic_search(query, 5, sharded, mode="hybrid")
+
+
+def test_single_shard_rebuilds_independently(tmp_path):
+    policies = tmp_path / "policies"
+    shutil.copytree(POLICY_DIR, policies)
+    vector_dir = str(tmp_path / "sharded")
+    build_index(str(policies), vector_dir, shard_by_payer=True)
+    before = {n: versions.current_version(shards.shard_dir(vector_dir, n)) for n in shards.read_layout(vector_dir)}
+
+    uhc = policies / "UHC-PT-222.md"
+    uhc.write_text(uhc.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    _, meta = build_shard(str(policies), vector_dir, "UHC")
+    assert meta["build"]["mode"] == "incremental"
+    after = {n: versions.current_version(shards.shard_dir(vector_dir, n)) for n in shards.read_layout(vector_dir)}
+    assert after["UHC"] != before["UHC"]
+    assert {n: v for n, v in after.items() if n != "UHC"} == {n: v for n, v in before.items() if n != "UHC"}
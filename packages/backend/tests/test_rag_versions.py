@@ -0,0 +1,116 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.rag import index_cache, versions
+from packages.backend.rag.indexer import build_index, load_index
+from packages.backend.rag.retrieve import semantic_search
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = ROOT / "data/policies"
+
+NEW_POLICY = """# ZZ-NEW-1 — Test policy
+- clause_id: ZZ-NEW-1 §1
+- effective: 2025-01-01 →
+Text: Zygomatic arch fixation requires operative report attachment.
+"""
+
+
+def _policies(tmp_path):
+    policies = tmp_path / "policies"
+    shutil.copytree(POLICY_DIR, policies)
+    return policies
+
+
+def test_builds_publish_new_versions_and_gc_old_ones(tmp_path):
+    policies = _policies(tmp_path)
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(policies), vector_dir)
+    first = versions.current_version(vector_dir)
+    assert os.path.islink(os.path.join(vector_dir, "meta.json"))
+    assert versions.read_manifest(versions.resolve(vector_dir))["version"] == first
+
+    (policies / "ZZ-NEW-1.md").write_text(NEW_POLICY, encoding="utf-8")
+    build_index(str(policies), vector_dir)
+    second = versions.current_version(vector_dir)
+    assert second != first
+    assert versions.list_versions(vector_dir) == [first, second]
+
+    versions.acquire(os.path.join(vector_dir, "versions", first))
+    (policies / "Aetna-PL-987.md").unlink()
+    build_index(str(policies), vector_dir)
+    third = versions.current_version(vector_dir)
+    assert versions.list_versions(vector_dir) == [first, second, third]
+
+    versions.release(os.path.join(vector_dir, "versions", first))
+    assert versions.gc_versions(vector_dir) == [first]
+    assert versions.list_versions(vector_dir) == [second, third]
+
+
+def test_hot_swap_serves_old_version_until_new_one_is_loaded(tmp_path):
+    policies = _policies(tmp_path)
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(policies), vector_dir)
+    index_cache.clear_cache()
+    index_cache.enable_hot_swap(vector_dir)
+    old_index, _ = index_cache.get_index(vector_dir)
+
+    (policies / "ZZ-NEW-1.md").write_text(NEW_POLICY, encoding="utf-8")
+    build_index(str(policies), vector_dir)
+    assert index_cache.get_index(vector_dir)[0] is old_index
+    assert index_cache._CACHE.wait_for_swap(vector_dir)
+
+    res = semantic_search("zygomatic arch fixation operative report", 1, vector_dir)
+    assert res["results"][0]["clause_id"] == "ZZ-NEW-1 §1"
+    assert index_cache.cache_stats()["swaps"] == 1
+    index_cache.clear_cache()
+    index_cache._CACHE._hot_swap.clear()
+
+
+def test_unversioned_directory_is_upgraded_in_place(tmp_path):
+    built = str(tmp_path / "built")
+    build_index(str(POLICY_DIR), built)
+    legacy = tmp_path / "legacy"
+    shutil.copytree(versions.resolve(built), legacy)
+    assert versions.current_version(str(legacy)) is None
+    assert len(load_index(str(legacy))[1]["passages"]) > 0
+
+    _, meta = build_index(str(POLICY_DIR), str(legacy), rebuild=True)
+    assert versions.current_version(str(legacy)) is not None
+    assert os.path.islink(legacy / "index.faiss")
+    assert len(load_index(str(legacy))[1]["passages"]) == len(meta["passages"])
+
+
+def test_noop_rebuild_leaves_published_version_untouched(tmp_path):
+    policies = _policies(tmp_path)
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(policies), vector_dir)
+    version = versions.current_version(vector_dir)
+    meta_path = os.path.join(versions.resolve(vector_dir), "meta.json")
+    before = os.stat(meta_path).st_mtime_ns
+    signature = index_cache._signature(vector_dir)
+
+    # Newer mtimes but identical content: hashed, found unchanged, no write.
+    for path in policies.iterdir():
+        os.utime(path, ns=(before + 10**9, before + 10**9))
+    build_index(str(policies), vector_dir)
+    assert versions.current_version(vector_dir) == version
+    assert os.stat(meta_path).st_mtime_ns == before
+    assert index_cache._signature(vector_dir) == signature
+
+
+def test_indexes_load_without_a_writable_lease_dir(tmp_path):
+    vector_dir = str(tmp_path / "vector")
+    build_index(str(POLICY_DIR), vector_dir)
+    index_cache.clear_cache()
+
+    # Stands in for a read-only mount: the lease directory cannot be created.
+    version_dir = versions.resolve(vector_dir)
+    Path(version_dir, versions.LEASES_DIR).write_text("", encoding="utf-8")
+    assert versions.acquire(version_dir) is False
+    res = semantic_search("modifier 59 with 97012 and 97110", 1, vector_dir)
+    assert res["results"]
+    index_cache.clear_cache()
@@ -0,0 +1,74 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.tools.batch_rules import to_columns, validate_batch
+from packages.backend.tools.code_rules import icd_cpt_validate, modifier_rules, normalize_claim
+from packages.backend.tools.edit_tables import PairTable, RuleTables, rule_tables
+
+CPTS = ["97012", "97110", "97140", "77080", "99213", "9711", "G0283", ""]
+DXS = ["M25.50", "m25.511", "Z00.00", "M54.5", "U07.1", "bad", " ", "S83.2", "M25.519"]
+MODS = ["59", "gp", "25", " ", "LT"]
+DETAILS = [None, {"flags": ["imaging_generic"]}, {"tags": "other"}, ["imaging_generic", "x"], "imaging_generic", {"type": 5}]
+
+
+def _random_claim(rng):
+    lines = []
+    for _ in range(rng.randrange(0, 7)):
+        line = {"cpt": rng.choice(CPTS), "dx": rng.sample(DXS, rng.randrange(0, 4))}
+        if rng.random() < 0.8:
+            line["modifiers"] = rng.sample(MODS, rng.randrange(0, 2)) if rng.random() < 0.7 else []
+        details = rng.choice(DETAILS)
+        if details is not None:
+            line["details"] = details
+        lines.append(line)
+    claim = {"claimId": "C", "lines": lines}
+    if rng.random() < 0.9:
+        claim["provider"] = {"siteOfService": rng.choice(["11", "22", None])}
+    return claim
+
+
+def _tables():
+    bundled = rule_tables()
+    ptp = PairTable(symmetric=True)
+    ptp.add("97012", "97110", "Traction.", ["B §1", "A §2"])
+    ptp.add("97140", "97110", "Manual therapy.", ["C §3"])
+    ptp.add("99213", "97012", "E/M.", [])
+    ptp.add("9711", "", "Blank.", ["D §4"])
+    dx_cpt = PairTable()
+    dx_cpt.add("97110", "Z00.00", "Checkup.", ["NCD-001 §1"])
+    dx_cpt.add("97110", "M54.5", "Back pain.", ["E §5"])
+    dx_cpt.add("77080", "M25.511", "Imaging.", ["F §6"])
+    return RuleTables("test", ptp, dx_cpt, bundled.site_of_service)
+
+
+def test_batch_matches_per_claim_validators():
+    rng = random.Random(3)
+    claims = [_random_claim(rng) for _ in range(3000)]
+    for tables in (rule_tables(), _tables()):
+        expected = [icd_cpt_validate(c, tables) + modifier_rules(c, tables) for c in claims]
+        assert validate_batch(claims, tables) == expected
+        views = [normalize_claim(c) for c in claims]
+        assert validate_batch(views, tables) == expected
+
+
+def test_columns_intern_codes():
+    cols = to_columns(
+        [
+            {"provider": {"siteOfService": "11"}, "lines": [{"cpt": "97110", "dx": ["m25.50", "M25.50"], "modifiers": ["gp", "59"]}]},
+            {"lines": [{"cpt": "97110", "dx": [], "modifiers": []}, {"cpt": "97012"}]},
+        ]
+    )
+    assert cols.line_claim.tolist() == [0, 1, 1]
+    assert cols.line_no.tolist() == [0, 0, 1]
+    assert [cols.cpts.values[i] for i in cols.line_cpt] == ["97110", "97110", "97012"]
+    assert cols.dx_code.tolist() == [0, 0] and cols.dxs.values == ["M25.50"]
+    assert cols.line_mods.tolist() == [0b11, 0, 0]
+    assert [cols.poss.values[i] for i in cols.claim_pos] == ["11", None]
+
+
+def test_empty_batches():
+    assert validate_batch([]) == []
+    assert validate_batch([{"lines": []}, {}]) == [[], []]
@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.tools.code_rules import icd_cpt_validate, modifier_rules
+from packages.backend.tools.edit_tables import load_rule_tables, read_rows, rule_tables
+
+
+def _write_rules(root: Path, ptp_rows, fmt="csv"):
+    root.mkdir()
+    if fmt == "csv":
+        lines = ["column1,column2,why,policy_refs"] + [f"{a},{b},{why},{';'.join(refs)}" for a, b, why, refs in ptp_rows]
+        (root / "ptp.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    else:
+        rows = [{"column1": a, "column2": b, "why": why, "policy_refs": refs} for a, b, why, refs in ptp_rows]
+        (root / "ptp.jsonl").write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+    (root / "dx.csv").write_text("cpt,dx,why,policy_refs\n97110,z00.00,Not covered.,NCD-001 §1\n", encoding="utf-8")
+    manifest = {"version": "t1", "tables": {"ptp": f"ptp.{fmt}", "dx_cpt": "dx.csv"}}
+    (root / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return load_rule_tables(str(root))
+
+
+def _claim(*cpts, modifiers=()):
+    return {"lines": [{"cpt": c, "dx": ["M25.511"], "modifiers": list(modifiers)} for c in cpts]}
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_tables_load_from_csv_and_jsonl(tmp_path, fmt):
+    tables = _write_rules(tmp_path / "rules", [("97110", "97012", "Needs 59.", ["B §2", "A §1"])], fmt)
+    assert tables.version == "t1"
+    assert len(tables.ptp) == 1
+    # PTP edits are order-insensitive; CPT-ICD edits are not.
+    assert tables.ptp.get("97012", "97110") == tables.ptp.get("97110", "97012") == {
+        "why": "Needs 59.",
+        "policy_refs": ["A §1", "B §2"],
+    }
+    assert ("97110", "Z00.00") in tables.dx_cpt
+    assert ("Z00.00", "97110") not in tables.dx_cpt
+    assert tables.site_of_service == {}
+
+
+def test_claims_only_check_their_own_pairs(tmp_path):
+    rows = [(f"{10000 + i}", f"{20000 + i}", "Bundled.", ["PTP §1"]) for i in range(5000)]
+    rows.append(("97012", "97110", "Traction with exercise.", ["UHC-LCD-123 §3b"]))
+    tables = _write_rules(tmp_path / "rules", rows)
+    assert len(tables.ptp) == 5001
+    assert len(tables.ptp._meta) == 2  # rationales are shared between rows
+
+    issues = modifier_rules(_claim("99213", "97110", "10007", "97012", "20007"), tables)
+    assert [(i["line"], i["why"]) for i in issues] == [(1, "Traction with exercise."), (2, "Bundled.")]
+    assert modifier_rules(_claim("97110", "97012", modifiers=["59"]), tables) == []
+
+    dx_claim = {"lines": [{"cpt": "97110", "dx": ["Z00.00"], "modifiers": []}]}
+    assert [i["issue"] for i in icd_cpt_validate(dx_claim, tables)] == ["dx_incompatibility"]
+
+
+def test_bundled_tables_match_demo_rules():
+    tables = rule_tables()
+    assert tables.ptp.get("97110", "97012")["policy_refs"] == ["Cigna-MED-77 §2", "Kaiser-ACL-22 §1", "UHC-LCD-123 §3b"]
+    assert tables.site_of_service["11"]["notes_required_for"] == ["imaging_generic"]
+
+
+def test_unknown_table_format_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        read_rows(str(tmp_path / "ptp.xlsx"))
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.tools.code_rules import icd_cpt_validate
+from packages.backend.tools.edit_tables import RuleTables, rule_tables
+from packages.backend.tools.icd10 import ICD10Index
+
+
+def _index():
+    return rule_tables().icd10
+
+
+def test_index_loads_order_file():
+    idx = _index()
+    assert isinstance(idx, ICD10Index) and len(idx) > 50
+    assert "M25.511" in idx and "m25511" in idx and "M25.5" in idx
+    assert "M25.5111" not in idx and "M25" in idx
+    assert idx.is_billable("M25.511") and not idx.is_billable("M54.5") and not idx.is_billable("X99.9")
+
+
+def test_hierarchy_by_prefix_range():
+    idx = _index()
+    assert idx.descendants("M25.51") == ["M25.511", "M25.512", "M25.519"]
+    assert idx.descendants("S83.2") == ["S83.241A", "S83.242A"]
+    assert idx.descendants("S83.2", billable_only=False)[:2] == ["S83.24", "S83.241"]
+    assert idx.descendants("I10") == []
+    assert idx.parent("M25.519") == "M25.51"
+    assert idx.parent("S83.241A") == "S83.241"
+    assert idx.parent("I10") is None
+
+
+def test_alternatives():
+    idx = _index()
+    assert idx.alternative("M54.5") == "M54.51"          # header: first specified billable child
+    assert idx.alternative("M25.519") == "M25.511"       # unspecified: a specified sibling
+    assert idx.alternative("M25.511") is None
+    assert idx.alternative("Z01.89") is None
+    assert idx.alternative("X99.9") is None
+    assert idx.alternative("m54.5") == "M54.51"
+    # Only codes in the set are memoised, so unknown inputs cannot grow it.
+    for n in range(100):
+        idx.alternative(f"X99.{n}")
+    assert len(idx._alternatives) <= len(idx)
+    assert all(isinstance(i, int) and 0 <= i < len(idx) for i in idx._alternatives)
+
+
+def test_validate_uses_index_after_curated_suggestions():
+    claim = {"lines": [{"cpt": "99213", "dx": [d]} for d in ["M25.50", "M54.5", "M25.519", "Z00.00"]]}
+    found = {i["line"]: i for i in icd_cpt_validate(claim) if i["issue"] == "dx_unspecific"}
+    assert sorted(found) == [0, 1, 2]
+    assert found[0]["details"] == {"from": "M25.50", "to": "M25.512"}
+    assert found[1]["details"] == {"from": "M54.5", "to": "M54.51"}
+    assert "not billable" in found[1]["why"]
+    assert found[2]["details"] == {"from": "M25.519", "to": "M25.511"}
+
+    # Without a code set only the curated suggestions apply.
+    bare = RuleTables("bare")
+    assert [i["line"] for i in icd_cpt_validate(claim, bare) if i["issue"] == "dx_unspecific"] == [0]
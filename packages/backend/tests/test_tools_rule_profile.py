@@ -0,0 +1,76 @@
+import gc
+import sys
+import threading
+from pathlib import Path
+
+from prometheus_client import REGISTRY
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.core.metrics import RULE_STATS
+from packages.backend.tools import rule_profile
+from packages.backend.tools.code_rules import ICD_CPT_RULES, MODIFIER_RULES, icd_cpt_validate, modifier_rules
+
+CLAIM = {
+    "provider": {"siteOfService": "11"},
+    "lines": [
+        {"cpt": "97012", "dx": ["M25.50", "bad"], "modifiers": []},
+        {"cpt": "97110", "dx": ["M25.50"], "modifiers": []},
+    ],
+}
+
+
+def _sample(name, rule):
+    return REGISTRY.get_sample_value(f"codexia_{name}", {"rule": rule}) or 0.0
+
+
+def _snapshot():
+    rules = [name for name, _ in ICD_CPT_RULES + MODIFIER_RULES]
+    return {
+        r: (_sample("rule_calls_total", r), _sample("rule_hits_total", r), _sample("rule_duration_seconds_count", r))
+        for r in rules
+    }
+
+
+def test_rules_are_counted_while_enabled():
+    was = rule_profile.is_enabled()
+    try:
+        rule_profile.set_enabled(True)
+        before = _snapshot()
+        expected = icd_cpt_validate(CLAIM) + modifier_rules(CLAIM)
+        after = _snapshot()
+        delta = {r: tuple(a - b for a, b in zip(after[r], before[r])) for r in after}
+        assert delta["dx_unspecific"] == (1, 2, 1)
+        assert delta["dx_format"] == (1, 1, 1)
+        assert delta["cpt_format"] == (1, 0, 1)
+        assert delta["ptp_modifier59"] == (1, 1, 1)
+        inf_bucket = REGISTRY.get_sample_value(
+            "codexia_rule_duration_seconds_bucket", {"rule": "dx_unspecific", "le": "+Inf"}
+        )
+        assert inf_bucket == after["dx_unspecific"][2]
+
+        rule_profile.set_enabled(False)
+        assert icd_cpt_validate(CLAIM) + modifier_rules(CLAIM) == expected
+        assert _snapshot() == after
+    finally:
+        rule_profile.set_enabled(was)
+
+
+def test_finished_threads_fold_their_counts():
+    was = rule_profile.is_enabled()
+    try:
+        rule_profile.set_enabled(True)
+        gc.collect()
+        tables = RULE_STATS.live_tables()
+        calls = _snapshot()["dx_unspecific"][0]
+        for _ in range(5):
+            threads = [threading.Thread(target=icd_cpt_validate, args=(CLAIM,)) for _ in range(20)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        gc.collect()
+        assert RULE_STATS.live_tables() <= tables
+        assert _snapshot()["dx_unspecific"][0] == calls + 100
+    finally:
+        rule_profile.set_enabled(was)
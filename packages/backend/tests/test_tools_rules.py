@@ -1,7 +1,14 @@
 import sys, pathlib; sys.path.append(str(pathlib.Path(__file__).resolve().parents[3]))
+import dataclasses
+
+import pytest
+
+from packages.backend.tools import code_rules
 from packages.backend.tools.code_rules import (
     icd_cpt_validate,
     modifier_rules,
+    normalize_claim,
+    normalize_codes,
     suggest_recoding,
 )
 
@@ -71,3 +78,31 @@ def test_site_of_service_doc_missing():
     assert found
     assert "BCBS-P123 §7" in found[0]["policy_refs"]
     assert issues == icd_cpt_validate(case_sos_note)
+
+
+def test_normalized_claim_is_shared_without_copies(monkeypatch):
+    claim = {
+        "provider": {"siteOfService": "11"},
+        "lines": [
+            {"cpt": "97012", "dx": [" m25.50 ", ""], "modifiers": ["gp "], "details": {"tags": "imaging_generic"}},
+            {"cpt": "97110", "dx": ["M25.50"], "modifiers": []},
+            {"cpt": "97012", "dx": [], "modifiers": []},
+        ],
+    }
+    view = normalize_claim(claim)
+    assert normalize_claim(view) is view
+    assert view.lines[0].dx == ("M25.50",) and view.lines[0].modifiers == ("GP",)
+    assert view.lines[0].flags == ("imaging_generic",)
+    assert dict(view.cpt_lines) == {"97012": (0, 2), "97110": (1,)}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        view.pos = "22"
+    with pytest.raises(TypeError):
+        view.cpt_lines["99213"] = (3,)
+
+    expected = (icd_cpt_validate(normalize_codes(claim)), modifier_rules(normalize_codes(claim)))
+
+    def no_copy(_):
+        raise AssertionError("validators must not copy a NormalizedClaim")
+
+    monkeypatch.setattr(code_rules, "deepcopy", no_copy)
+    assert (icd_cpt_validate(view), modifier_rules(view)) == expected
@@ -0,0 +1,43 @@
+import time
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from packages.backend.app import get_app
+from packages.backend.rag.indexer import build_index
+
+ROOT = Path(__file__).resolve().parents[1]
+POLICY_DIR = str(ROOT / "data/policies")
+
+
+def _wait_ready(c, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        r = c.get("/readyz")
+        if r.json()["warmup"]["finished"] or time.monotonic() > deadline:
+            return r
+        time.sleep(0.05)
+
+
+def test_readyz_gated_on_warmup(tmp_path, monkeypatch):
+    vector_dir = tmp_path / "vector"
+    build_index(POLICY_DIR, str(vector_dir))
+    monkeypatch.setenv("VECTOR_PATH", str(vector_dir))
+    with TestClient(get_app()) as c:
+        r = _wait_ready(c)
+        assert r.status_code == 200
+        assert r.json()["ready"] is True
+        metrics = c.get("/metrics").text
+        assert 'codexia_warmup_duration_seconds{stage="total"}' in metrics
+        assert 'codexia_warmup_duration_seconds{stage="queries"}' in metrics
+
+
+def test_readyz_reports_failed_warmup(tmp_path, monkeypatch):
+    monkeypatch.setenv("VECTOR_PATH", str(tmp_path / "empty"))
+    with TestClient(get_app()) as c:
+        r = _wait_ready(c)
+        assert r.status_code == 503
+        assert r.json()["warmup"]["error"]
@@ -1,13 +1,24 @@
 """Deterministic utilities for claim rule validation and artifact generation."""
-from .code_rules import normalize_codes, icd_cpt_validate, modifier_rules, suggest_recoding
+from .code_rules import (
+    NormalizedClaim,
+    normalize_claim,
+    normalize_codes,
+    icd_cpt_validate,
+    modifier_rules,
+    suggest_recoding,
+)
+from .batch_rules import validate_batch
 from .templates import template_corrected_claim, template_appeal_letter
 from .edi import edi_to_claim
 
 __all__ = [
+    "NormalizedClaim",
+    "normalize_claim",
     "normalize_codes",
     "icd_cpt_validate",
     "modifier_rules",
     "suggest_recoding",
+    "validate_batch",
     "template_corrected_claim",
     "template_appeal_letter",
     "edi_to_claim",
@@ -0,0 +1,341 @@
+"""Columnar batch evaluation of the claim code rules.
+
+``validate_batch`` explodes N claims into NumPy arrays of interned code ids
+(one row per claim line, per diagnosis and per detail flag) and evaluates
+the format, specificity, CPT-ICD incompatibility, site-of-service and
+modifier -59 pair rules as masks and joins over those arrays. Regexes and
+rule tables are consulted once per distinct code or code pair in the batch
+instead of once per line.
+
+The issues of each claim equal ``icd_cpt_validate(claim) +
+modifier_rules(claim)``, dict for dict and in the same order.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .code_rules import _CPT_RE, _ICD10_RE, ClaimLike, NormalizedClaim, _detail_flags, unspecific_issue
+from .edit_tables import RuleTables, rule_tables
+
+MOD_59 = "59"
+MOD_BITS = 64   # modifier ids below this get a bit in ``ClaimColumns.line_mods``
+
+# Issues of one claim are ordered by issue name, then line, then ``seq``.
+_ISSUE_RANK = {
+    name: rank
+    for rank, name in enumerate(
+        sorted(["doc_missing", "dx_incompatibility", "dx_unspecific", "format_error", "modifier_missing"])
+    )
+}
+
+
+class Vocab:
+    """Interns values to dense integer ids in first-seen order."""
+
+    def __init__(self, *values: Hashable) -> None:
+        self.ids: Dict[Hashable, int] = {}
+        self.values: List[Any] = []
+        for value in values:
+            self.id(value)
+
+    def id(self, value: Hashable) -> int:
+        i = self.ids.get(value)
+        if i is None:
+            i = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+@dataclass
+class ClaimColumns:
+    """Claims exploded into parallel arrays.
+
+    Line rows are in (claim, line) order; diagnosis rows in (line row,
+    position) order; ``*_line`` columns are line row numbers. ``line_mods``
+    has bit ``i`` set when the line carries modifier id ``i``.
+    """
+
+    n_claims: int
+    claim_pos: np.ndarray
+    line_claim: np.ndarray
+    line_no: np.ndarray
+    line_cpt: np.ndarray
+    line_mods: np.ndarray
+    dx_line: np.ndarray
+    dx_seq: np.ndarray
+    dx_code: np.ndarray
+    flag_line: np.ndarray
+    flag_code: np.ndarray
+    cpts: Vocab
+    dxs: Vocab
+    modifiers: Vocab
+    poss: Vocab
+    flags: Vocab
+
+
+class _Columns:
+    """Column lists and vocabularies while a batch is being exploded."""
+
+    def __init__(self) -> None:
+        self.cpts, self.dxs, self.modifiers, self.poss, self.flags = Vocab(), Vocab(), Vocab(MOD_59), Vocab(), Vocab()
+        self.claim_pos: List[int] = []
+        self.line_claim: List[int] = []
+        self.line_no: List[int] = []
+        self.line_cpt: List[int] = []
+        self.line_mods: List[int] = []
+        self.dx_line: List[int] = []
+        self.dx_seq: List[int] = []
+        self.dx_code: List[int] = []
+        self.flag_line: List[int] = []
+        self.flag_code: List[int] = []
+        # Raw dx/modifier value -> interned id (-1 when blank), so each
+        # distinct raw string is cleaned once per batch.
+        self._raw_dx: Dict[str, int] = {}
+        self._raw_mod: Dict[str, int] = {}
+
+    def _raw_id(self, raw: Dict[str, int], vocab: Vocab, value: Any) -> int:
+        key = str(value)
+        i = raw.get(key)
+        if i is None:
+            code = key.upper().strip()   # same rule as code_rules._clean_codes
+            i = raw[key] = vocab.id(code) if code else -1
+        return i
+
+    def add_line(self, ci: int, li: int, cpt: str, dx_ids: Iterable[int], mod_ids: Iterable[int], flags: Iterable[str]) -> None:
+        row = len(self.line_claim)
+        self.line_claim.append(ci)
+        self.line_no.append(li)
+        self.line_cpt.append(self.cpts.id(cpt))
+        mask = 0
+        for mid in mod_ids:
+            if 0 <= mid < MOD_BITS:
+                mask |= 1 << mid
+        self.line_mods.append(mask)
+        seq = 0
+        for d in dx_ids:
+            if d >= 0:
+                self.dx_line.append(row)
+                self.dx_seq.append(seq)
+                self.dx_code.append(d)
+                seq += 1
+        for f in flags:
+            self.flag_line.append(row)
+            self.flag_code.append(self.flags.id(f))
+
+    def add_claim(self, ci: int, claim: ClaimLike) -> None:
+        if isinstance(claim, NormalizedClaim):
+            self.claim_pos.append(self.poss.id(claim.pos))
+            for li, ln in enumerate(claim.lines):
+                self.add_line(
+                    ci, li, ln.cpt,
+                    [self.dxs.id(d) for d in ln.dx], [self.modifiers.id(m) for m in ln.modifiers], ln.flags,
+                )
+            return
+        self.claim_pos.append(self.poss.id((claim.get("provider") or {}).get("siteOfService")))
+        for li, ln in enumerate(claim.get("lines", [])):
+            details = ln.get("details")
+            self.add_line(
+                ci, li, ln.get("cpt", ""),
+                [self._raw_id(self._raw_dx, self.dxs, d) for d in ln.get("dx", [])],
+                [self._raw_id(self._raw_mod, self.modifiers, m) for m in ln.get("modifiers", [])],
+                _detail_flags(details) if details else (),
+            )
+
+    def freeze(self, n_claims: int) -> ClaimColumns:
+        i32 = lambda values: np.array(values, dtype=np.int32)
+        return ClaimColumns(
+            n_claims=n_claims,
+            claim_pos=i32(self.claim_pos),
+            line_claim=i32(self.line_claim),
+            line_no=i32(self.line_no),
+            line_cpt=i32(self.line_cpt),
+            line_mods=np.array(self.line_mods, dtype=np.uint64),
+            dx_line=i32(self.dx_line),
+            dx_seq=i32(self.dx_seq),
+            dx_code=i32(self.dx_code),
+            flag_line=i32(self.flag_line),
+            flag_code=i32(self.flag_code),
+            cpts=self.cpts,
+            dxs=self.dxs,
+            modifiers=self.modifiers,
+            poss=self.poss,
+            flags=self.flags,
+        )
+
+
+def to_columns(claims: Sequence[ClaimLike]) -> ClaimColumns:
+    """Normalize ``claims`` (as ``normalize_claim`` does) into columns."""
+    cols = _Columns()
+    for ci, claim in enumerate(claims):
+        cols.add_claim(ci, claim)
+    return cols.freeze(len(claims))
+
+
+def _lookup(keys: np.ndarray, fn: Callable[[int], Any]) -> Tuple[List[Any], np.ndarray]:
+    """Call ``fn`` once per distinct key; returns the results and, per key,
+    the index of its result."""
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return [fn(int(k)) for k in uniq], inverse.reshape(-1)
+
+
+def _first_per_line(rows: np.ndarray, lines: np.ndarray) -> np.ndarray:
+    """The first of ``rows`` (diagnosis rows, in order) on each line."""
+    _, first = np.unique(lines[rows], return_index=True)
+    return rows[first]
+
+
+class _Issues:
+    """Issue rows of a batch, built into dicts once they are in order.
+
+    Each part is a set of rows of one issue type with parallel ``values``
+    columns; ``build(line, *values)`` makes the dict of one row.
+    """
+
+    def __init__(self) -> None:
+        self.parts: List[Tuple[np.ndarray, np.ndarray, int, np.ndarray, Callable[..., Dict], Tuple[np.ndarray, ...]]] = []
+
+    def add(self, claim: np.ndarray, line: np.ndarray, issue: str, seq: np.ndarray, build: Callable[..., Dict], *values: np.ndarray) -> None:
+        if len(claim):
+            self.parts.append((claim, line, _ISSUE_RANK[issue], seq, build, values))
+
+    def collect(self, n_claims: int) -> List[List[Dict]]:
+        out: List[List[Dict]] = [[] for _ in range(n_claims)]
+        if not self.parts:
+            return out
+        claim = np.concatenate([p[0] for p in self.parts])
+        line = np.concatenate([p[1] for p in self.parts])
+        rank = np.concatenate([np.full(len(p[0]), p[2]) for p in self.parts])
+        seq = np.concatenate([p[3] for p in self.parts])
+        part = np.concatenate([np.full(len(p[0]), i) for i, p in enumerate(self.parts)])
+        offset = np.concatenate([np.arange(len(p[0])) for p in self.parts])
+        builders = [p[4] for p in self.parts]
+        rows = [list(zip(p[1].tolist(), *(v.tolist() for v in p[5]))) for p in self.parts]
+        order = np.lexsort((seq, line, rank, claim))
+        for c, k, o in zip(claim[order].tolist(), part[order].tolist(), offset[order].tolist()):
+            out[c].append(builders[k](*rows[k][o]))
+        return out
+
+
+def evaluate(cols: ClaimColumns, tables: Optional[RuleTables] = None) -> List[List[Dict]]:
+    """Issues of every claim in ``cols``, in input order."""
+    tables = tables or rule_tables()
+    issues = _Issues()
+    line_claim, line_no, line_cpt = cols.line_claim, cols.line_no, cols.line_cpt
+    cpt_values, dx_values, pos_values = cols.cpts.values, cols.dxs.values, cols.poss.values
+
+    # Format: one regex match per distinct code.
+    valid_cpt = np.array([bool(_CPT_RE.match(c)) for c in cpt_values], dtype=bool)
+    bad = np.flatnonzero(~valid_cpt[line_cpt]) if len(line_cpt) else np.zeros(0, dtype=np.int64)
+    issues.add(
+        line_claim[bad], line_no[bad], "format_error", np.full(len(bad), -1),
+        lambda line, cpt: {"line": line, "issue": "format_error", "why": f"Bad CPT {cpt_values[cpt]}"},
+        line_cpt[bad],
+    )
+    dx_line, dx_code = cols.dx_line, cols.dx_code
+    valid_dx = np.array([bool(_ICD10_RE.match(d)) for d in dx_values], dtype=bool)
+    bad_dx = np.flatnonzero(~valid_dx[dx_code]) if len(dx_code) else np.zeros(0, dtype=np.int64)
+    issues.add(
+        line_claim[dx_line[bad_dx]], line_no[dx_line[bad_dx]], "format_error", cols.dx_seq[bad_dx],
+        lambda line, dx: {"line": line, "issue": "format_error", "why": f"Bad ICD {dx_values[dx]}"},
+        dx_code[bad_dx],
+    )
+
+    # Specificity: the first unspecific diagnosis of each line.
+    unspecific = np.array([unspecific_issue(0, d, tables) is not None for d in dx_values], dtype=bool)
+    unspec = _first_per_line(np.flatnonzero(unspecific[dx_code]), dx_line) if len(dx_code) else dx_code
+    issues.add(
+        line_claim[dx_line[unspec]], line_no[dx_line[unspec]], "dx_unspecific", np.zeros(len(unspec), dtype=np.int64),
+        lambda line, dx: unspecific_issue(line, dx_values[dx], tables),
+        dx_code[unspec],
+    )
+
+    # CPT-ICD incompatibility: join (line CPT, diagnosis) pairs with the table.
+    if len(dx_code):
+        n_dx = len(dx_values)
+        pair_keys = line_cpt[dx_line].astype(np.int64) * n_dx + dx_code
+        dx_metas, dx_which = _lookup(pair_keys, lambda k: tables.dx_cpt.get(cpt_values[k // n_dx], dx_values[k % n_dx]))
+        hit = np.array([m is not None for m in dx_metas], dtype=bool)[dx_which]
+        incompat = _first_per_line(np.flatnonzero(hit), dx_line)
+        issues.add(
+            line_claim[dx_line[incompat]], line_no[dx_line[incompat]], "dx_incompatibility", np.zeros(len(incompat), dtype=np.int64),
+            lambda line, meta: _table_issue(line, "dx_incompatibility", dx_metas[meta]),
+            dx_which[incompat],
+        )
+
+    # Site of service: lines with a flag that the claim's POS requires notes for.
+    if len(cols.flag_code):
+        flag_line = cols.flag_line
+        n_flags = len(cols.flags)
+        keys = cols.claim_pos[line_claim[flag_line]].astype(np.int64) * n_flags + cols.flag_code
+        required, flag_which = _lookup(
+            keys, lambda k: _requires_notes(tables, pos_values[k // n_flags], cols.flags.values[k % n_flags])
+        )
+        doc_lines = np.unique(flag_line[np.array(required, dtype=bool)[flag_which]])
+        issues.add(
+            line_claim[doc_lines], line_no[doc_lines], "doc_missing", np.zeros(len(doc_lines), dtype=np.int64),
+            lambda line, pos: _doc_issue(line, pos_values[pos], tables),
+            cols.claim_pos[line_claim[doc_lines]],
+        )
+
+    _modifier_pairs(cols, tables, issues)
+    return issues.collect(cols.n_claims)
+
+
+def _modifier_pairs(cols: ClaimColumns, tables: RuleTables, issues: _Issues) -> None:
+    line_claim, line_cpt = cols.line_claim, cols.line_cpt
+    if not len(line_claim):
+        return
+    # Claims with modifier 59 on any line are exempt.
+    has_59 = np.zeros(cols.n_claims, dtype=bool)
+    has_59[line_claim[(cols.line_mods & np.uint64(1 << cols.modifiers.ids[MOD_59])) != 0]] = True
+    rows = np.flatnonzero(~has_59[line_claim])
+    # First line of each distinct CPT per claim, in claim order.
+    n_cpts = len(cols.cpts)
+    _, first = np.unique(line_claim[rows].astype(np.int64) * n_cpts + line_cpt[rows], return_index=True)
+    rows = np.sort(rows[first])
+    claim = line_claim[rows]
+    # Every pair (i, j), i < j, of a claim's distinct CPTs.
+    n = len(rows)
+    counts = np.searchsorted(claim, claim, side="right") - np.arange(n) - 1
+    left = np.repeat(np.arange(n), counts)
+    right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(counts) - counts, counts)
+    if not len(left):
+        return
+    keys = line_cpt[rows[left]].astype(np.int64) * n_cpts + line_cpt[rows[right]]
+    cpt_values = cols.cpts.values
+    metas, which = _lookup(keys, lambda k: tables.ptp.get(cpt_values[k // n_cpts], cpt_values[k % n_cpts]))
+    hit = np.flatnonzero(np.array([m is not None for m in metas], dtype=bool)[which])
+    issues.add(
+        claim[left[hit]], cols.line_no[rows[left[hit]]], "modifier_missing", right[hit],
+        lambda line, meta: _table_issue(line, "modifier_missing", metas[meta]),
+        which[hit],
+    )
+
+
+def _table_issue(line: int, issue: str, meta: Dict) -> Dict:
+    return {"line": line, "issue": issue, "why": meta["why"], "policy_refs": sorted(meta.get("policy_refs", []))}
+
+
+def _requires_notes(tables: RuleTables, pos: Optional[str], flag: str) -> bool:
+    rule = tables.site_of_service.get(pos)
+    return rule is not None and flag in rule["notes_required_for"]
+
+
+def _doc_issue(line: int, pos: Optional[str], tables: RuleTables) -> Dict:
+    return {
+        "line": line,
+        "issue": "doc_missing",
+        "why": f"POS {pos} requires documented rationale for imaging.",
+        "policy_refs": sorted(tables.site_of_service[pos]["policy_refs"]),
+    }
+
+
+def validate_batch(claims: Sequence[ClaimLike], tables: Optional[RuleTables] = None) -> List[List[Dict]]:
+    """``icd_cpt_validate(c) + modifier_rules(c)`` for every claim ``c``."""
+    return evaluate(to_columns(claims), tables)
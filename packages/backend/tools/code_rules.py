@@ -3,17 +3,24 @@ from __future__ import annotations
 
 import re
 from copy import deepcopy
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 from .data_rules import (
     ICD10_REGEX,
     CPT_REGEX,
     MOD_REGEX,
-    MODIFIER_59_REQUIRED_PAIRS,
     ICD_SPECIFICITY_SUGGESTIONS,
-    SITE_OF_SERVICE_RULES,
-    DX_CPT_INCOMPATIBLE_PAIRS,
 )
+from .edit_tables import RuleTables, rule_tables
+from .rule_profile import run_rule
+
+_CPT_RE = re.compile(CPT_REGEX)
+_ICD10_RE = re.compile(ICD10_REGEX)
+
+# Keys of ``line.details`` that carry free-form flags such as "imaging_generic".
+DETAIL_FLAG_KEYS = ("flags", "tags", "flag", "tag", "type", "category")
 
 
 # ---------------------------------------------------------------------------
@@ -30,49 +37,154 @@ def normalize_codes(claim: Dict) -> Dict:
     return c
 
 
+def _clean_codes(values: Any) -> Tuple[str, ...]:
+    return tuple(str(v).upper().strip() for v in values if str(v).strip())
+
+
+def _detail_flags(details: Any) -> Tuple[str, ...]:
+    flags: List[str] = []
+    if isinstance(details, dict):
+        for k in DETAIL_FLAG_KEYS:
+            v = details.get(k)
+            if isinstance(v, str):
+                flags.append(v)
+            elif isinstance(v, list):
+                flags.extend([str(i) for i in v])
+    elif isinstance(details, list):
+        flags.extend([str(i) for i in details])
+    elif isinstance(details, str):
+        flags.append(details)
+    return tuple(flags)
+
+
+@dataclass(frozen=True)
+class ClaimLine:
+    cpt: str
+    dx: Tuple[str, ...]
+    modifiers: Tuple[str, ...]
+    flags: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class NormalizedClaim:
+    """Immutable view of a claim's codes, normalized once and shared by every
+    validator (same rules as ``normalize_codes``, without copying the claim).
+
+    ``cpt_lines`` maps each CPT to the indexes of its lines, in claim order.
+    ``claim`` is the original claim; it is referenced, not copied, and must
+    not be modified while the view is in use.
+    """
+
+    lines: Tuple[ClaimLine, ...]
+    pos: Optional[str] = None
+    cpt_lines: Mapping[str, Tuple[int, ...]] = field(default_factory=lambda: MappingProxyType({}))
+    claim: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}), repr=False, compare=False)
+
+    @classmethod
+    def from_claim(cls, claim: Mapping[str, Any]) -> "NormalizedClaim":
+        lines: List[ClaimLine] = []
+        cpt_lines: Dict[str, List[int]] = {}
+        for idx, line in enumerate(claim.get("lines", [])):
+            cpt = line.get("cpt", "")
+            lines.append(
+                ClaimLine(
+                    cpt=cpt,
+                    dx=_clean_codes(line.get("dx", [])),
+                    modifiers=_clean_codes(line.get("modifiers", [])),
+                    flags=_detail_flags(line.get("details") or {}),
+                )
+            )
+            cpt_lines.setdefault(cpt, []).append(idx)
+        return cls(
+            lines=tuple(lines),
+            pos=(claim.get("provider") or {}).get("siteOfService"),
+            cpt_lines=MappingProxyType({c: tuple(i) for c, i in cpt_lines.items()}),
+            claim=claim,
+        )
+
+    def has_modifier(self, modifier: str) -> bool:
+        return any(modifier in ln.modifiers for ln in self.lines)
+
+
+ClaimLike = Union[Dict, NormalizedClaim]
+
+
+def normalize_claim(claim: ClaimLike) -> NormalizedClaim:
+    """The ``NormalizedClaim`` of ``claim``; views are returned as they are."""
+    return claim if isinstance(claim, NormalizedClaim) else NormalizedClaim.from_claim(claim)
+
+
 def _pair_key(a: str, b: str) -> Tuple[str, str]:
     return tuple(sorted((a, b)))
 
 
+def unspecific_issue(line: int, dx: str, tables: RuleTables) -> Optional[Dict]:
+    """The ``dx_unspecific`` issue of ``dx`` on ``line``, if any.
+
+    Curated ``ICD_SPECIFICITY_SUGGESTIONS`` take precedence; other codes are
+    checked against the ICD-10-CM index of ``tables`` (non-billable codes and
+    billable "unspecified" codes with a specified sibling).
+    """
+    if dx in ICD_SPECIFICITY_SUGGESTIONS:
+        why = f"{dx} is non-specific; consider site-specific alternative."
+        to = ICD_SPECIFICITY_SUGGESTIONS[dx][0]
+    elif tables.icd10 is not None and _ICD10_RE.match(dx):
+        to = tables.icd10.alternative(dx)
+        if to is None:
+            return None
+        if tables.icd10.is_billable(dx):
+            why = f"{dx} is non-specific; consider a more specific code."
+        else:
+            why = f"{dx} is not billable; code to a billable descendant."
+    else:
+        return None
+    return {
+        "line": line,
+        "issue": "dx_unspecific",
+        "why": why,
+        "details": {"from": dx, "to": to},
+        "policy_refs": ["Medicare-AB-2024-05 §4"],
+    }
+
+
 # ---------------------------------------------------------------------------
 # Validators
 # ---------------------------------------------------------------------------
 
-def icd_cpt_validate(claim: Dict) -> List[Dict]:
-    """Validate CPT/ICD formatting, specificity and site-of-service notes.
+def _cpt_format(c: NormalizedClaim, tables: RuleTables) -> List[Dict]:
+    return [
+        {"line": idx, "issue": "format_error", "why": f"Bad CPT {line.cpt}"}
+        for idx, line in enumerate(c.lines)
+        if not _CPT_RE.match(line.cpt)
+    ]
 
-    Returns a list of issue dictionaries sorted deterministically by (issue, line).
-    """
-    c = normalize_codes(claim)
-    issues: List[Dict] = []
-    pos = (c.get("provider") or {}).get("siteOfService")
 
-    for idx, line in enumerate(c.get("lines", [])):
-        cpt = line.get("cpt", "")
-        if not re.match(CPT_REGEX, cpt):
-            issues.append({"line": idx, "issue": "format_error", "why": f"Bad CPT {cpt}"})
+def _dx_format(c: NormalizedClaim, tables: RuleTables) -> List[Dict]:
+    return [
+        {"line": idx, "issue": "format_error", "why": f"Bad ICD {dx}"}
+        for idx, line in enumerate(c.lines)
+        for dx in line.dx
+        if not _ICD10_RE.match(dx)
+    ]
 
-        for dx in line.get("dx", []):
-            if not re.match(ICD10_REGEX, dx):
-                issues.append({"line": idx, "issue": "format_error", "why": f"Bad ICD {dx}"})
 
-        for dx in line.get("dx", []):
-            if dx in ICD_SPECIFICITY_SUGGESTIONS:
-                issues.append(
-                    {
-                        "line": idx,
-                        "issue": "dx_unspecific",
-                        "why": f"{dx} is non-specific; consider site-specific alternative.",
-                        "details": {"from": dx, "to": ICD_SPECIFICITY_SUGGESTIONS[dx][0]},
-                        "policy_refs": ["Medicare-AB-2024-05 §4"],
-                    }
-                )
+def _dx_unspecific(c: NormalizedClaim, tables: RuleTables) -> List[Dict]:
+    issues: List[Dict] = []
+    for idx, line in enumerate(c.lines):
+        for dx in line.dx:
+            issue = unspecific_issue(idx, dx, tables)
+            if issue is not None:
+                issues.append(issue)
                 break
+    return issues
+
 
-        for dx in line.get("dx", []):
-            key = (cpt, dx)
-            if key in DX_CPT_INCOMPATIBLE_PAIRS:
-                meta = DX_CPT_INCOMPATIBLE_PAIRS[key]
+def _dx_incompatibility(c: NormalizedClaim, tables: RuleTables) -> List[Dict]:
+    issues: List[Dict] = []
+    for idx, line in enumerate(c.lines):
+        for dx in line.dx:
+            meta = tables.dx_cpt.get(line.cpt, dx)
+            if meta is not None:
                 issues.append(
                     {
                         "line": idx,
@@ -82,67 +194,85 @@ def icd_cpt_validate(claim: Dict) -> List[Dict]:
                     }
                 )
                 break
+    return issues
 
-        # Site-of-service notes requirement
-        if pos in SITE_OF_SERVICE_RULES:
-            details = line.get("details") or {}
-            flags: List[str] = []
-            if isinstance(details, dict):
-                for k in ("flags", "tags", "flag", "tag", "type", "category"):
-                    v = details.get(k)
-                    if isinstance(v, str):
-                        flags.append(v)
-                    elif isinstance(v, list):
-                        flags.extend([str(i) for i in v])
-            elif isinstance(details, list):
-                flags.extend([str(i) for i in details])
-            elif isinstance(details, str):
-                flags.append(details)
-
-            required = SITE_OF_SERVICE_RULES[pos]["notes_required_for"]
-            if any(f in required for f in flags):
-                issues.append(
-                    {
-                        "line": idx,
-                        "issue": "doc_missing",
-                        "why": f"POS {pos} requires documented rationale for imaging.",
-                        "policy_refs": sorted(SITE_OF_SERVICE_RULES[pos]["policy_refs"]),
-                    }
-                )
 
-    issues.sort(key=lambda x: (x["issue"], x["line"]))
-    return issues
+def _site_of_service(c: NormalizedClaim, tables: RuleTables) -> List[Dict]:
+    pos = c.pos
+    sos_rule = tables.site_of_service.get(pos)
+    if sos_rule is None:
+        return []
+    return [
+        {
+            "line": idx,
+            "issue": "doc_missing",
+            "why": f"POS {pos} requires documented rationale for imaging.",
+            "policy_refs": sorted(sos_rule["policy_refs"]),
+        }
+        for idx, line in enumerate(c.lines)
+        if any(f in sos_rule["notes_required_for"] for f in line.flags)
+    ]
+
+
+def _ptp_modifier59(c: NormalizedClaim, tables: RuleTables) -> List[Dict]:
+    if c.has_modifier("59"):
+        return []
+    cpts = list(c.cpt_lines)
+    return [
+        {
+            "line": c.cpt_lines[cpts[i]][0],
+            "issue": "modifier_missing",
+            "why": meta["why"],
+            "policy_refs": sorted(meta.get("policy_refs", [])),
+        }
+        for i, _, meta in tables.ptp.pairs_among(cpts)
+    ]
+
+
+# Rules of each validator, by the name they are profiled under. Issues are
+# sorted by (issue, line) afterwards; the sort is stable, so CPT format
+# errors stay ahead of diagnosis format errors on the same line.
+ICD_CPT_RULES = (
+    ("cpt_format", _cpt_format),
+    ("dx_format", _dx_format),
+    ("dx_unspecific", _dx_unspecific),
+    ("dx_incompatibility", _dx_incompatibility),
+    ("site_of_service", _site_of_service),
+)
+MODIFIER_RULES = (("ptp_modifier59", _ptp_modifier59),)
 
 
-def modifier_rules(claim: Dict) -> List[Dict]:
-    """Detect CPT pairs that commonly require modifier -59 when billed together."""
-    c = normalize_codes(claim)
+def _apply(rules, claim: ClaimLike, tables: Optional[RuleTables]) -> List[Dict]:
+    tables = tables or rule_tables()
+    c = normalize_claim(claim)
     issues: List[Dict] = []
-    cpts = [ln.get("cpt", "") for ln in c.get("lines", [])]
-
-    for (a, b), meta in MODIFIER_59_REQUIRED_PAIRS.items():
-        if a in cpts and b in cpts:
-            idx_a, idx_b = cpts.index(a), cpts.index(b)
-            target = min(idx_a, idx_b)
-            has_59 = any("59" in ln.get("modifiers", []) for ln in c.get("lines", []))
-            if not has_59:
-                issues.append(
-                    {
-                        "line": target,
-                        "issue": "modifier_missing",
-                        "why": meta["why"],
-                        "policy_refs": sorted(meta.get("policy_refs", [])),
-                    }
-                )
+    for name, rule in rules:
+        issues.extend(run_rule(name, rule, c, tables))
     issues.sort(key=lambda x: (x["issue"], x["line"]))
     return issues
 
 
+def icd_cpt_validate(claim: ClaimLike, tables: Optional[RuleTables] = None) -> List[Dict]:
+    """Validate CPT/ICD formatting, specificity and site-of-service notes.
+
+    Returns a list of issue dictionaries sorted deterministically by (issue, line).
+    """
+    return _apply(ICD_CPT_RULES, claim, tables)
+
+
+def modifier_rules(claim: ClaimLike, tables: Optional[RuleTables] = None) -> List[Dict]:
+    """Detect CPT pairs that commonly require modifier -59 when billed together.
+
+    Only the pairs among the claim's own CPTs are looked up in the PTP table.
+    """
+    return _apply(MODIFIER_RULES, claim, tables)
+
+
 # ---------------------------------------------------------------------------
 # Suggestions
 # ---------------------------------------------------------------------------
 
-def suggest_recoding(claim: Dict, issues: List[Dict]) -> List[Dict]:
+def suggest_recoding(claim: ClaimLike, issues: List[Dict]) -> List[Dict]:
     """Generate deterministic recoding action suggestions given issue list."""
     actions: List[Dict] = []
     for iss in issues:
@@ -0,0 +1,185 @@
+"""Versioned claim edit tables loaded from CSV/JSONL into hash indexes.
+
+A rules directory holds a ``manifest.json`` naming its version and the file
+of each table::
+
+    {"version": "demo-2024.1",
+     "tables": {"ptp": "ptp_modifier59.csv",
+                "dx_cpt": "dx_cpt_incompatible.csv",
+                "site_of_service": "site_of_service.jsonl",
+                "icd10cm": "icd10cm_order_demo.txt"}}
+
+Pair tables (procedure-to-procedure and CPT-to-diagnosis edits) are indexed
+by their first code, so checking a claim costs one lookup per pair of its
+own codes regardless of table size. Rationales repeat across millions of
+edit rows and are stored once. CSV ``policy_refs`` are ``;``-separated;
+JSONL rows carry them as a list. ``icd10cm`` is a CMS order file loaded
+into a ``tools.icd10.ICD10Index``; ``ICD10CM_PATH`` points the bundled
+tables at a full code set instead of the demo subset.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..core.config import Settings
+from .icd10 import ICD10Index
+
+_settings = Settings()
+
+RULES_DIR = Path(__file__).resolve().parents[1] / "data" / "rules"
+MANIFEST = "manifest.json"
+
+RuleMeta = Tuple[str, Tuple[str, ...]]   # (why, policy_refs)
+
+
+class PairTable:
+    """Hash index of code pairs to a rationale, keyed by the first code.
+
+    ``symmetric`` tables (PTP edits) match a pair in either order and store
+    it once under the lower code.
+    """
+
+    def __init__(self, symmetric: bool = False) -> None:
+        self.symmetric = symmetric
+        self._index: Dict[str, Dict[str, int]] = {}
+        self._meta: List[RuleMeta] = []
+        self._meta_ids: Dict[RuleMeta, int] = {}
+        self._rows = 0
+
+    def add(self, a: str, b: str, why: str, policy_refs: Sequence[str]) -> None:
+        if self.symmetric and b < a:
+            a, b = b, a
+        meta = (why, tuple(sorted(policy_refs)))
+        meta_id = self._meta_ids.get(meta)
+        if meta_id is None:
+            meta_id = self._meta_ids[meta] = len(self._meta)
+            self._meta.append(meta)
+        row = self._index.setdefault(sys.intern(a), {})
+        if b not in row:
+            self._rows += 1
+        row[sys.intern(b)] = meta_id
+
+    def get(self, a: str, b: str) -> Optional[Dict]:
+        if self.symmetric and b < a:
+            a, b = b, a
+        row = self._index.get(a)
+        meta_id = row.get(b) if row is not None else None
+        if meta_id is None:
+            return None
+        why, refs = self._meta[meta_id]
+        return {"why": why, "policy_refs": list(refs)}
+
+    def __contains__(self, pair: Tuple[str, str]) -> bool:
+        return self.get(*pair) is not None
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def pairs_among(self, codes: Sequence[str]) -> Iterator[Tuple[int, int, Dict]]:
+        """``(i, j, meta)`` for each listed pair among ``codes`` with ``i < j``."""
+        for i in range(len(codes)):
+            for j in range(i + 1, len(codes)):
+                meta = self.get(codes[i], codes[j])
+                if meta is not None:
+                    yield i, j, meta
+
+
+def _csv_rows(path: str) -> Iterator[Dict]:
+    # The same few ``policy_refs`` strings repeat on most rows; split each once.
+    refs_cache: Dict[str, List[str]] = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        for values in reader:
+            row = dict(zip(header, values))
+            refs = row.get("policy_refs") or ""
+            parsed = refs_cache.get(refs)
+            if parsed is None:
+                parsed = refs_cache[refs] = [r.strip() for r in refs.split(";") if r.strip()]
+            row["policy_refs"] = parsed
+            yield row
+
+
+def _jsonl_rows(path: str) -> Iterator[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_rows(path: str) -> Iterator[Dict]:
+    """Rows of a ``.csv`` or ``.jsonl`` table file."""
+    if path.endswith(".csv"):
+        return _csv_rows(path)
+    if path.endswith(".jsonl"):
+        return _jsonl_rows(path)
+    raise ValueError(f"Unsupported rule table format: {path}")
+
+
+def load_pair_table(rows: Iterable[Dict], keys: Tuple[str, str], symmetric: bool = False) -> PairTable:
+    table = PairTable(symmetric)
+    a_key, b_key = keys
+    for row in rows:
+        a, b = str(row[a_key]).strip().upper(), str(row[b_key]).strip().upper()
+        table.add(a, b, row.get("why", ""), row.get("policy_refs") or [])
+    return table
+
+
+@dataclass
+class RuleTables:
+    version: str
+    ptp: PairTable = field(default_factory=lambda: PairTable(symmetric=True))
+    dx_cpt: PairTable = field(default_factory=PairTable)
+    site_of_service: Dict[str, Dict] = field(default_factory=dict)
+    icd10: Optional[ICD10Index] = None
+
+
+def load_rule_tables(rules_dir: str) -> RuleTables:
+    with open(os.path.join(rules_dir, MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    files = {name: os.path.join(rules_dir, path) for name, path in manifest["tables"].items()}
+    tables = RuleTables(version=manifest["version"])
+    if "ptp" in files:
+        tables.ptp = load_pair_table(read_rows(files["ptp"]), ("column1", "column2"), symmetric=True)
+    if "dx_cpt" in files:
+        tables.dx_cpt = load_pair_table(read_rows(files["dx_cpt"]), ("cpt", "dx"))
+    if "site_of_service" in files:
+        for row in read_rows(files["site_of_service"]):
+            tables.site_of_service[str(row["pos"])] = {
+                "notes_required_for": list(row.get("notes_required_for") or []),
+                "policy_refs": list(row.get("policy_refs") or []),
+            }
+    icd10_path = _settings.ICD10CM_PATH or files.get("icd10cm")
+    if icd10_path:
+        tables.icd10 = ICD10Index.load(icd10_path)
+    return tables
+
+
+_TABLES: Dict[str, RuleTables] = {}
+_LOCK = threading.Lock()
+
+
+def rule_tables(rules_dir: Optional[str] = None) -> RuleTables:
+    """The loaded tables of ``rules_dir`` (default ``RULES_PATH`` or the bundled set)."""
+    rules_dir = os.path.abspath(rules_dir or _settings.RULES_PATH or str(RULES_DIR))
+    try:
+        return _TABLES[rules_dir]
+    except KeyError:
+        pass
+    with _LOCK:
+        if rules_dir not in _TABLES:
+            _TABLES[rules_dir] = load_rule_tables(rules_dir)
+        return _TABLES[rules_dir]
+
+
+def clear() -> None:
+    """Forget loaded tables so the next lookup reads the files again."""
+    with _LOCK:
+        _TABLES.clear()
@@ -0,0 +1,130 @@
+"""ICD-10-CM code-set index for billable and specificity checks.
+
+Loads a CMS order file (``icd10cm_order_<year>.txt``; fixed width: order
+number, code, billable flag, short and long description) into a sorted array
+of undotted codes with parallel billable/unspecified flags. A code's
+descendants are the contiguous range of codes it prefixes, found by binary
+search, so lookups cost a few ``searchsorted`` calls and the full code set
+(~74k codes) holds in well under 2 MB. Descriptions are not kept.
+
+Codes are accepted dotted or not and returned dotted (``M25.511``).
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+CODE_WIDTH = 7
+UNSPECIFIED = "unspecified"
+
+
+def undot(code: str) -> str:
+    return code.replace(".", "").strip().upper()
+
+
+def dot(code: str) -> str:
+    return code if len(code) <= 3 else f"{code[:3]}.{code[3:]}"
+
+
+def read_order_file(path: str) -> Iterator[Tuple[str, bool, str]]:
+    """``(code, billable, long description)`` of each row of a CMS order file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if len(line) < 16 or line.startswith("#"):
+                continue
+            yield line[6:13].strip(), line[14] == "1", line[77:].strip()
+
+
+class ICD10Index:
+    """Sorted ICD-10-CM code set with prefix-range hierarchy queries.
+
+    A code is *unspecific* when it is not billable (a category or
+    subcategory that needs more characters), or when it is billable but
+    described as "unspecified" and its parent has a specified billable
+    code. ``alternative`` is then the first such specified code.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, bool, str]]) -> None:
+        entries = sorted((undot(code), billable, UNSPECIFIED in desc.lower()) for code, billable, desc in rows)
+        self.codes = np.array([e[0] for e in entries], dtype=f"S{CODE_WIDTH}")
+        self.billable = np.array([e[1] for e in entries], dtype=bool)
+        self.unspecified = np.array([e[2] for e in entries], dtype=bool)
+        # Resolved alternatives by row; bounded by the size of the code set.
+        self._alternatives: Dict[int, Optional[str]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "ICD10Index":
+        return cls(read_order_file(path))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.billable.nbytes + self.unspecified.nbytes
+
+    def _find(self, code: str) -> int:
+        key = code.encode("ascii", "ignore")
+        i = int(np.searchsorted(self.codes, key))
+        return i if i < len(self.codes) and self.codes[i] == key else -1
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        key = prefix.encode("ascii", "ignore")
+        lo, hi = np.searchsorted(self.codes, [key, key + b"\xff"])
+        return int(lo), int(hi)
+
+    def __contains__(self, code: str) -> bool:
+        return self._find(undot(code)) >= 0
+
+    def is_billable(self, code: str) -> bool:
+        i = self._find(undot(code))
+        return i >= 0 and bool(self.billable[i])
+
+    def parent(self, code: str) -> Optional[str]:
+        """The nearest listed ancestor of ``code``, dotted."""
+        code = undot(code)
+        for n in range(len(code) - 1, 2, -1):
+            if self._find(code[:n]) >= 0:
+                return dot(code[:n])
+        return None
+
+    def descendants(self, code: str, billable_only: bool = True) -> List[str]:
+        """Listed codes under ``code`` (excluding itself), dotted, in code order."""
+        code = undot(code)
+        lo, hi = self._range(code)
+        idx = np.arange(lo, hi)
+        idx = idx[self.codes[idx] != code.encode("ascii", "ignore")]
+        if billable_only:
+            idx = idx[self.billable[idx]]
+        return [dot(c.decode("ascii")) for c in self.codes[idx]]
+
+    def _first_specified(self, prefix: str, exclude: str = "") -> Optional[str]:
+        lo, hi = self._range(prefix)
+        hits = np.flatnonzero(self.billable[lo:hi] & ~self.unspecified[lo:hi])
+        for h in hits:
+            c = self.codes[lo + h].decode("ascii")
+            if c != exclude:
+                return dot(c)
+        return None
+
+    def alternative(self, code: str) -> Optional[str]:
+        """A more specific billable code to use instead of ``code``, or None
+        when ``code`` is specific enough (or not in the code set)."""
+        key = undot(code)
+        i = self._find(key)
+        if i < 0:
+            return None
+        try:
+            return self._alternatives[i]
+        except KeyError:
+            pass
+        alt: Optional[str] = None
+        if not self.billable[i]:
+            alt = self._first_specified(key) or next(iter(self.descendants(key)), None)
+        elif self.unspecified[i]:
+            parent = self.parent(key)
+            if parent is not None:
+                alt = self._first_specified(undot(parent), exclude=key)
+        self._alternatives[i] = alt
+        return alt
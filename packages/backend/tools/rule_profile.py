@@ -0,0 +1,45 @@
+"""Per-rule call, hit and duration metrics for the claim validators.
+
+``run_rule`` evaluates one rule of ``icd_cpt_validate``/``modifier_rules``
+and, while profiling is enabled, records under ``METRICS_NAMESPACE``:
+
+- ``rule_calls_total{rule}``: evaluations (one per claim),
+- ``rule_hits_total{rule}``: issues raised,
+- ``rule_duration_seconds{rule}``: evaluation time histogram.
+
+Profiling starts as ``RULE_PROFILING`` and can be switched with
+``set_enabled`` at runtime. When off, ``run_rule`` is one flag check and a
+direct call.
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, List, TypeVar
+
+from ..core.config import Settings
+from ..core.metrics import record_rule
+
+_settings = Settings()
+
+T = TypeVar("T")
+
+_enabled = _settings.RULE_PROFILING
+
+
+def set_enabled(on: bool) -> None:
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def run_rule(rule: str, fn: Callable[..., List[T]], *args) -> List[T]:
+    """``fn(*args)``, recording one call of ``rule`` with its issue count."""
+    if not _enabled:
+        return fn(*args)
+    start = time.perf_counter()
+    found = fn(*args)
+    record_rule(rule, len(found), time.perf_counter() - start)
+    return found
@@ -21,7 +21,7 @@ echo ""
 # Start both services with proper signal handling
 trap 'echo ""; echo "🛑 Stopping services..."; kill 0; exit 0' INT
 
-(cd packages/backend && . .venv/bin/activate && uvicorn app:app --reload --host 0.0.0.0 --port 8000) &
+(cd packages/backend && . .venv/bin/activate && uvicorn packages.backend.app:app --app-dir ../.. --reload --host 0.0.0.0 --port 8000) &
 (cd packages/frontend && npm run dev) &
 
 wait
\ No newline at end of file